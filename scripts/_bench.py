@@ -0,0 +1,68 @@
+"""Helpers shared by the `scripts/bench_*.py` micro-benchmarks."""
+import argparse
+import statistics
+import sys
+import timeit
+from typing import Any, Callable, Iterable
+
+
+def parser(doc: str | None, *, rounds: int, min_speedup: float | None = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=doc, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=rounds)
+    if min_speedup is not None:
+        parser.add_argument("--min-speedup", type=float, default=min_speedup)
+    return parser
+
+
+def measure(baseline: Callable[[], Any], candidate: Callable[[], Any], rounds: int, repeat: int = 15) -> tuple[float, float, float]:
+    """
+    Best time per call of both and the median speedup of runs made back to back,
+    measured in alternation so load on the host hits both alike.
+    """
+    timings: list[tuple[float, float]] = []
+    for _ in range(repeat):
+        timings.append((
+            timeit.timeit(baseline, number=rounds) / rounds,
+            timeit.timeit(candidate, number=rounds) / rounds,
+        ))
+    return (
+        min(baseline_time for baseline_time, _ in timings),
+        min(candidate_time for _, candidate_time in timings),
+        statistics.median(baseline_time / candidate_time for baseline_time, candidate_time in timings),
+    )
+
+
+def best(function: Callable[[], Any], rounds: int, repeat: int = 15) -> float:
+    """Best time per call of `function` out of `repeat` runs."""
+    return min(timeit.timeit(function, number=rounds) for _ in range(repeat)) / rounds
+
+
+def compare(
+    cases: Iterable[tuple[str, Callable[[], Any], Callable[[], Any], int]],
+    *,
+    labels: tuple[str, str],
+    min_speedup: float,
+    repeat: int = 15,
+) -> int:
+    """
+    Times every `(name, baseline, candidate, rounds)` case and prints a table,
+    returns 1 when any candidate is less than `min_speedup` times faster.
+    """
+    slow = []
+    print(f"{'case':<28} {labels[0]:>18} {labels[1]:>14} {'speedup':>9}")
+    for name, baseline, candidate, rounds in cases:
+        baseline_time, candidate_time, speedup = measure(baseline, candidate, rounds, repeat)
+        print(f"{name:<28} {format_time(baseline_time):>18} {format_time(candidate_time):>14} {speedup:>8.2f}x")
+        if speedup < min_speedup:
+            slow.append(name)
+
+    if slow:
+        print(f"Below {min_speedup}x: {', '.join(slow)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def format_time(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.2f}us"
@@ -0,0 +1,114 @@
+"""
+Compares `StatefulAckGate` against the queue-and-lock gate it replaced, with `--pending` (default 100k)
+unary calls awaiting their ACKs at once: every call registers, waits and completes while the responses
+are fed in one after the other.
+
+    PYTHONPATH=src python scripts/bench_ack_gate.py [--rounds N] [--pending N] [--min-speedup X]
+
+Exits with status 1 when the gate is less than `--min-speedup` (default 2.0) times faster.
+"""
+import asyncio
+import sys
+from uuid import uuid4
+
+from attp_core.rs_api import AttpCommand, PyAttpMessage
+
+from _bench import compare, parser
+from attp.shared.utils.ack_gate import StatefulAckGate
+
+
+class LegacyAckGate:
+    """The unary path of the gate before the rewrite: a queue per request and one lock around the table."""
+    def __init__(self) -> None:
+        self.pendings: dict[bytes, asyncio.Queue] = {}
+        self.pending_lock = asyncio.Lock()
+
+    async def request_ack(self, correlation_id: bytes):
+        async with self.pending_lock:
+            queue = self.pendings.get(correlation_id)
+            if queue is None:
+                queue = asyncio.Queue()
+                self.pendings[correlation_id] = queue
+        return queue
+
+    async def feed(self, message: PyAttpMessage) -> None:
+        async with self.pending_lock:
+            queue = self.pendings.get(message.correlation_id)
+            if queue is None:
+                return
+        queue.put_nowait(message)
+
+    async def wait_for_ack(self, correlation_id: bytes, timeout: float, *, queue: asyncio.Queue):
+        while True:
+            message = await asyncio.wait_for(queue.get(), timeout=timeout)
+            if message.command_type == AttpCommand.ACK:
+                return message
+
+    async def complete_ack(self, correlation_id: bytes):
+        async with self.pending_lock:
+            self.pendings.pop(correlation_id, None)
+
+
+async def _legacy(acks: list[PyAttpMessage]) -> None:
+    gate = LegacyAckGate()
+
+    async def call(correlation_id: bytes):
+        queue = await gate.request_ack(correlation_id)
+        await gate.wait_for_ack(correlation_id, 30.0, queue=queue)
+        await gate.complete_ack(correlation_id)
+
+    calls = [asyncio.create_task(call(ack.correlation_id)) for ack in acks]
+    await asyncio.sleep(0)
+    for ack in acks:
+        await gate.feed(ack)
+    await asyncio.gather(*calls)
+    assert not gate.pendings
+
+
+async def _current(acks: list[PyAttpMessage]) -> None:
+    gate = StatefulAckGate()
+
+    async def call(correlation_id: bytes):
+        pending = gate.request_ack(correlation_id, session_id="session-1")
+        try:
+            await gate.wait_for_ack(correlation_id, 30.0, pending=pending)
+        finally:
+            gate.complete_ack(correlation_id)
+
+    calls = [asyncio.create_task(call(ack.correlation_id)) for ack in acks]
+    await asyncio.sleep(0)
+    for ack in acks:
+        gate.resolve(ack)
+    await asyncio.gather(*calls)
+    assert not gate.pendings
+
+
+def main() -> int:
+    arguments = parser(__doc__, rounds=1, min_speedup=2.0)
+    arguments.add_argument("--pending", type=int, default=100_000)
+    args = arguments.parse_args()
+
+    acks = [
+        PyAttpMessage(route_id=2, command_type=AttpCommand.ACK, correlation_id=uuid4().bytes, payload=b"\xc0", version=b"\x01\x00")
+        for _ in range(args.pending)
+    ]
+    loop = asyncio.new_event_loop()
+    try:
+        return compare(
+            [(
+                f"{args.pending} pending calls",
+                lambda: loop.run_until_complete(_legacy(acks)),
+                lambda: loop.run_until_complete(_current(acks)),
+                args.rounds,
+            )],
+            labels=("queue + lock", "futures"),
+            min_speedup=args.min_speedup,
+            # A round of 100k calls takes seconds, a few repeats settle the median.
+            repeat=5,
+        )
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
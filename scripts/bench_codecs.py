@@ -0,0 +1,69 @@
+"""
+Times encoding and decoding of the payload codecs `CodecRegistry` negotiates by default on typical payload shapes
+(a small tool call, a page of records, an embedding and a binary tool result) and prints the encoded sizes.
+
+    PYTHONPATH=src python scripts/bench_codecs.py [--rounds N]
+
+Codecs that can't carry a payload (JSON and bytes, raw and anything but bytes) are listed as "n/a".
+"""
+import os
+import sys
+from typing import Any
+
+from _bench import best, format_time, parser
+from attp.shared import codecs
+from attp.shared.codecs import JsonCodec, MsgpackCodec, NativeMsgpackCodec, PayloadCodec, RawCodec
+
+
+def _record(index: int) -> dict[str, Any]:
+    return {
+        "id": index,
+        "title": f"document-{index}",
+        "score": index / 7,
+        "tags": [f"tag-{i}" for i in range(8)],
+        "owner": {"id": index % 13, "name": f"owner-{index % 13}"},
+    }
+
+
+PAYLOADS: dict[str, Any] = {
+    "tool call": {"tool": "search", "arguments": {"query": "open invoices", "limit": 20, "exact": False}},
+    "page of 100 records": {"items": [_record(i) for i in range(100)], "total": 100, "cursor": "next"},
+    "embedding (1536 floats)": {"model": "embed-v3", "vector": [i / 1536 for i in range(1536)]},
+    "binary result (256 KiB)": os.urandom(256 * 1024),
+}
+
+CODECS: list[PayloadCodec] = [MsgpackCodec(), NativeMsgpackCodec(), JsonCodec(), RawCodec()]
+
+
+def _encodable(codec: PayloadCodec, payload: Any) -> bytes | None:
+    try:
+        return codec.encode(payload)
+    except TypeError:
+        return None
+
+
+def main() -> int:
+    args = parser(__doc__, rounds=500).parse_args()
+    if codecs.orjson is None:
+        print("orjson is not installed, schema/json uses the standard library", file=sys.stderr)
+
+    print(f"{'payload':<26} {'codec':<24} {'size':>10} {'encode':>11} {'decode':>11}")
+    for payload_name, payload in PAYLOADS.items():
+        for codec in CODECS:
+            name = codec.name
+            encoded = _encodable(codec, payload)
+            if encoded is None:
+                print(f"{payload_name:<26} {name:<24} {'n/a':>10}")
+                continue
+
+            assert codec.decode(encoded) == payload, f"{name}: {payload_name} does not round-trip"
+            rounds = args.rounds if len(encoded) < 16 * 1024 else max(1, args.rounds // 10)
+            encode_time = best(lambda: codec.encode(payload), rounds, repeat=5)
+            decode_time = best(lambda: codec.decode(encoded), rounds, repeat=5)
+            print(f"{payload_name:<26} {name:<24} {len(encoded):>10} {format_time(encode_time):>11} {format_time(decode_time):>11}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Times `PayloadCompression.pack` / `unpack` with zlib (levels 1, 6 and 9, and with a preset dictionary)
+on msgpack encoded payloads, and prints the compression ratio and throughput of each.
+
+    PYTHONPATH=src python scripts/bench_compression.py [--rounds N] [--threshold BYTES]
+
+Payloads smaller than `--threshold` (default 1024, as `CompressionRegistry`) are sent as they are,
+so the small payload only shrinks with a threshold below its size, which is where the dictionary helps.
+"""
+import os
+import sys
+from typing import Any
+
+from _bench import best, format_time, parser
+from attp.shared.compression import Compressor, PayloadCompression, ZlibCompressor
+from attp.types.packing import packb
+
+
+def _record(index: int) -> dict[str, Any]:
+    return {
+        "id": index,
+        "title": f"document-{index}",
+        "status": "open" if index % 3 else "closed",
+        "tags": ["invoice", "customer", "priority"][: index % 3 + 1],
+        "owner": {"id": index % 13, "name": f"owner-{index % 13}"},
+    }
+
+
+PAYLOADS: dict[str, bytes] = {
+    "small record": packb(_record(42)),
+    "page of 200 records": packb({"items": [_record(i) for i in range(200)], "total": 200}),
+    "tool result (text)": packb({"content": " ".join(f"line {i}: the quick brown fox jumps over the lazy dog" for i in range(2000))}),
+    "random bytes (64 KiB)": packb(os.urandom(64 * 1024)),
+}
+
+# Shared by both peers, built from what small payloads of the service have in common.
+DICTIONARY = packb([_record(i) for i in range(3)])
+
+COMPRESSORS: dict[str, Compressor] = {
+    "zlib level 1": ZlibCompressor(level=1),
+    "zlib level 6": ZlibCompressor(),
+    "zlib level 9": ZlibCompressor(level=9),
+    "zlib level 6 + dict": ZlibCompressor(dictionary=DICTIONARY),
+}
+
+
+def main() -> int:
+    arguments = parser(__doc__, rounds=200)
+    arguments.add_argument("--threshold", type=int, default=1024)
+    args = arguments.parse_args()
+
+    print(f"{'payload':<22} {'compressor':<20} {'size':>8} {'packed':>8} {'ratio':>7} {'pack':>10} {'unpack':>10} {'MB/s':>8}")
+    for payload_name, payload in PAYLOADS.items():
+        for name, compressor in COMPRESSORS.items():
+            compression = PayloadCompression(compressor, args.threshold)
+            packed = compression.pack(payload)
+            assert compression.unpack(packed) == payload, f"{name}: {payload_name} does not round-trip"
+
+            rounds = args.rounds if len(payload) < 16 * 1024 else max(1, args.rounds // 10)
+            pack_time = best(lambda: compression.pack(payload), rounds, repeat=5)
+            unpack_time = best(lambda: compression.unpack(packed), rounds, repeat=5)
+            print(
+                f"{payload_name:<22} {name:<20} {len(payload):>8} {len(packed):>8} {len(payload) / len(packed):>6.2f}x"
+                f" {format_time(pack_time):>10} {format_time(unpack_time):>10} {len(payload) / pack_time / 1e6:>8.1f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Compares `AttpFrameDTO.mpd()` (compiled encoders) against `msgpack.packb(model_dump(mode="json"))`,
+the way frames were packed before, on nested and list-heavy DTOs.
+
+    PYTHONPATH=src python scripts/bench_packing.py [--rounds N] [--min-speedup X]
+
+Exits with status 1 when any case encodes less than `--min-speedup` (default 2.0) times faster.
+"""
+import sys
+
+import msgpack
+
+from _bench import compare, parser
+from attp.types.frame import AttpFrameDTO
+
+
+class Owner(AttpFrameDTO):
+    id: int
+    name: str
+    email: str | None = None
+
+
+class Item(AttpFrameDTO):
+    id: int
+    title: str
+    owner: Owner
+    tags: list[str]
+    scores: list[int]
+    weights: list[float]
+    attributes: dict[str, str]
+    parent_id: int | None = None
+
+
+class Page(AttpFrameDTO):
+    items: list[Item]
+    total: int
+    cursor: str | None = None
+
+
+def _item(index: int) -> Item:
+    return Item(
+        id=index,
+        title=f"item-{index}",
+        owner=Owner(id=index % 7, name=f"owner-{index % 7}"),
+        tags=[f"tag-{i}" for i in range(20)],
+        scores=list(range(index, index + 50)),
+        weights=[i / 8 for i in range(20)],
+        attributes={f"key-{i}": f"value-{i}" for i in range(10)},
+    )
+
+
+CASES: dict[str, AttpFrameDTO] = {
+    "item": _item(1),
+    "page of 50 items": Page(items=[_item(i) for i in range(50)], total=50, cursor="next"),
+}
+
+
+def _legacy(model: AttpFrameDTO) -> bytes:
+    return msgpack.packb(model.model_dump(mode="json"), use_bin_type=True)
+
+
+def main() -> int:
+    args = parser(__doc__, rounds=2000, min_speedup=2.0).parse_args()
+
+    cases = []
+    for name, model in CASES.items():
+        assert model.mpd() == _legacy(model), f"{name}: output differs from model_dump + packb"
+        rounds = args.rounds if len(_legacy(model)) < 4096 else max(1, args.rounds // 10)
+        cases.append((name, lambda model=model: _legacy(model), model.mpd, rounds))
+
+    return compare(cases, labels=("model_dump+packb", "mpd"), min_speedup=args.min_speedup)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
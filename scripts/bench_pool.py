@@ -0,0 +1,124 @@
+"""
+Measures single-peer call throughput over 1 to 8 pooled sessions: an echo peer runs in a child process
+and `--concurrency` callers send `--rounds` CALLs in total, spread round-robin over the open sessions
+the way the balancer spreads them over a `PeerPool`.
+
+    PYTHONPATH=src python scripts/bench_pool.py [--rounds N] [--concurrency N] [--payload-size BYTES]
+
+Sessions are raw `attp_core` sessions over TCP on 127.0.0.1, so the numbers are the transport's and
+the event loops', without routing, codecs and handler dispatch on top. Every pool size is timed
+three times and the best run is printed.
+"""
+import asyncio
+import multiprocessing
+import sys
+import time
+from uuid import uuid4
+
+import msgpack
+from attp_core.rs_api import AttpClientSession, AttpCommand, AttpTransport, PyAttpMessage
+
+from _bench import parser
+from attp.shared.limits import AttpLimits
+
+
+HOST = "127.0.0.1"
+PORT = 6599
+POOL_SIZES = (1, 2, 4, 8)
+
+
+def _serve(ready) -> None:
+    async def on_connection(session) -> None:
+        async def on_event(events: list[PyAttpMessage]) -> None:
+            acks = [
+                PyAttpMessage(route_id=event.route_id, command_type=AttpCommand.ACK, correlation_id=event.correlation_id, payload=event.payload, version=b"\x01\x00")
+                for event in events if event.command_type == AttpCommand.CALL
+            ]
+            if acks:
+                await session.send_batch(acks)
+
+        session.add_event_handler(on_event)
+        await asyncio.gather(session.start_handler(), session.start_listener())
+
+    async def main() -> None:
+        transport = AttpTransport(host=HOST, port=PORT, on_connection=on_connection, limits=AttpLimits().to_model())
+        server = asyncio.ensure_future(transport.start_server())
+        await asyncio.sleep(0.2)
+        ready.set()
+        await server
+
+    asyncio.run(main())
+
+
+async def _open(count: int, waiters: dict[bytes, asyncio.Future]) -> tuple[list, list[asyncio.Future]]:
+    async def on_event(events: list[PyAttpMessage]) -> None:
+        for event in events:
+            waiter = waiters.pop(event.correlation_id, None)
+            if waiter is not None:
+                waiter.set_result(event)
+
+    sessions, listeners = [], []
+    for _ in range(count):
+        client = await AttpClientSession(f"attp://{HOST}:{PORT}", limits=AttpLimits().to_model()).connect(max_retries=3)
+        session = client.session
+        session.add_event_handler(on_event)
+        listeners.append(asyncio.ensure_future(asyncio.gather(session.start_handler(), session.start_listener(), return_exceptions=True)))
+        sessions.append(session)
+    return sessions, listeners
+
+
+async def _throughput(pool_size: int, calls: int, concurrency: int, payload: bytes) -> float:
+    loop = asyncio.get_running_loop()
+    waiters: dict[bytes, asyncio.Future] = {}
+    sessions, listeners = await _open(pool_size, waiters)
+
+    async def caller(offset: int) -> None:
+        for index in range(calls // concurrency):
+            correlation_id = uuid4().bytes
+            waiter = waiters[correlation_id] = loop.create_future()
+            await sessions[(offset + index) % pool_size].send(PyAttpMessage(
+                route_id=2, command_type=AttpCommand.CALL, correlation_id=correlation_id, payload=payload, version=b"\x01\x00"
+            ))
+            await waiter
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(caller(offset) for offset in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    for session in sessions:
+        session.disconnect()
+    await asyncio.wait(listeners, timeout=1)
+    return calls // concurrency * concurrency / elapsed
+
+
+def main() -> int:
+    arguments = parser(__doc__, rounds=20000)
+    arguments.add_argument("--concurrency", type=int, default=256)
+    arguments.add_argument("--payload-size", type=int, default=256)
+    args = arguments.parse_args()
+
+    ready = multiprocessing.Event()
+    peer = multiprocessing.Process(target=_serve, args=(ready,), daemon=True)
+    peer.start()
+    if not ready.wait(10):
+        print("The echo peer did not start", file=sys.stderr)
+        return 1
+
+    payload = msgpack.packb(b"x" * args.payload_size)
+    loop = asyncio.new_event_loop()
+    try:
+        print(f"{'sessions':<10} {'calls/s':>12} {'vs 1 session':>14}")
+        single = None
+        for pool_size in POOL_SIZES:
+            rate = max(loop.run_until_complete(_throughput(pool_size, args.rounds, args.concurrency, payload)) for _ in range(3))
+            single = single or rate
+            print(f"{pool_size:<10} {rate:>12.0f} {rate / single:>13.2f}x")
+    finally:
+        loop.close()
+        peer.terminate()
+        peer.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Compares the round-trip latency of awaited ACKs delivered by `_route_incoming()` straight to the
+pending request table against the queue path responses used to take: `incoming_listener` ->
+`AttpMultiReceiver` (namespace and global receivers) -> dispatcher task -> `StatefulAckGate.feed()`.
+
+    PYTHONPATH=src python scripts/bench_response_fast_path.py [--rounds N] [--min-speedup X]
+
+Each round is a batch of sequential calls answered by an ACK on the same loop, so the numbers are
+the event loop hops a caller waits through and not transport latency.
+Exits with status 1 when the fast path is less than `--min-speedup` (default 1.5) times faster.
+"""
+import asyncio
+import logging
+import sys
+from uuid import uuid4
+
+from attp_core.rs_api import AttpCommand, PyAttpMessage
+
+from _bench import compare, parser
+from attp.shared.codecs import CodecRegistry
+from attp.shared.compression import CompressionRegistry
+from attp.shared.multireceiver import AttpMultiReceiver
+from attp.shared.sessions import driver as driver_module
+from attp.shared.sessions.configs import SessionConfigs
+from attp.shared.sessions.driver import SessionTerminatorMixin
+from attp.shared.utils.ack_gate import StatefulAckGate
+
+
+CALLS = 100
+
+
+class IdleSession:
+    session_id = "session-1"
+
+
+class Driver(SessionTerminatorMixin):
+    async def start(self):
+        ...
+
+    async def _on_event(self, events):
+        ...
+
+
+def _providers() -> dict:
+    # What the Ascender container hands session drivers, without booting an application.
+    return {
+        "ASC_LOGGER": logging.getLogger("attp.bench"),
+        StatefulAckGate: StatefulAckGate(),
+        SessionConfigs: SessionConfigs(keepalive_interval=0),
+        CodecRegistry: CodecRegistry(),
+        CompressionRegistry: CompressionRegistry(),
+    }
+
+
+def _ack(correlation_id: bytes) -> PyAttpMessage:
+    return PyAttpMessage(route_id=2, command_type=AttpCommand.ACK, correlation_id=correlation_id, payload=b"\xc0", version=b"\x01\x00")
+
+
+async def _round_trips(driver: Driver, deliver) -> None:
+    gate = driver.ack_gate
+    for _ in range(CALLS):
+        correlation_id = uuid4().bytes
+        pending = gate.request_ack(correlation_id, session_id=driver.session_id)
+        deliver(_ack(correlation_id))
+        try:
+            await gate.wait_for_ack(correlation_id, 1.0, pending=pending)
+        finally:
+            gate.complete_ack(correlation_id)
+
+
+async def _queued(driver: Driver) -> None:
+    receiver = AttpMultiReceiver(lambda item: item[0].namespace, fanout_global=True, auto_create=False)
+    namespace = receiver.subscribe(driver.namespace)
+
+    async def listen():
+        while True:
+            receiver.on_next((driver, await driver.incoming_listener.get()))
+
+    async def dispatch():
+        while True:
+            _, frame = await receiver.get()
+            await driver.ack_gate.feed(frame)
+
+    async def drain_namespace():
+        while True:
+            await namespace.get()
+
+    tasks = [asyncio.create_task(task()) for task in (listen, dispatch, drain_namespace)]
+    try:
+        await _round_trips(driver, driver._enqueue_incoming)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _fast(driver: Driver) -> None:
+    await _round_trips(driver, driver._route_incoming)
+
+
+def main() -> int:
+    args = parser(__doc__, rounds=20, min_speedup=1.5).parse_args()
+
+    providers = _providers()
+    driver_module.inject = providers.__getitem__  # type: ignore[assignment]
+    loop = asyncio.new_event_loop()
+    driver = Driver(IdleSession())  # type: ignore[arg-type]
+    driver._loop = loop
+
+    try:
+        loop.run_until_complete(_fast(driver))
+        loop.run_until_complete(_queued(driver))
+        assert not driver.ack_gate.pendings
+
+        return compare(
+            [(
+                f"{CALLS} sequential ACKs",
+                lambda: loop.run_until_complete(_queued(driver)),
+                lambda: loop.run_until_complete(_fast(driver)),
+                args.rounds,
+            )],
+            labels=("queue path", "fast path"),
+            min_speedup=args.min_speedup,
+        )
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
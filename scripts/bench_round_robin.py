@@ -0,0 +1,99 @@
+"""
+Compares `AttpLoadBalancer.acquire_session()` throughput of the default stack (round-robin over
+`SimpleInMemoryCacher`, counted with `increment_nowait()`) against the awaited, lock-guarded
+`increment()` the in-memory cacher used to serve round-robin with.
+
+    PYTHONPATH=src python scripts/bench_round_robin.py [--rounds N] [--min-speedup X]
+
+Exits with status 1 when any case is less than `--min-speedup` (default 1.1) times faster.
+"""
+import asyncio
+import sys
+from typing import Any, Coroutine
+
+from _bench import compare, parser
+from attp.loadbalancer.balancer import AttpLoadBalancer
+from attp.loadbalancer.caches.memory_cache import SimpleInMemoryCacher
+from attp.loadbalancer.configs import BalancerConfigs
+from attp.loadbalancer.strategies.round_robin import BasicRoundRobinStrategy
+from attp.shared.namespaces.dispatcher import NamespaceDispatcher
+
+
+PICKS = 1000
+
+
+class LegacyInMemoryCacher(SimpleInMemoryCacher):
+    """The in-memory cacher before the lock-free counters: every increment is awaited under a lock."""
+    supports_sync = False
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = asyncio.Lock()
+
+    async def increment(self, key: str, *, delta: int = 1, initial: int = 0) -> int:
+        async with self._lock:
+            return self.increment_nowait(key, delta=delta, initial=initial)
+
+
+class Session:
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self._role = "client"
+
+
+def _balancer(cacher: SimpleInMemoryCacher) -> AttpLoadBalancer:
+    namespaces = NamespaceDispatcher()
+    for index in range(8):
+        namespaces.add_session("peer", Session(f"session-{index}"))  # type: ignore[arg-type]
+    return AttpLoadBalancer(namespaces, [BasicRoundRobinStrategy], BalancerConfigs(balancing_strategy="round-robin"), cacher)
+
+
+def _drive(coroutine: Coroutine) -> Any:
+    # An uncontended pick never suspends, it completes on the first step without an event loop.
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("The pick suspended")
+
+
+async def _concurrent(balancer: AttpLoadBalancer) -> None:
+    await asyncio.gather(*(balancer.acquire_session("peer") for _ in range(PICKS)))
+
+
+def main() -> int:
+    args = parser(__doc__, rounds=20000, min_speedup=1.1).parse_args()
+
+    legacy = _balancer(LegacyInMemoryCacher())
+    current = _balancer(SimpleInMemoryCacher())
+    assert current.cacher.supports_sync and not legacy.cacher.supports_sync
+
+    picked = [_drive(balancer.acquire_session("peer")).session_id for balancer in (legacy, current) for _ in range(2)]
+    assert picked == ["session-0", "session-1"] * 2
+
+    loop = asyncio.new_event_loop()
+    try:
+        return compare(
+            [
+                (
+                    "acquire_session",
+                    lambda: _drive(legacy.acquire_session("peer")),
+                    lambda: _drive(current.acquire_session("peer")),
+                    args.rounds,
+                ),
+                (
+                    f"{PICKS} concurrent acquires",
+                    lambda: loop.run_until_complete(_concurrent(legacy)),
+                    lambda: loop.run_until_complete(_concurrent(current)),
+                    max(1, args.rounds // PICKS),
+                ),
+            ],
+            labels=("awaited increment", "increment_nowait"),
+            min_speedup=args.min_speedup,
+        )
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Compares `AttpRouter.relevant_route()` / `dispatch()` (hash indexes) against the linear scans over
+the route lists they replaced, for routers of growing size.
+
+    PYTHONPATH=src python scripts/bench_routes.py [--rounds N] [--min-speedup X]
+
+Exits with status 1 when any case looks up routes less than `--min-speedup` (default 2.0) times faster.
+"""
+import sys
+
+from _bench import compare, parser
+from attp.shared.namespaces.router import AttpRouter
+from attp.types.frames.route_mapping import IRouteMapping
+
+
+def handler(data: dict) -> dict:
+    return data
+
+
+def _router(routes: int, namespaces: int = 4) -> AttpRouter:
+    router = AttpRouter()
+    for index in range(routes):
+        router.add_route("message", f"service.method-{index}", handler, namespace=f"ns-{index % namespaces}")
+
+    for namespace in range(namespaces):
+        remote = [
+            IRouteMapping(pattern=f"remote.method-{index}", route_id=index + 2, route_type="message", namespace=f"ns-{namespace}")
+            for index in range(routes // namespaces)
+        ]
+        router.include_remote_routes(f"ns-{namespace}", remote, "client")
+    return router
+
+
+def _legacy_relevant_route(router: AttpRouter, route_id: int, namespace: str):
+    return router.routes.filter(lambda r: r.route_id == route_id and r.namespace == namespace).last()
+
+
+def _legacy_dispatch(router: AttpRouter, pattern: str, namespace: str):
+    return router.remote_routes_client[namespace].filter(
+        lambda r: r.pattern == pattern and r.route_type == "message" and r.namespace == namespace
+    ).last()
+
+
+def main() -> int:
+    args = parser(__doc__, rounds=2000, min_speedup=2.0).parse_args()
+
+    cases = []
+    for size in (16, 256, 2048):
+        router = _router(size)
+        # The last registered routes, the worst case for the scan.
+        route_id, namespace = size + 1, f"ns-{(size - 1) % 4}"
+        pattern = f"remote.method-{size // 4 - 1}"
+
+        assert _legacy_relevant_route(router, route_id, namespace) is router.relevant_route(route_id, namespace)
+        assert _legacy_dispatch(router, pattern, namespace) is router.dispatch(pattern, "message", namespace=namespace, role="client")
+
+        rounds = max(1, args.rounds * 16 // size)
+        cases.append((
+            f"relevant_route, {size} routes",
+            lambda router=router, route_id=route_id, namespace=namespace: _legacy_relevant_route(router, route_id, namespace),
+            lambda router=router, route_id=route_id, namespace=namespace: router.relevant_route(route_id, namespace),
+            rounds,
+        ))
+        cases.append((
+            f"dispatch, {size} routes",
+            lambda router=router, pattern=pattern, namespace=namespace: _legacy_dispatch(router, pattern, namespace),
+            lambda router=router, pattern=pattern, namespace=namespace: router.dispatch(pattern, "message", namespace=namespace, role="client"),
+            rounds,
+        ))
+
+    return compare(cases, labels=("linear scan", "index"), min_speedup=args.min_speedup)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Compares deadlines of `--outstanding` (default 50k) pending requests tracked by one `DeadlineWheel`
+against a loop timer per request, the way `asyncio.wait_for` around every wait used to track them.
+
+    PYTHONPATH=src python scripts/bench_timer_wheel.py [--rounds N] [--outstanding N] [--min-speedup X]
+
+"schedule + cancel" arms and disarms every deadline, "awaited futures" has every request wait for
+its response under a deadline while all of them are outstanding, then resolves them.
+Exits with status 1 when any case is less than `--min-speedup` (default 1.2) times faster,
+the awaited case is bounded by the task every request runs in on both sides.
+"""
+import asyncio
+import math
+import sys
+
+from _bench import compare, parser
+from attp.shared.utils.timer_wheel import DeadlineWheel
+
+
+TIMEOUT = 30.0
+
+
+class Entry:
+    __slots__ = ("deadline", "wheel_slot")
+
+    def __init__(self) -> None:
+        self.deadline = math.inf
+        self.wheel_slot: int | None = None
+
+    def expire(self) -> None:
+        raise AssertionError("No deadline should expire while benchmarking")
+
+
+async def _timers_schedule(entries: list[Entry]) -> None:
+    loop = asyncio.get_running_loop()
+    handles = [loop.call_later(TIMEOUT, entry.expire) for entry in entries]
+    for handle in handles:
+        handle.cancel()
+
+
+async def _wheel_schedule(entries: list[Entry]) -> None:
+    wheel = DeadlineWheel()
+    deadline = wheel.time() + TIMEOUT
+    for entry in entries:
+        wheel.schedule(entry, deadline)
+    for entry in entries:
+        wheel.cancel(entry)
+
+
+async def _timers_await(outstanding: int) -> None:
+    loop = asyncio.get_running_loop()
+    futures = [loop.create_future() for _ in range(outstanding)]
+    waiters = [asyncio.create_task(asyncio.wait_for(future, TIMEOUT)) for future in futures]
+    await asyncio.sleep(0)
+    for future in futures:
+        future.set_result(None)
+    await asyncio.gather(*waiters)
+
+
+async def _wheel_await(outstanding: int) -> None:
+    loop = asyncio.get_running_loop()
+    wheel = DeadlineWheel()
+
+    async def wait(entry: Entry, future: asyncio.Future) -> None:
+        wheel.schedule(entry, wheel.time() + TIMEOUT)
+        try:
+            await future
+        finally:
+            wheel.cancel(entry)
+
+    futures = [loop.create_future() for _ in range(outstanding)]
+    waiters = [asyncio.create_task(wait(Entry(), future)) for future in futures]
+    await asyncio.sleep(0)
+    for future in futures:
+        future.set_result(None)
+    await asyncio.gather(*waiters)
+    assert not len(wheel)
+
+
+def main() -> int:
+    arguments = parser(__doc__, rounds=1, min_speedup=1.2)
+    arguments.add_argument("--outstanding", type=int, default=50_000)
+    args = arguments.parse_args()
+
+    entries = [Entry() for _ in range(args.outstanding)]
+    loop = asyncio.new_event_loop()
+    try:
+        return compare(
+            [
+                (
+                    f"schedule + cancel, {args.outstanding}",
+                    lambda: loop.run_until_complete(_timers_schedule(entries)),
+                    lambda: loop.run_until_complete(_wheel_schedule(entries)),
+                    args.rounds,
+                ),
+                (
+                    f"awaited futures, {args.outstanding}",
+                    lambda: loop.run_until_complete(_timers_await(args.outstanding)),
+                    lambda: loop.run_until_complete(_wheel_await(args.outstanding)),
+                    args.rounds,
+                ),
+            ],
+            labels=("timer per request", "DeadlineWheel"),
+            min_speedup=args.min_speedup,
+            repeat=5,
+        )
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,12 +9,17 @@ from attp.shared.limits import AttpLimits
 class AttpClientConfigs(BaseDTO):
     model_config = {"arbitrary_types_allowed": True}
     
-    remote_uri: str # attp://host:port
+    remote_uri: str # attp://host:port, or loopback:// for a namespace served by this process
     namespace: str = "default"
     data: Any | None = None
     authorization: Any | None = None
     auth: Any | None = None
     capabilities: list[str] = Field(default_factory=lambda: ["schema/msgpack", "streaming"])
+    pool_size: int = Field(default=1, ge=1)
+    max_pool_size: int | None = Field(default=None, ge=1)
+    pool_grow_threshold: int = Field(default=32, ge=1)
+    pool_check_interval: float = Field(default=1.0, gt=0)
+    loopback_serialization: bool = False
 
 
 class ServiceDiscoveryConfigs(BaseDTO):
@@ -30,3 +35,7 @@ class ServiceDiscoveryConfigs(BaseDTO):
     ) = None
     reconnection: bool = True
     max_retries: int = 20
+    connect_concurrency: int = Field(default=16, ge=1)
+    reconnect_base_delay: float = Field(default=0.5, gt=0)
+    reconnect_max_delay: float = Field(default=30.0, gt=0)
+    drain_timeout: float = Field(default=30.0, ge=0)
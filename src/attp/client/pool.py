@@ -0,0 +1,190 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+from attp.client.authenticator import ConnectionAuthenticator
+from attp.client.configs import AttpClientConfigs
+from attp.client.session_driver import ClientSessionDriver
+from attp.shared.sessions.loopback import LoopbackSessionDriver
+
+if TYPE_CHECKING:
+    from attp.client.service_discovery import ServiceDiscovery
+
+
+@dataclass(slots=True)
+class PeerConnectionStats:
+    state: Literal["connecting", "connected", "degraded", "disconnected", "stopped"] = "connecting"
+    connected: int = 0
+    connecting: int = 0
+    connects: int = 0
+    failed_attempts: int = 0
+    reconnects: int = 0
+    last_error: str | None = None
+    last_connected_at: float | None = None
+    last_disconnected_at: float | None = None
+
+
+class PeerPool:
+    """
+    Pool of transport sessions opened to a single peer.
+
+    `pool_size` sessions are opened concurrently and registered in the peer's namespace,
+    so the balancer spreads calls over all of them. With `max_pool_size` the pool grows one session at a time
+    whenever the average number of in-flight requests per session reaches `pool_grow_threshold`.
+
+    Every session slot is supervised: with `reconnection` enabled a failed or dropped session is reconnected
+    with jittered exponential backoff between `reconnect_base_delay` and `reconnect_max_delay`.
+    """
+    def __init__(
+        self,
+        discovery: "ServiceDiscovery",
+        config: AttpClientConfigs,
+        authenticator: ConnectionAuthenticator | None = None
+    ) -> None:
+        self.discovery = discovery
+        self.config = config
+        self.authenticator = authenticator
+        self.members: set[ClientSessionDriver | LoopbackSessionDriver] = set()
+        self.stats = PeerConnectionStats()
+        
+        self._slots: set[asyncio.Task] = set()
+        self._monitor: asyncio.Task | None = None
+        self._stopped = False
+        self._stop_event = asyncio.Event()
+    
+    @property
+    def size(self) -> int:
+        return len(self._slots)
+    
+    @property
+    def max_size(self) -> int:
+        return max(self.config.max_pool_size or self.config.pool_size, self.config.pool_size)
+    
+    async def run(self) -> None:
+        """Opens the pool and waits until all of its session slots are done."""
+        for _ in range(self.config.pool_size):
+            self._open_slot()
+        
+        if self.max_size > self.config.pool_size:
+            self._monitor = asyncio.create_task(self._watch_load())
+        
+        try:
+            while self._slots:
+                await asyncio.wait(set(self._slots))
+        finally:
+            self.stop()
+    
+    def stop(self) -> None:
+        """Stops supervising the pool, open sessions are left to be closed by the caller."""
+        self._stopped = True
+        self._stop_event.set()
+        self.stats.state = "stopped"
+        if self._monitor:
+            self._monitor.cancel()
+            self._monitor = None
+    
+    def _open_slot(self) -> None:
+        task = asyncio.create_task(self._supervise())
+        self._slots.add(task)
+        task.add_done_callback(self._slots.discard)
+    
+    async def _supervise(self) -> None:
+        attempt = 0
+        while not self._stopped:
+            if await self._serve():
+                attempt = 0
+            else:
+                attempt += 1
+            
+            if self._stopped or not self.discovery.configs.reconnection:
+                return
+            
+            delay = self._backoff(attempt)
+            self.discovery.logger.info(
+                "[cyan]ATTP[/] ┆ Reconnecting to peer %s in %.2fs",
+                self.config.remote_uri,
+                delay,
+            )
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+                return
+            except asyncio.TimeoutError:
+                self.stats.reconnects += 1
+    
+    async def _serve(self) -> bool:
+        """Runs one session of the slot, returns whether it got connected."""
+        self.stats.connecting += 1
+        self._refresh_state()
+        try:
+            driver = await self.discovery.connect(self.config, conn_authenticator=self.authenticator)
+        except Exception as exc:
+            self.discovery.logger.error(
+                "[cyan]ATTP[/] ┆ Failed to connect to peer %s (%s)",
+                self.config.remote_uri,
+                exc,
+            )
+            driver = None
+            self.stats.last_error = str(exc)
+        finally:
+            self.stats.connecting -= 1
+        
+        if not driver:
+            self.stats.failed_attempts += 1
+            self._refresh_state()
+            return False
+        
+        if self._stopped:
+            # Connected while the pool was being shut down.
+            await driver.close()
+            return True
+        
+        self.members.add(driver)
+        self.stats.connects += 1
+        self.stats.last_connected_at = time.time()
+        self._refresh_state()
+        try:
+            await self.discovery.listen(driver)
+        finally:
+            self.members.discard(driver)
+            self.stats.last_disconnected_at = time.time()
+            self._refresh_state()
+        
+        return True
+    
+    def _backoff(self, attempt: int) -> float:
+        configs = self.discovery.configs
+        ceiling = min(configs.reconnect_max_delay, configs.reconnect_base_delay * 2 ** max(attempt - 1, 0))
+        # "Equal jitter", keeps at least half of the delay while spreading reconnect storms.
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+    
+    def _refresh_state(self) -> None:
+        stats = self.stats
+        stats.connected = len(self.members)
+        if self._stopped:
+            stats.state = "stopped"
+        elif stats.connected and stats.connected >= self.size:
+            stats.state = "connected"
+        elif stats.connected:
+            stats.state = "degraded"
+        elif stats.connecting:
+            stats.state = "connecting"
+        else:
+            stats.state = "disconnected"
+    
+    async def _watch_load(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.pool_check_interval)
+            if not self.members or self.size >= self.max_size or len(self.members) < self.size:
+                # Still at max, or a session is being opened right now.
+                continue
+            
+            in_flight = sum(member.in_flight for member in self.members)
+            if in_flight / len(self.members) >= self.config.pool_grow_threshold:
+                self.discovery.logger.info(
+                    "[cyan]ATTP[/] ┆ Growing the session pool of peer %s to %s sessions",
+                    self.config.remote_uri,
+                    self.size + 1,
+                )
+                self._open_slot()
@@ -5,6 +5,7 @@ from typing import Annotated
 from ascender.core import Inject
 from attp.client.authenticator import ConnectionAuthenticator
 from attp.client.configs import AttpClientConfigs, ServiceDiscoveryConfigs
+from attp.client.pool import PeerConnectionStats, PeerPool
 from attp.client.session_driver import ClientSessionDriver
 from attp.server.session_driver import ServerSessionDriver
 from attp.shared.lifecycle_service import LifecycleService
@@ -15,6 +16,7 @@ from attp.shared.multireceiver import AttpMultiReceiver
 from attp.shared.namespaces.dispatcher import NamespaceDispatcher
 from attp.shared.objects.dispatcher import AttpFrameDispatcher
 from attp.shared.sessions.driver import AttpSessionDriver
+from attp.shared.sessions.loopback import LOOPBACK_SCHEME, LoopbackSessionDriver
 
 
 class ServiceDiscovery(LifecycleService):
@@ -33,6 +35,10 @@ class ServiceDiscovery(LifecycleService):
         self.dispatcher = dispatcher
         
         self.conlock = asyncio.Lock()
+        self.pools: list[PeerPool] = []
+        self._connect_slots = asyncio.Semaphore(configs.connect_concurrency)
+        self._connections: asyncio.Task | None = None
+        self._loopback_listeners: set[asyncio.Task] = set()
         
         self.logger = logger
         self.is_active = False
@@ -42,7 +48,14 @@ class ServiceDiscovery(LifecycleService):
             self.logger.info("Activating service discovery...")
             self.is_active = True
     
+    @property
+    def connection_stats(self) -> dict[str, PeerConnectionStats]:
+        """Connection state of every peer pool, keyed by `namespace@remote_uri`."""
+        return {f"{pool.config.namespace}@{pool.config.remote_uri}": pool.stats for pool in self.pools}
+    
     async def start_initial_connections(self):
+        """Connects to all peers concurrently, `connect_concurrency` bounds how many handshakes run at once."""
+        connections = []
         for peer in self.configs.peers:
             if isinstance(peer, str):
                 peer = AttpClientConfigs(remote_uri=peer)
@@ -52,19 +65,36 @@ class ServiceDiscovery(LifecycleService):
                 authenticator = authenticator(peer.remote_uri, peer.namespace)
             elif callable(authenticator):
                 authenticator = authenticator(peer)
-            try:
-                await self.initiate_connection(peer, conn_authenticator=authenticator)
-            except Exception as exc:
+            
+            connections.append(self.initiate_connection(peer, conn_authenticator=authenticator))
+        
+        for peer, result in zip(self.configs.peers, await asyncio.gather(*connections, return_exceptions=True)):
+            if isinstance(result, Exception):
                 self.logger.error(
                     "[cyan]ATTP[/] ┆ Failed to connect to peer %s (%s)",
-                    peer.remote_uri,
-                    exc,
+                    peer if isinstance(peer, str) else peer.remote_uri,
+                    result,
                 )
     
     async def on_startup(self):
-        asyncio.create_task(self.start_initial_connections())
+        self._connections = asyncio.create_task(self.start_initial_connections())
     
     async def on_shutdown(self):
+        """
+        Stops reconnecting, then drains every pooled session: peers are told to stop routing calls to this node
+        and in-flight calls and streams get up to `drain_timeout` to finish before the sessions are closed.
+        """
+        for pool in self.pools:
+            pool.stop()
+        
+        members = [member for pool in self.pools for member in pool.members]
+        results = await asyncio.gather(*(member.drain(self.configs.drain_timeout) for member in members), return_exceptions=True)
+        unfinished = sum(1 for result in results if result is not True)
+        if unfinished:
+            self.logger.warning("[cyan]ATTP[/] ┆ %s peer session(s) were closed with requests still in flight", unfinished)
+        
+        if self._connections:
+            self._connections.cancel()
         self.dispatcher.stop_all()
     
     async def on_session_termination(self, session_driver: ClientSessionDriver):
@@ -76,32 +106,81 @@ class ServiceDiscovery(LifecycleService):
             self.logger.info("[cyan]ATTP[/] ┆ Session (%s) disconnected before being registered", session_driver._session or "unknown")
 
     
+    def on_session_draining(self, session_driver: ClientSessionDriver):
+        self.namespaces.mark_draining(session_driver)
+    
     async def initiate_connection(self, config: AttpClientConfigs, conn_authenticator: ConnectionAuthenticator | None = None):
-        client = AttpClientSession(config.remote_uri, limits=self.configs.limits.to_model())
+        """Opens the peer's session pool and waits until all of its sessions are gone."""
+        pool = PeerPool(self, config, conn_authenticator)
+        self.pools.append(pool)
+        try:
+            await pool.run()
+        finally:
+            self.pools.remove(pool)
+    
+    async def connect(self, config: AttpClientConfigs, conn_authenticator: ConnectionAuthenticator | None = None) -> ClientSessionDriver | LoopbackSessionDriver | None:
+        """Connects and authenticates a single session, then registers it in its namespace."""
+        if config.remote_uri.startswith(LOOPBACK_SCHEME):
+            return await self.connect_loopback(config)
+        
+        async with self._connect_slots:
+            client = AttpClientSession(config.remote_uri, limits=self.configs.limits.to_model())
 
-        client = await client.connect(max_retries=self.configs.max_retries)
+            client = await client.connect(max_retries=self.configs.max_retries)
 
-        if not client.session:
-            raise ConnectionError("Failed to connect to the server.")
+            if not client.session:
+                raise ConnectionError("Failed to connect to the server.")
+            
+            driver = ClientSessionDriver(
+                client.session,
+                on_termination=self.on_session_termination,
+                on_draining=self.on_session_draining
+            )
+            
+            if not conn_authenticator:
+                authenticator = ConnectionAuthenticator(config.remote_uri, config.namespace, config.authorization, config.data)
+            else:
+                authenticator = conn_authenticator
+            
+            try:
+                namespace, _ = await driver.start(config.capabilities, authenticator)
+            except TimeoutError:
+                self.logger.error("[cyan]ATTP[/] ┆ Session (%s) %s failed to authenticate, flushing the connection!", client.session.peername, client.session.session_id)
+                await driver.close()
+                del driver
+                return None
         
-        driver = ClientSessionDriver(client.session, on_termination=self.on_session_termination)
+        async with self.conlock:
+            self.namespaces.add_session(namespace, driver)
         
-        if not conn_authenticator:
-            authenticator = ConnectionAuthenticator(config.remote_uri, config.namespace, config.authorization, config.data)
-        else:
-            authenticator = conn_authenticator
+        return driver
+    
+    async def connect_loopback(self, config: AttpClientConfigs) -> LoopbackSessionDriver:
+        """
+        Opens an in-process session to the namespace's local route handlers and registers it in the namespace.
+        There is no socket and no handshake, calls are handled by this node's frame dispatcher.
+        """
+        driver, server_end = LoopbackSessionDriver.pair(
+            config.namespace,
+            serialize=config.loopback_serialization,
+            on_termination=self.on_session_termination,
+            on_draining=self.on_session_draining
+        )
+        await server_end.start()
+        await driver.start()
         
-        try:
-            namespace, _ = await driver.start(config.capabilities, authenticator)
-        except TimeoutError:
-            self.logger.error("[cyan]ATTP[/] ┆ Session (%s) %s failed to authenticate, flushing the connection!", client.session.peername, client.session.session_id)
-            await driver.close()
-            del driver
-            return
+        listener = asyncio.create_task(self.listen(server_end))
+        self._loopback_listeners.add(listener)
+        listener.add_done_callback(self._loopback_listeners.discard)
         
         async with self.conlock:
-            self.namespaces.add_session(namespace, driver)
-            receiver = self.multireceiver.receiver(namespace)
+            self.namespaces.add_session(driver.namespace, driver)
+        
+        return driver
+    
+    async def listen(self, driver: AttpSessionDriver):
+        async with self.conlock:
+            receiver = self.multireceiver.receiver(driver.namespace)
             self.dispatcher.start(receiver)
         
         await driver.listen(receiver)
@@ -30,7 +30,8 @@ class ClientSessionDriver(
     async def start(self, capabilities: list, conn_authenticator: ConnectionAuthenticator):
         asyncio.create_task(self.start_listener())
         self._role = "client"
-        self._capabilities = capabilities
+        self._capabilities = self._advertised(capabilities)
+        self.supported = list(self._capabilities)
         self._namespace = conn_authenticator.namespace
         if os.getenv("ATTP_AUTH_DEBUG") == "1":
             log = getattr(self.logger, "info", None)
@@ -83,11 +84,11 @@ class ClientSessionDriver(
                 await self.handle_disconnect()
                 return
             elif event.command_type == AttpCommand.ERR:
-                self._enqueue_incoming(event)
+                self._route_incoming(event)
                 return
             else:
                 if self.is_authenticated:
-                    self._enqueue_incoming(event)
+                    self._route_incoming(event)
 
     async def _register_connection(self, frame: IAcceptedDTO):
         super()._register_connection(frame)
@@ -100,6 +101,7 @@ class ClientSessionDriver(
             return
         
         self.auth_flag.set()
+        self.ready_flag.set()
         self.connection_estabilished_at = frame.server_time
         
         routes = self.router.get_routes(namespace=self.namespace)
@@ -113,6 +115,7 @@ class ClientSessionDriver(
                 payload=IReadyDTO(
                     data=self.authenticator.data,
                     caps=self.capabilities,
+                    accepts=self.supported,
                     routes=routes
                 ).mpd(),
                 version=self.version_bytes()
@@ -7,9 +7,10 @@ from attp.shared.namespaces.router import AttpRouter
 class AttpCall(ControllerDecoratorHook):
     router: AttpRouter = inject(AttpRouter)
     
-    def __init__(self, pattern: str, namespace: str = "default") -> None:
+    def __init__(self, pattern: str, namespace: str = "default", codec: str | None = None) -> None:
         self.pattern = pattern
         self.namespace = namespace
+        self.codec = codec
     
     def on_load(self, callable: Callable[..., Any]):
-        self.router.add_route("message", self.pattern, callable, namespace=self.namespace)
\ No newline at end of file
+        self.router.add_route("message", self.pattern, callable, namespace=self.namespace, codec=self.codec)
\ No newline at end of file
@@ -11,10 +11,12 @@ class AttpEvent(ControllerDecoratorHook):
     def __init__(
         self, 
         pattern: str, 
-        namespace: str = "default"
+        namespace: str = "default",
+        codec: str | None = None
     ) -> None:
         self.pattern = pattern
         self.namespace = namespace
+        self.codec = codec
     
     def on_load(self, callable: Callable[..., Any]):
-        self.router.add_event(self.pattern, callable, namespace=self.namespace)
\ No newline at end of file
+        self.router.add_event(self.pattern, callable, namespace=self.namespace, codec=self.codec)
\ No newline at end of file
@@ -6,6 +6,14 @@ T = TypeVar("T")
 
 
 class StrategyCacher(ABC):
+    """
+    Storage for balancing strategies' state.
+
+    Backends living in the process (and on the event loop) may set `supports_sync` and implement
+    the `*_nowait` methods, strategies then use them on the hot path instead of awaiting.
+    External backends keep implementing the async interface only.
+    """
+    supports_sync: bool = False
     
     @abstractmethod
     async def store(self, key: str, value: Any) -> Any:
@@ -21,3 +29,12 @@ class StrategyCacher(ABC):
     
     async def keys(self):
         raise NotImplementedError
+    
+    def store_nowait(self, key: str, value: Any) -> Any:
+        raise NotImplementedError
+    
+    def get_nowait(self, key: str, *, expected_type: type[T] | None = None) -> T | Any:
+        raise NotImplementedError
+    
+    def increment_nowait(self, key: str, *, delta: int = 1, initial: int = 0) -> int:
+        raise NotImplementedError
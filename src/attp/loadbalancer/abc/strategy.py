@@ -19,4 +19,18 @@ class BalancingStrategy(ABC):
     
     @abstractmethod
     async def balance(self, default: Candidate, candidates: QSequence[Candidate]) -> Candidate:
-        pass
\ No newline at end of file
+        pass
+    
+    async def balance_keyed(self, key: str | bytes | int, default: Candidate, candidates: QSequence[Candidate]) -> Candidate:
+        """
+        Picks a candidate for a request carrying a balance key.
+        Strategies without key affinity ignore the key and fall back to `balance(...)`.
+        """
+        return await self.balance(default, candidates)
+    
+    def observe(self, candidate: Candidate, latency: float) -> None:
+        """
+        Reports the round-trip latency (in seconds) of a request served by the candidate.
+        Strategies that don't balance by latency may ignore it.
+        """
+        return None
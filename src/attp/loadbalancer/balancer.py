@@ -1,12 +1,14 @@
-from typing import Annotated, Literal, Sequence
+from typing import Annotated, Collection, Literal, Sequence
 
 from ascender.core import Inject
 from attp.loadbalancer.abc.cacher import StrategyCacher
 from attp.loadbalancer.abc.strategy import BalancingStrategy
 from attp.loadbalancer.configs import BalancerConfigs
 from attp.loadbalancer.evaluator import StrategyEvaluator
+from attp.loadbalancer.outliers import OutlierDetector
 from attp.shared.namespaces.dispatcher import NamespaceDispatcher
 from attp.shared.sessions.driver import AttpSessionDriver
+from attp.shared.utils.qsequence import QSequence
 from attp.types.exceptions.load_balancer import NoBalancingCandidateFound, UnknownStrategyError
 
 
@@ -24,14 +26,21 @@ class AttpLoadBalancer:
         self._strategies = strategies
         
         self.evaluator = StrategyEvaluator(self.cacher, self.configs, self._strategies)
+        self.outliers = OutlierDetector(configs.outlier_detection) if configs.outlier_detection else None
     
     async def acquire_session(
         self, 
         namespace: str,
         *,
         session_id: str | None = None, 
-        role: Literal["client", "server"] | None = None
+        role: Literal["client", "server"] | None = None,
+        balance_key: str | bytes | int | None = None,
+        exclude: Collection[str] = ()
     ):
+        """
+        Picks a session of the namespace, sessions whose IDs are in `exclude` (e.g. ones a retried request
+        already failed on) are not considered.
+        """
         candidates = self.namespaces.dispatch(namespace, session_id, role)
         
         if not isinstance(candidates, list):
@@ -40,14 +49,34 @@ class AttpLoadBalancer:
             
             return candidates
         
-        default_candidate = candidates.first()
-        if not default_candidate:
-            raise NoBalancingCandidateFound(namespace)
+        if self.outliers:
+            candidates = self.outliers.filter(candidates)
         
-        if not (candidate := await self.evaluator.evaluate(default_candidate, candidates)):
-            raise UnknownStrategyError(self.configs.balancing_strategy)
+        if exclude:
+            candidates = QSequence(candidate for candidate in candidates if candidate.session_id not in exclude)
         
-        return candidate
+        while True:
+            default_candidate = candidates.first()
+            if not default_candidate:
+                raise NoBalancingCandidateFound(namespace)
+            
+            if not (candidate := await self.evaluator.evaluate(default_candidate, candidates, balance_key)):
+                raise UnknownStrategyError(self.configs.balancing_strategy)
+            
+            if not self.outliers or self.outliers.admit(candidate):
+                return candidate
+            
+            # A half-open session whose probe another request took meanwhile, pick among the others.
+            candidates = QSequence(other for other in candidates if other is not candidate)
+    
+    def observe(self, session: AttpSessionDriver, latency: float) -> None:
+        """Feeds the observed round-trip latency of a request to the active balancing strategy."""
+        self.evaluator.observe(session, latency)
+    
+    def report(self, session: AttpSessionDriver, success: bool) -> None:
+        """Feeds the outcome of a request to outlier detection, if it's configured."""
+        if self.outliers:
+            self.outliers.record(session, success)
     
     def rerotate_session(
         self,
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Any, TypeVar
 
 from attp.loadbalancer.abc.cacher import StrategyCacher
@@ -8,18 +7,33 @@ T = TypeVar("T")
 
 
 class SimpleInMemoryCacher(StrategyCacher):
+    """
+    Process-local cacher. Everything runs on one event loop and none of the operations awaits,
+    so they are atomic without a lock and exposed through the synchronous fast path as well.
+    """
+    supports_sync = True
+    
     def __init__(self) -> None:
         self._cache: dict[str, Any] = {}
-        self._lock = asyncio.Lock()
 
     async def store(self, key: str, value: Any) -> Any:
-        async with self._lock:
-            self._cache[key] = value
-        return value
+        return self.store_nowait(key, value)
 
     async def get(self, key: str, *, expected_type: type[T] | None = None) -> T | Any:
-        async with self._lock:
-            value = self._cache.get(key)
+        return self.get_nowait(key, expected_type=expected_type)
+
+    async def increment(self, key: str, *, delta: int = 1, initial: int = 0) -> int:
+        return self.increment_nowait(key, delta=delta, initial=initial)
+
+    async def keys(self) -> list[str]:
+        return list(self._cache.keys())
+    
+    def store_nowait(self, key: str, value: Any) -> Any:
+        self._cache[key] = value
+        return value
+    
+    def get_nowait(self, key: str, *, expected_type: type[T] | None = None) -> T | Any:
+        value = self._cache.get(key)
 
         if expected_type is None or value is None:
             return value
@@ -28,16 +42,11 @@ class SimpleInMemoryCacher(StrategyCacher):
             return value
 
         return None
-
-    async def increment(self, key: str, *, delta: int = 1, initial: int = 0) -> int:
-        async with self._lock:
-            current = self._cache.get(key, initial)
-            if not isinstance(current, int):
-                current = initial
-            new_value = current + delta
-            self._cache[key] = new_value
-            return new_value
-
-    async def keys(self) -> list[str]:
-        async with self._lock:
-            return list(self._cache.keys())
+    
+    def increment_nowait(self, key: str, *, delta: int = 1, initial: int = 0) -> int:
+        current = self._cache.get(key, initial)
+        if not isinstance(current, int):
+            current = initial
+        new_value = current + delta
+        self._cache[key] = new_value
+        return new_value
@@ -0,0 +1,240 @@
+import asyncio
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, TypeVar
+
+import msgpack
+
+from attp.loadbalancer.abc.cacher import StrategyCacher
+
+
+T = TypeVar("T")
+
+_MAGIC = b"ATTPSMC1"
+_HEADER = struct.Struct("<8sIHH")   # magic, slots, key_size, value_size
+_SLOT = struct.Struct("<BxHHxxQ")   # used, key length, value length, key hash
+
+_LOCK_BACKOFF = 0.00005
+_LOCK_MAX_BACKOFF = 0.005
+
+
+class SharedMemoryCacher(StrategyCacher):
+    """
+    Cacher backed by an mmap'd file, shared by every process on the host that opens the same path.
+
+    The file holds a fixed-size open-addressing table of `slots` entries, each with a key of up to
+    `key_size` bytes and a msgpack-encoded value of up to `value_size` bytes.
+    Every operation holds an exclusive `fcntl.lockf` lock on the file, so read-modify-write updates
+    such as `increment` are atomic across processes. Keys are never evicted.
+
+    The async methods take the lock without blocking and back off while another process holds it.
+    The `*_nowait` methods wait for it in the calling thread, so `supports_sync` stays off and strategies
+    don't call them on the event loop.
+
+    Only state strategies keep in the cacher is shared, that is the round-robin counter (also used by
+    "consistent-hash" for requests without a balance key). "least-outstanding" and "peak-ewma" score the
+    sessions of their own process by in-flight requests and RTT, no other worker holds those connections,
+    so their state stays per process.
+
+    Example:
+    ```
+    provideAttp(..., balancing_cacher=SharedMemoryCacher("/dev/shm/attp-balancer"))
+    ```
+    """
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        slots: int = 1024,
+        key_size: int = 64,
+        value_size: int = 64
+    ) -> None:
+        self.path = Path(path)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        
+        with self._locked(whole_file=True):
+            size = os.fstat(self._fd).st_size
+            if size == 0:
+                self._initialize(slots, key_size, value_size)
+            
+            self._map = mmap.mmap(self._fd, 0)
+            magic, self.slots, self.key_size, self.value_size = _HEADER.unpack_from(self._map, 0)
+        
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not an ATTP shared cacher file.")
+        
+        self._slot_size = _SLOT.size + self.key_size + self.value_size
+    
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None  # type: ignore[assignment]
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    async def store(self, key: str, value: Any) -> Any:
+        encoded_key = self._encode_key(key)
+        async with self._acquired():
+            self._store(encoded_key, value)
+        return value
+
+    async def get(self, key: str, *, expected_type: type[T] | None = None) -> T | Any:
+        encoded_key = self._encode_key(key)
+        async with self._acquired():
+            value = self._get(encoded_key)
+        return self._expect(value, expected_type)
+
+    async def increment(self, key: str, *, delta: int = 1, initial: int = 0) -> int:
+        encoded_key = self._encode_key(key)
+        async with self._acquired():
+            return self._increment(encoded_key, delta, initial)
+
+    async def keys(self) -> list[str]:
+        async with self._acquired():
+            return [self._read_key(offset) for offset in self._used_slots()]
+    
+    def store_nowait(self, key: str, value: Any) -> Any:
+        encoded_key = self._encode_key(key)
+        with self._locked():
+            self._store(encoded_key, value)
+        return value
+    
+    def get_nowait(self, key: str, *, expected_type: type[T] | None = None) -> T | Any:
+        encoded_key = self._encode_key(key)
+        with self._locked():
+            value = self._get(encoded_key)
+        return self._expect(value, expected_type)
+    
+    def increment_nowait(self, key: str, *, delta: int = 1, initial: int = 0) -> int:
+        encoded_key = self._encode_key(key)
+        with self._locked():
+            return self._increment(encoded_key, delta, initial)
+    
+    # ================== Operations, called under the lock ================== #
+    def _store(self, key: bytes, value: Any) -> None:
+        self._write_value(self._find(key, create=True), value)  # type: ignore[arg-type]
+    
+    def _get(self, key: bytes) -> Any:
+        offset = self._find(key, create=False)
+        return self._read_value(offset) if offset is not None else None
+    
+    def _increment(self, key: bytes, delta: int, initial: int) -> int:
+        offset: int = self._find(key, create=True)  # type: ignore[assignment]
+        current = self._read_value(offset)
+        if not isinstance(current, int):
+            current = initial
+        new_value = current + delta
+        self._write_value(offset, new_value)
+        return new_value
+    
+    @staticmethod
+    def _expect(value: Any, expected_type: type[T] | None) -> T | Any:
+        if expected_type is None or value is None:
+            return value
+
+        if isinstance(value, expected_type):
+            return value
+
+        return None
+    
+    # ================== Table internals ================== #
+    def _initialize(self, slots: int, key_size: int, value_size: int) -> None:
+        if slots < 1 or not 0 < key_size < 2**16 or not 0 < value_size < 2**16:
+            raise ValueError("Invalid shared cacher table dimensions.")
+        
+        slot_size = _SLOT.size + key_size + value_size
+        os.ftruncate(self._fd, _HEADER.size + slots * slot_size)
+        os.pwrite(self._fd, _HEADER.pack(_MAGIC, slots, key_size, value_size), 0)
+    
+    @contextmanager
+    def _locked(self, whole_file: bool = False) -> Iterator[None]:
+        # Locks the header byte only, every process agrees on it so it guards the whole table.
+        length = 0 if whole_file else 1
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, length)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, length)
+    
+    @asynccontextmanager
+    async def _acquired(self) -> AsyncIterator[None]:
+        # Same header lock as `_locked`, polled so a process holding it doesn't stall the event loop.
+        backoff = _LOCK_BACKOFF
+        while True:
+            try:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1)
+                break
+            except (BlockingIOError, PermissionError):
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, _LOCK_MAX_BACKOFF)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1)
+    
+    def _encode_key(self, key: str) -> bytes:
+        encoded = key.encode()
+        if len(encoded) > self.key_size:
+            raise ValueError(f"Cacher key {key!r} is longer than {self.key_size} bytes.")
+        return encoded
+    
+    def _find(self, key: bytes, *, create: bool) -> int | None:
+        key_hash = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+        start = key_hash % self.slots
+        
+        for probe in range(self.slots):
+            offset = _HEADER.size + ((start + probe) % self.slots) * self._slot_size
+            used, key_length, _, slot_hash = _SLOT.unpack_from(self._map, offset)
+            
+            if not used:
+                if not create:
+                    return None
+                _SLOT.pack_into(self._map, offset, 1, len(key), 0, key_hash)
+                self._map[offset + _SLOT.size:offset + _SLOT.size + len(key)] = key
+                return offset
+            
+            if slot_hash == key_hash and key_length == len(key) and self._read_key_bytes(offset, key_length) == key:
+                return offset
+        
+        if not create:
+            return None
+        raise RuntimeError(f"Shared cacher table {self.path} is full ({self.slots} keys).")
+    
+    def _used_slots(self) -> Iterator[int]:
+        for index in range(self.slots):
+            offset = _HEADER.size + index * self._slot_size
+            if self._map[offset]:
+                yield offset
+    
+    def _read_key_bytes(self, offset: int, length: int) -> bytes:
+        start = offset + _SLOT.size
+        return self._map[start:start + length]
+    
+    def _read_key(self, offset: int) -> str:
+        _, key_length, _, _ = _SLOT.unpack_from(self._map, offset)
+        return self._read_key_bytes(offset, key_length).decode()
+    
+    def _read_value(self, offset: int) -> Any:
+        _, _, value_length, _ = _SLOT.unpack_from(self._map, offset)
+        if not value_length:
+            return None
+        
+        start = offset + _SLOT.size + self.key_size
+        return msgpack.unpackb(self._map[start:start + value_length], raw=False)
+    
+    def _write_value(self, offset: int, value: Any) -> None:
+        encoded = msgpack.packb(value)
+        if len(encoded) > self.value_size:
+            raise ValueError(f"Cacher value is larger than {self.value_size} bytes once encoded.")
+        
+        used, key_length, _, key_hash = _SLOT.unpack_from(self._map, offset)
+        start = offset + _SLOT.size + self.key_size
+        self._map[start:start + len(encoded)] = encoded
+        _SLOT.pack_into(self._map, offset, used, key_length, len(encoded), key_hash)
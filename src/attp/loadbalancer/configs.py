@@ -1,7 +1,19 @@
 from typing import Any
 from ascender.common import BaseDTO
+from pydantic import Field
+
+
+class OutlierDetectionConfigs(BaseDTO):
+    consecutive_failures: int = Field(default=5, ge=1)
+    error_rate: float = Field(default=0.5, gt=0, le=1)
+    window_size: int = Field(default=50, ge=1)
+    min_requests: int = Field(default=20, ge=1)
+    base_ejection_time: float = Field(default=5.0, gt=0)
+    max_ejection_time: float = Field(default=300.0, gt=0)
+    max_ejection_percent: float = Field(default=50.0, ge=0, le=100)
 
 
 class BalancerConfigs(BaseDTO):
     balancing_strategy: str
-    strategy_parameters: Any | None = None
\ No newline at end of file
+    strategy_parameters: Any | None = None
+    outlier_detection: OutlierDetectionConfigs | None = None
@@ -18,13 +18,23 @@ class StrategyEvaluator:
         self.config = config
         self.used_strategy = None
     
-    async def evaluate(self, default: Candidate, candidates: QSequence[Candidate]):
+    async def evaluate(self, default: Candidate, candidates: QSequence[Candidate], key: str | bytes | int | None = None):
         if self.used_strategy and self.used_strategy.name == self.config.balancing_strategy:
-            return await self.used_strategy.balance(default, candidates)
+            return await self._balance(self.used_strategy, default, candidates, key)
         
         for strategy in self.strategies:
             if getattr(strategy, "name", "none") == self.config.balancing_strategy:
                 instance = strategy(self.config.strategy_parameters, cacher=self.cacher)
                 self.used_strategy = instance
                 
-                return await instance.balance(default, candidates)
\ No newline at end of file
+                return await self._balance(instance, default, candidates, key)
+    
+    async def _balance(self, strategy: BalancingStrategy, default: Candidate, candidates: QSequence[Candidate], key: str | bytes | int | None):
+        if key is None:
+            return await strategy.balance(default, candidates)
+        
+        return await strategy.balance_keyed(key, default, candidates)
+    
+    def observe(self, candidate: Candidate, latency: float) -> None:
+        if self.used_strategy:
+            self.used_strategy.observe(candidate, latency)
@@ -0,0 +1,169 @@
+import itertools
+import time
+import weakref
+from collections import deque
+
+from attp.loadbalancer.abc.candidate import Candidate
+from attp.loadbalancer.configs import OutlierDetectionConfigs
+from attp.shared.utils.qsequence import FrozenQSequence, QSequence
+
+
+class SessionHealth:
+    __slots__ = ("outcomes", "failures", "consecutive_failures", "ejections", "ejection_order", "ejected_until", "half_open")
+
+    def __init__(self, window_size: int) -> None:
+        self.outcomes: deque[bool] = deque(maxlen=window_size)
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejection_order = 0
+        self.ejected_until = 0.0
+        self.half_open = False
+
+    def record(self, success: bool) -> None:
+        if len(self.outcomes) == self.outcomes.maxlen and not self.outcomes[0]:
+            self.failures -= 1
+        self.outcomes.append(success)
+
+        if success:
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+    def reset(self) -> None:
+        self.outcomes.clear()
+        self.failures = 0
+        self.consecutive_failures = 0
+
+
+class OutlierDetector:
+    """
+    Passive per-session health tracking, fed with request outcomes by `AttpTransmitter`.
+
+    A session is ejected from candidate sets once it hits `consecutive_failures` in a row or its error rate
+    over the last `window_size` outcomes (with at least `min_requests` of them) reaches `error_rate`.
+    The ejection lasts `base_ejection_time * 2 ** (ejections - 1)` seconds, capped at `max_ejection_time`,
+    afterwards the session is half-open: it is handed out for a single probe request (see `admit`) whose outcome
+    either restores it or ejects it again for longer. A probe without an outcome within `base_ejection_time`
+    is given up and the next one is let through.
+
+    No more than `max_ejection_percent` of a candidate set is ever ejected, when more of its sessions are ejected
+    the ones ejected first stay out and the rest is let back in.
+    """
+    def __init__(self, configs: OutlierDetectionConfigs) -> None:
+        self.configs = configs
+        self._health: weakref.WeakKeyDictionary[Candidate, SessionHealth] = weakref.WeakKeyDictionary()
+        self._ejected: weakref.WeakSet[Candidate] = weakref.WeakSet()
+        # Filtered views by the identity of the snapshot they were derived from, valid for one `version`.
+        self._views: dict[int, tuple[weakref.ref, int, QSequence[Candidate]]] = {}
+        self._ejection_order = itertools.count()
+        self.version = 0
+
+    def is_ejected(self, candidate: Candidate) -> bool:
+        return candidate in self._ejected
+
+    def record(self, candidate: Candidate, success: bool) -> None:
+        health = self._health.get(candidate)
+        if health is None:
+            health = self._health[candidate] = SessionHealth(self.configs.window_size)
+
+        health.record(success)
+
+        if health.half_open:
+            health.half_open = False
+            if success:
+                health.reset()
+                if candidate in self._ejected:
+                    # Held out while its probe was in flight.
+                    self._ejected.discard(candidate)
+                    self.version += 1
+            else:
+                self._eject(candidate, health)
+            return
+
+        if success:
+            if health.ejections and time.monotonic() - health.ejected_until > self.configs.max_ejection_time:
+                # Healthy long enough, the next ejection starts from the base time again.
+                health.ejections = 0
+            return
+
+        if candidate in self._ejected:
+            return
+
+        if health.consecutive_failures >= self.configs.consecutive_failures or (
+            len(health.outcomes) >= self.configs.min_requests
+            and health.failures / len(health.outcomes) >= self.configs.error_rate
+        ):
+            self._eject(candidate, health)
+
+    def filter(self, candidates: QSequence[Candidate]) -> QSequence[Candidate]:
+        """Returns the candidates without the ejected sessions, the same snapshot if nothing is ejected."""
+        if not self._ejected:
+            return candidates
+
+        self._release_expired()
+        if not self._ejected:
+            return candidates
+
+        snapshot_id = id(candidates)
+        cached = self._views.get(snapshot_id)
+        if cached is not None and cached[0]() is candidates and cached[1] == self.version:
+            return cached[2]
+
+        ejected = [candidate for candidate in candidates if candidate in self._ejected]
+        total = candidates.count()
+        allowed = min(int(total * self.configs.max_ejection_percent / 100), total - 1)
+        if len(ejected) > allowed:
+            # Balancing over some sick sessions beats having too few (or no) candidates,
+            # the longest ejected stay out and the ones ejected last are let back in.
+            ejected.sort(key=lambda candidate: self._health[candidate].ejection_order)
+            ejected = ejected[:max(allowed, 0)]
+
+        if ejected:
+            kept_out = set(ejected)
+            view = FrozenQSequence(candidate for candidate in candidates if candidate not in kept_out)
+        else:
+            view = candidates
+
+        self._views[snapshot_id] = (weakref.ref(candidates, lambda _: self._views.pop(snapshot_id, None)), self.version, view)
+        return view
+
+    def admit(self, candidate: Candidate) -> bool:
+        """
+        Called with the candidate picked for a request. A half-open session is admitted for a single probe
+        and held out until its outcome is recorded, returns False if its probe is already in flight.
+        """
+        health = self._health.get(candidate)
+        if health is None or not health.half_open:
+            return True
+
+        if candidate in self._ejected:
+            return False
+
+        health.ejected_until = time.monotonic() + self.configs.base_ejection_time
+        self._ejected.add(candidate)
+        self.version += 1
+        return True
+
+    def _eject(self, candidate: Candidate, health: SessionHealth) -> None:
+        health.ejections += 1
+        health.ejection_order = next(self._ejection_order)
+        duration = min(
+            self.configs.base_ejection_time * 2 ** (health.ejections - 1),
+            self.configs.max_ejection_time
+        )
+        health.ejected_until = time.monotonic() + duration
+        self._ejected.add(candidate)
+        self.version += 1
+
+    def _release_expired(self) -> None:
+        now = time.monotonic()
+        for candidate in list(self._ejected):
+            health = self._health.get(candidate)
+            if health is None or health.ejected_until <= now:
+                self._ejected.discard(candidate)
+                if health is not None:
+                    health.reset()
+                    health.half_open = True
+                self.version += 1
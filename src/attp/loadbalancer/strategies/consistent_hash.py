@@ -0,0 +1,76 @@
+import hashlib
+import weakref
+from bisect import bisect_left
+from typing import Any, Mapping
+from attp.loadbalancer.abc.cacher import StrategyCacher
+from attp.loadbalancer.abc.candidate import Candidate
+from attp.loadbalancer.strategies.round_robin import BasicRoundRobinStrategy
+from attp.shared.utils.qsequence import QSequence
+
+
+def _hash(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "big")
+
+
+def _key_bytes(key: str | bytes | int) -> bytes:
+    if isinstance(key, bytes):
+        return key
+    return str(key).encode()
+
+
+class HashRing:
+    """
+    Hash ring of candidates, each of them placed on `virtual_nodes` points.
+    Adding or removing a candidate only moves the keys owned by its points, about 1/N of all keys.
+    """
+    __slots__ = ("points", "owners")
+    
+    def __init__(self, candidates: QSequence[Candidate], virtual_nodes: int) -> None:
+        ring = sorted(
+            (_hash(f"{candidate.session_id}#{vnode}".encode()), index)
+            for index, candidate in enumerate(candidates)
+            for vnode in range(virtual_nodes)
+        )
+        self.points = [point for point, _ in ring]
+        self.owners = [candidates[index] for _, index in ring]
+    
+    def lookup(self, key: str | bytes | int) -> Candidate:
+        index = bisect_left(self.points, _hash(_key_bytes(key)))
+        return self.owners[index % len(self.owners)]
+
+
+class ConsistentHashStrategy(BasicRoundRobinStrategy):
+    """
+    Sticky strategy routing every request with the same balance key to the same session.
+
+    Candidates are placed on a hash ring with virtual nodes, a ring is built once per candidate snapshot
+    handed out by `NamespaceDispatcher` (they only change with the namespace membership).
+    Requests without a balance key are spread with round-robin.
+
+    Parameters (`strategy_parameters`):
+        virtual_nodes: Points per candidate on the ring. Defaults to 160.
+    """
+    name: str = "consistent-hash"
+    
+    def __init__(self, configs: Any, cacher: StrategyCacher) -> None:
+        super().__init__(configs, cacher)
+        params = configs if isinstance(configs, Mapping) else {}
+        self.virtual_nodes = max(1, int(params.get("virtual_nodes", 160)))
+        self._rings: dict[int, tuple[weakref.ref, HashRing]] = {}
+    
+    async def balance_keyed(self, key: str | bytes | int, default: Candidate, candidates: QSequence[Candidate]) -> Candidate:
+        if not candidates.count():
+            return default
+        
+        return self.ring(candidates).lookup(key)
+    
+    def ring(self, candidates: QSequence[Candidate]) -> HashRing:
+        snapshot_id = id(candidates)
+        cached = self._rings.get(snapshot_id)
+        if cached is not None and cached[0]() is candidates:
+            return cached[1]
+        
+        ring = HashRing(candidates, self.virtual_nodes)
+        # Dropped together with the snapshot it was built from.
+        self._rings[snapshot_id] = (weakref.ref(candidates, lambda _: self._rings.pop(snapshot_id, None)), ring)
+        return ring
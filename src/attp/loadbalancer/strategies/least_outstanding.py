@@ -0,0 +1,37 @@
+import random
+from typing import Any, Mapping
+from attp.loadbalancer.abc.cacher import StrategyCacher
+from attp.loadbalancer.abc.candidate import Candidate
+from attp.loadbalancer.abc.strategy import BalancingStrategy
+from attp.shared.utils.qsequence import QSequence
+
+
+class LeastOutstandingStrategy(BalancingStrategy):
+    """
+    Picks the candidate with the fewest in-flight requests.
+
+    Only `choices` random candidates are compared (power-of-two-choices by default), which keeps the
+    pick O(1) on large candidate sets and breaks ties randomly.
+    Set `choices` to 0 in `strategy_parameters` to compare every candidate instead.
+
+    In-flight counts are those of the process' own sessions and are not kept in the cacher.
+    """
+    name: str = "least-outstanding"
+    
+    def __init__(self, configs: Any, cacher: StrategyCacher) -> None:
+        self.configs = configs
+        self.cacher = cacher
+        self.choices = int(configs.get("choices", 2)) if isinstance(configs, Mapping) else 2
+    
+    async def balance(self, default: Candidate, candidates: QSequence[Candidate]) -> Candidate:
+        total = candidates.count()
+        if total <= 1:
+            return candidates[0] if total else default
+        
+        if self.choices < 1 or total <= self.choices:
+            sample = list(candidates)
+            random.shuffle(sample)
+        else:
+            sample = random.sample(candidates, self.choices)
+        
+        return min(sample, key=lambda candidate: candidate.in_flight)
@@ -0,0 +1,82 @@
+import math
+import random
+import time
+from typing import Any, Mapping
+from weakref import WeakKeyDictionary
+from attp.loadbalancer.abc.cacher import StrategyCacher
+from attp.loadbalancer.abc.candidate import Candidate
+from attp.loadbalancer.abc.strategy import BalancingStrategy
+from attp.shared.utils.qsequence import QSequence
+
+
+class PeakEwmaStrategy(BalancingStrategy):
+    """
+    Latency-aware strategy scoring candidates by `peak EWMA of RTT * (in-flight requests + 1)`.
+
+    A latency spike is adopted immediately while improvements are folded in with exponential decay,
+    the average also decays towards zero while a candidate stays idle so it gets probed again.
+    Two random candidates are compared (power-of-two-choices) and the cheaper one is picked.
+    Averages are kept per session of this process, not in the cacher.
+
+    Parameters (`strategy_parameters`):
+        decay: Decay time constant in seconds. Defaults to 10.
+        default_rtt: RTT in seconds assumed for candidates without observations nor keepalive RTT. Defaults to 0.1.
+        choices: Number of candidates compared per pick, 0 compares all of them. Defaults to 2.
+    """
+    name: str = "peak-ewma"
+    
+    def __init__(self, configs: Any, cacher: StrategyCacher) -> None:
+        self.configs = configs
+        self.cacher = cacher
+        
+        params = configs if isinstance(configs, Mapping) else {}
+        self.decay = float(params.get("decay", 10.0))
+        self.default_rtt = float(params.get("default_rtt", 0.1))
+        self.choices = int(params.get("choices", 2))
+        if self.decay <= 0:
+            raise ValueError("Peak-EWMA `decay` must be positive.")
+        
+        # candidate -> (ewma, timestamp of the last update)
+        self._state: WeakKeyDictionary[Candidate, tuple[float, float]] = WeakKeyDictionary()
+    
+    def observe(self, candidate: Candidate, latency: float) -> None:
+        now = time.monotonic()
+        state = self._state.get(candidate)
+        if state is None:
+            self._state[candidate] = (latency, now)
+            return
+        
+        ewma, updated_at = state
+        if latency > ewma:
+            ewma = latency
+        else:
+            weight = math.exp(-(now - updated_at) / self.decay)
+            ewma = ewma * weight + latency * (1 - weight)
+        
+        self._state[candidate] = (ewma, now)
+    
+    def cost(self, candidate: Candidate) -> float:
+        state = self._state.get(candidate)
+        if state:
+            rtt = self._decayed(state, time.monotonic())
+        else:
+            # Keepalive RTT is the best guess until the first request completes.
+            rtt = candidate.smoothed_rtt or self.default_rtt
+        return rtt * (candidate.in_flight + 1)
+    
+    async def balance(self, default: Candidate, candidates: QSequence[Candidate]) -> Candidate:
+        total = candidates.count()
+        if total <= 1:
+            return candidates[0] if total else default
+        
+        if self.choices < 1 or total <= self.choices:
+            sample = list(candidates)
+            random.shuffle(sample)
+        else:
+            sample = random.sample(candidates, self.choices)
+        
+        return min(sample, key=self.cost)
+    
+    def _decayed(self, state: tuple[float, float], now: float) -> float:
+        ewma, updated_at = state
+        return ewma * math.exp(-(now - updated_at) / self.decay)
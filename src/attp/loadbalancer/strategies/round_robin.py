@@ -13,7 +13,10 @@ class BasicRoundRobinStrategy(BalancingStrategy):
         self.cacher = cacher
     
     async def next_index(self, total: int) -> int:
-        counter = await self.cacher.increment("round_robin_index", delta=1, initial=0)
+        if self.cacher.supports_sync:
+            counter = self.cacher.increment_nowait("round_robin_index", delta=1, initial=0)
+        else:
+            counter = await self.cacher.increment("round_robin_index", delta=1, initial=0)
         return (counter - 1) % total
     
     async def balance(self, default: Candidate, candidates: QSequence[Candidate]) -> Candidate:
@@ -13,17 +13,25 @@ from attp.loadbalancer.abc.cacher import StrategyCacher
 from attp.loadbalancer.abc.strategy import BalancingStrategy
 from attp.loadbalancer.balancer import AttpLoadBalancer
 from attp.loadbalancer.caches.memory_cache import SimpleInMemoryCacher
-from attp.loadbalancer.configs import BalancerConfigs
+from attp.loadbalancer.configs import BalancerConfigs, OutlierDetectionConfigs
+from attp.loadbalancer.strategies.consistent_hash import ConsistentHashStrategy
+from attp.loadbalancer.strategies.least_outstanding import LeastOutstandingStrategy
+from attp.loadbalancer.strategies.peak_ewma import PeakEwmaStrategy
 from attp.loadbalancer.strategies.round_robin import BasicRoundRobinStrategy
 from attp.server.abc.auth_strategy import AuthStrategy
 from attp.server.attp_server import AttpServer
 from attp.server.configs import AttpServerConfigs
+from attp.shared.codecs import CodecRegistry, PayloadCodec
+from attp.shared.compression import CompressionRegistry, Compressor, ZlibCompressor
 from attp.shared.limits import AttpLimits
 from attp.shared.namespaces.dispatcher import NamespaceDispatcher
 from attp.shared.namespaces.router import AttpRouter
+from attp.shared.objects.configs import FrameDispatcherConfigs
 from attp.shared.objects.dispatcher import AttpFrameDispatcher
 from attp.shared.objects.eventbus import EventBus
+from attp.shared.sessions.configs import SessionConfigs
 from attp.shared.transmitter import AttpTransmitter
+from attp.shared.utils.ack_gate import StatefulAckGate
 
 
 DEFAULT_CONFIG_FILES = ("attp.json", "attp.jsonc")
@@ -156,6 +164,52 @@ def _coerce_peer(peer: Any) -> str | AttpClientConfigs:
     raise TypeError(f"Unsupported peer entry: {peer!r}")
 
 
+def _coerce_cacher(value: Any) -> StrategyCacher:
+    if value is None:
+        return SimpleInMemoryCacher()
+    if isinstance(value, StrategyCacher):
+        return value
+    if isinstance(value, str):
+        value = {"type": value}
+    if not isinstance(value, Mapping):
+        raise TypeError(f"Unsupported balancer cacher value: {value!r}")
+
+    data = dict(value)
+    kind = str(data.pop("type", "memory")).lower()
+    if kind == "memory":
+        return SimpleInMemoryCacher()
+    if kind in ("shared-memory", "shm"):
+        from attp.loadbalancer.caches.shared_memory import SharedMemoryCacher
+
+        path = data.pop("path", None)
+        if not path:
+            raise ValueError("Balancer cacher type=shared-memory requires `path`.")
+        return SharedMemoryCacher(path, **data)
+    raise ValueError(f"Unsupported balancer cacher type: {kind}")
+
+
+def _coerce_compression(value: Any, compressors: Sequence[Compressor] | None, max_size: int) -> CompressionRegistry:
+    if value is None or value is False:
+        return CompressionRegistry(compressors or (), max_size=max_size)
+    if value is True:
+        value = {}
+    if not isinstance(value, Mapping):
+        raise TypeError(f"Unsupported compression value: {value!r}")
+
+    data = dict(value)
+    dictionary = data.get("dictionary")
+    if dictionary is not None:
+        dictionary = Path(dictionary).expanduser().read_bytes()
+
+    registry = CompressionRegistry(compressors or (), threshold=int(data.get("threshold", 1024)), max_size=max_size)
+    algorithms = data.get("algorithms", ["zlib"])
+    for algorithm in [algorithms] if isinstance(algorithms, str) else algorithms:
+        if str(algorithm).lower() != "zlib":
+            raise ValueError(f"Unsupported compression algorithm: {algorithm}")
+        registry.register(ZlibCompressor(level=int(data.get("level", 6)), dictionary=dictionary))
+    return registry
+
+
 def _coerce_auth_strategy(auth_strategy: AuthStrategy | type[AuthStrategy]) -> AuthStrategy:
     if isinstance(auth_strategy, AuthStrategy):
         return auth_strategy
@@ -178,6 +232,8 @@ def provideAttp(  # noqa: N802 - keep Ascender-style naming
     ) = None,
     balancing_strategies: Sequence[type[BalancingStrategy]] | None = None,
     balancing_cacher: StrategyCacher | None = None,
+    payload_codecs: Sequence[PayloadCodec] | None = None,
+    payload_compressors: Sequence[Compressor] | None = None,
     config_path: str | Path | None = None,
     config_dir: str | Path | None = None,
     config: Mapping[str, Any] | None = None,
@@ -189,6 +245,9 @@ def provideAttp(  # noqa: N802 - keep Ascender-style naming
     """
     Provide ATTP-related dependencies from `attp.json` / `attp.jsonc`.
     Manual params are required for dynamic pieces like AuthStrategy and ConnectionAuthenticator.
+    `payload_codecs` registers additional codecs, they're picked when listed in `caps` of both peers.
+    `payload_compressors` registers additional compressors, they're advertised in `caps` and preferred over the configured zlib.
+    Compression is off unless the config has a "compression" section (`true`, or `threshold`, `level` and `dictionary` keys).
     """
     if config is None:
         path = _resolve_config_path(config_path=config_path, config_dir=config_dir)
@@ -200,6 +259,8 @@ def provideAttp(  # noqa: N802 - keep Ascender-style naming
     server_cfg = dict(config.get("server", {}) or {})
     client_cfg = dict(config.get("client", {}) or {})
     services_cfg = dict(config.get("services", {}) or {})
+    dispatcher_cfg = dict(config.get("dispatcher", {}) or {})
+    session_cfg = dict(config.get("session", {}) or {})
 
     bind = server_cfg.get("bind") or node_cfg.get("bind") or config.get("bind")
     host, port = _parse_bind(bind, default_host="0.0.0.0", default_port=6563)
@@ -226,9 +287,11 @@ def provideAttp(  # noqa: N802 - keep Ascender-style naming
     )
     strategy_parameters = balancer_cfg.get("strategy_parameters") or balancer_cfg.get("params")
 
+    outlier_cfg = balancer_cfg.get("outlier_detection")
     balancer_configs = BalancerConfigs(
         balancing_strategy=balancing_strategy,
         strategy_parameters=strategy_parameters,
+        outlier_detection=OutlierDetectionConfigs(**(outlier_cfg if isinstance(outlier_cfg, Mapping) else {})) if outlier_cfg else None,
     )
 
     peers_raw = services_cfg.get("peers") or config.get("peers") or []
@@ -281,6 +344,10 @@ def provideAttp(  # noqa: N802 - keep Ascender-style naming
         authenticator=connection_authenticator,
         reconnection=client_cfg.get("reconnection", services_cfg.get("reconnection", True)),
         max_retries=client_cfg.get("max_retries", services_cfg.get("max_retries", 20)),
+        connect_concurrency=client_cfg.get("connect_concurrency", services_cfg.get("connect_concurrency", 16)),
+        reconnect_base_delay=client_cfg.get("reconnect_base_delay", services_cfg.get("reconnect_base_delay", 0.5)),
+        reconnect_max_delay=client_cfg.get("reconnect_max_delay", services_cfg.get("reconnect_max_delay", 30.0)),
+        drain_timeout=client_cfg.get("drain_timeout", services_cfg.get("drain_timeout", 30.0)),
     )
 
     server_configs = AttpServerConfigs(
@@ -290,13 +357,38 @@ def provideAttp(  # noqa: N802 - keep Ascender-style naming
         authentication=auth_strategy_instance,
         verbose=server_cfg.get("verbose", False),
         verbosity_level=server_cfg.get("verbosity_level", "info"),
+        drain_timeout=server_cfg.get("drain_timeout", 30.0),
+        capabilities=list(server_cfg.get("caps") or config.get("caps") or ["schema/msgpack", "streaming"]),
+    )
+
+    dispatcher_configs = FrameDispatcherConfigs(
+        max_concurrency=dispatcher_cfg.get("max_concurrency", dispatcher_cfg.get("concurrency", 64)),
     )
 
-    strategies = list(balancing_strategies or [BasicRoundRobinStrategy])
+    session_configs = SessionConfigs(
+        coalesce_window=session_cfg.get("coalesce_window", 0.0),
+        max_batch_frames=session_cfg.get("max_batch_frames", 128),
+        max_batch_bytes=session_cfg.get("max_batch_bytes", 256 * 1024),
+        keepalive_interval=session_cfg.get("keepalive_interval", 15.0),
+        keepalive_timeout=session_cfg.get("keepalive_timeout", 5.0),
+        keepalive_max_missed=session_cfg.get("keepalive_max_missed", 3),
+    )
+
+    strategies = list(balancing_strategies or [BasicRoundRobinStrategy, LeastOutstandingStrategy, PeakEwmaStrategy, ConsistentHashStrategy])
     if not strategies:
         raise ValueError("balancing_strategies cannot be empty.")
 
-    cacher = balancing_cacher or SimpleInMemoryCacher()
+    cacher = balancing_cacher or _coerce_cacher(balancer_cfg.get("cacher"))
+
+    codecs = CodecRegistry()
+    for codec in payload_codecs or ():
+        codecs.register(codec)
+
+    compressors = _coerce_compression(
+        config.get("compression"),
+        payload_compressors,
+        max(resolved_server_limits.max_payload_size, resolved_client_limits.max_payload_size)
+    )
 
     providers: list[Provider] = [
         {"provide": "ATTP_AUTH_STRATEGY", "value": auth_strategy_instance},
@@ -306,9 +398,14 @@ def provideAttp(  # noqa: N802 - keep Ascender-style naming
         {"provide": AttpServerConfigs, "value": server_configs},
         {"provide": ServiceDiscoveryConfigs, "value": service_discovery_configs},
         {"provide": BalancerConfigs, "value": balancer_configs},
+        {"provide": FrameDispatcherConfigs, "value": dispatcher_configs},
+        {"provide": SessionConfigs, "value": session_configs},
+        {"provide": CodecRegistry, "value": codecs},
+        {"provide": CompressionRegistry, "value": compressors},
         AttpRouter,
         NamespaceDispatcher,
         EventBus,
+        StatefulAckGate,
         AttpFrameDispatcher,
         AttpLoadBalancer,
         AttpServer,
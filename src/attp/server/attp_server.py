@@ -27,6 +27,7 @@ class AttpServer(LifecycleService):
     ) -> None:
         super().__init__()
         self._startup_task: asyncio.Task | None = None
+        self.configs = configs
         if configs.verbose:
             init_logging(filter=configs.verbosity_level)
         
@@ -45,6 +46,7 @@ class AttpServer(LifecycleService):
         self.dispatcher = dispatcher
         
         self.is_active = False
+        self.is_draining = False
     
     def activate(self):
         if not self.is_active:
@@ -69,9 +71,22 @@ class AttpServer(LifecycleService):
             )
     
     async def on_shutdown(self):
-        await self.namespaces.terminate_all()
+        """
+        Drains the server: stops accepting connections, tells the connected peers to stop routing calls here,
+        waits up to `drain_timeout` for in-flight calls and streams to finish, then closes the sessions.
+        """
+        self.is_draining = True
         if self.transport:
-            await self.transport.stop_server()
+            # Existing sessions stay open, only the listener is stopped.
+            self.transport.stop_server()
+        
+        self.logger.info("[cyan]ATTP[/] ┆ Draining server sessions (up to %ss)...", self.configs.drain_timeout)
+        unfinished = await self.namespaces.drain_all(self.configs.drain_timeout, role="server")
+        if unfinished:
+            self.logger.warning("[cyan]ATTP[/] ┆ %s session(s) were closed with requests still in flight", unfinished)
+    
+    def on_session_draining(self, session_driver: ServerSessionDriver):
+        self.namespaces.mark_draining(session_driver)
     
     async def on_session_termination(self, session_driver: ServerSessionDriver):
         try:
@@ -84,7 +99,7 @@ class AttpServer(LifecycleService):
     async def on_connection(self, session: Session):
         self.logger.info("[cyan]ATTP[/] ┆ New connection from peer %s", session.peername)
         
-        driver = ServerSessionDriver(session, self.on_session_termination)
+        driver = ServerSessionDriver(session, self.on_session_termination, self.on_session_draining, self.configs.capabilities)
         try:
             await driver.start()
         except TimeoutError:
@@ -95,6 +110,11 @@ class AttpServer(LifecycleService):
         
         namespace = driver.namespace
         
+        if self.is_draining:
+            # Authenticated after the drain has begun, nothing would ever route to it.
+            await driver.close()
+            return
+        
         async with self.conlock:
             self.namespaces.add_session(namespace, driver)
             receiver = self.multireceiver.receiver(namespace)
@@ -1,4 +1,5 @@
 from ascender.common import BaseDTO
+from pydantic import Field
 
 from attp.server.abc.auth_strategy import AuthStrategy
 from attp.shared.limits import AttpLimits
@@ -12,4 +13,6 @@ class AttpServerConfigs(BaseDTO):
     limits: AttpLimits
     authentication: AuthStrategy | None = None
     verbose: bool = False
-    verbosity_level: str = "info"
\ No newline at end of file
+    verbosity_level: str = "info"
+    drain_timeout: float = Field(default=30.0, ge=0)
+    capabilities: list[str] = Field(default_factory=lambda: ["schema/msgpack", "streaming"])
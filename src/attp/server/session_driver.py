@@ -31,12 +31,17 @@ class ServerSessionDriver(
     async def start(self):
         asyncio.create_task(self.start_listener())
         try:
-            await asyncio.wait_for(self.auth_flag.wait(), timeout=self.auth_strategy.AUTH_TIMEOUT)
+            await asyncio.wait_for(self._handshake(), timeout=self.auth_strategy.AUTH_TIMEOUT)
         except asyncio.TimeoutError:
             raise TimeoutError("Authentication timed out for session {}".format(self.session_id))
         self._role = "server"
         return self.namespace, self.session_id
     
+    async def _handshake(self):
+        await self.auth_flag.wait()
+        # Nothing is sent before the client's READY settles the codec and compression of the session.
+        await self.ready_flag.wait()
+    
     async def _authenticate(self, frame: IAuthDTO):
         try:
             _allowed = await self.auth_strategy.authenticate(frame.namespace, frame.data)
@@ -67,6 +72,7 @@ class ServerSessionDriver(
                 correlation_id=None, 
                 payload=IAcceptedDTO(
                     caps=self._capabilities, 
+                    accepts=self.supported,
                     server_time=datetime.now().isoformat(),
                     routes=routes,
                     data=None, # TODO: Link this with `connect` callback which is executed by eventbus.
@@ -125,11 +131,11 @@ class ServerSessionDriver(
                     await self.handle_disconnect()
                     return
                 elif event.command_type == AttpCommand.ERR:
-                    self._enqueue_incoming(event)
+                    self._route_incoming(event)
                     return
                 else:
                     if self.is_authenticated:
-                        self._enqueue_incoming(event)
+                        self._route_incoming(event)
         except Exception:
             traceback.print_exc()
     
@@ -140,4 +146,7 @@ class ServerSessionDriver(
             self.router.include_remote_routes(self.namespace, frame.routes, "server")
         except ProtocolError as e:
             await self.send_error(0, exception=AttpException(400, message=str(e), detail=traceback.format_exc(), fatal=True))
-            await self.close()
\ No newline at end of file
+            await self.close()
+            return
+        
+        self.ready_flag.set()
@@ -0,0 +1,121 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Sequence
+
+from pydantic import BaseModel
+
+from attp.types.packing import packb, unpackb
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class PayloadCodec(ABC):
+    """
+    Encodes frame payloads of a session.
+
+    `name` doubles as the capability flag advertised in the READY/ACCEPTED exchange, e.g. "schema/msgpack".
+    """
+    name: str
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        ...
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        ...
+
+
+class MsgpackCodec(PayloadCodec):
+    name = "schema/msgpack"
+
+    def encode(self, value: Any) -> bytes:
+        return packb(value)
+
+    def decode(self, data: bytes) -> Any:
+        return unpackb(data)
+
+
+class NativeMsgpackCodec(MsgpackCodec):
+    """
+    Msgpack that keeps bytes as `bin`, datetimes as timestamp ext and UUIDs as ext instead of strings.
+    Peers only get it when both list "schema/msgpack+native" in `caps`, decoding takes either form.
+    """
+    name = "schema/msgpack+native"
+
+    def encode(self, value: Any) -> bytes:
+        return packb(value, native=True)
+
+
+class JsonCodec(PayloadCodec):
+    """JSON payloads, encoded with `orjson` when it's installed and with the standard library otherwise."""
+    name = "schema/json"
+
+    def encode(self, value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            return value.model_dump_json().encode("utf-8") if orjson is None else orjson.dumps(value.model_dump(mode="json"))
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+class RawCodec(PayloadCodec):
+    """Opaque payloads, bytes are passed as they are and strings are UTF-8 encoded."""
+    name = "schema/raw"
+
+    def encode(self, value: Any) -> bytes:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value)
+        if isinstance(value, str):
+            return value.encode("utf-8")
+        raise TypeError(f"Raw codec can only carry bytes or str payloads, got {type(value).__name__}.")
+
+    def decode(self, data: bytes) -> Any:
+        return data
+
+
+class CodecRegistry:
+    """
+    Codecs available for negotiation, keyed by their capability flag.
+    Peers that don't agree on any registered codec fall back to msgpack.
+    """
+    def __init__(self, codecs: Iterable[PayloadCodec] | None = None) -> None:
+        self.default: PayloadCodec = MsgpackCodec()
+        self._codecs: dict[str, PayloadCodec] = {self.default.name: self.default}
+
+        for codec in codecs if codecs is not None else (NativeMsgpackCodec(), JsonCodec(), RawCodec()):
+            self.register(codec)
+
+    def register(self, codec: PayloadCodec) -> None:
+        self._codecs[codec.name] = codec
+
+    def get(self, name: str | None) -> PayloadCodec:
+        """Codec registered under `name`, the default codec for `None`."""
+        if name is None:
+            return self.default
+
+        codec = self._codecs.get(name)
+        if codec is None:
+            raise LookupError(f"Payload codec {name!r} is not registered.")
+        return codec
+
+    def negotiate(self, preferred: Sequence[str], accepted: Sequence[str]) -> PayloadCodec:
+        """First codec of the `preferred` capabilities that is registered and also `accepted` by the other side."""
+        accepted_caps = set(accepted)
+        for cap in preferred:
+            codec = self._codecs.get(cap)
+            if codec is not None and cap in accepted_caps:
+                return codec
+
+        return self.default
+
+
+__all__ = ["PayloadCodec", "MsgpackCodec", "NativeMsgpackCodec", "JsonCodec", "RawCodec", "CodecRegistry"]
@@ -0,0 +1,183 @@
+import time
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Any, Iterable, Sequence
+
+from attp.shared.codecs import PayloadCodec
+from attp.types.exceptions.protocol_error import ProtocolError
+
+
+_PLAIN = b"\x00"
+_COMPRESSED = b"\x01"
+
+DEFAULT_MAX_SIZE = 10 * 1024 * 1024
+
+
+class Compressor(ABC):
+    """
+    Compresses frame payloads of a session.
+
+    `name` doubles as the capability flag advertised in the READY/ACCEPTED exchange, e.g. "compress/zlib".
+    """
+    name: str
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def decompress(self, data: bytes, limit: int) -> bytes:
+        """Inflates `data`, raising `ProtocolError` instead of producing more than `limit` bytes."""
+        ...
+
+
+class ZlibCompressor(Compressor):
+    """
+    Standard library zlib (deflate) compression.
+
+    A preset `dictionary` helps small, repetitive payloads, both peers need the very same one,
+    so its digest becomes part of the capability name and peers with different dictionaries don't negotiate it.
+    """
+    def __init__(self, level: int = 6, dictionary: bytes | None = None) -> None:
+        self.level = level
+        self.dictionary = dictionary
+        self.name = "compress/zlib" if dictionary is None else f"compress/zlib+dict.{blake2b(dictionary, digest_size=4).hexdigest()}"
+
+    def compress(self, data: bytes) -> bytes:
+        if self.dictionary is None:
+            return zlib.compress(data, self.level)
+
+        compressor = zlib.compressobj(self.level, zdict=self.dictionary)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes, limit: int) -> bytes:
+        decompressor = zlib.decompressobj() if self.dictionary is None else zlib.decompressobj(zdict=self.dictionary)
+        try:
+            inflated = decompressor.decompress(data, limit + 1)
+        except zlib.error as e:
+            raise ProtocolError("DecompressionError", str(e))
+
+        if len(inflated) > limit or decompressor.unconsumed_tail:
+            raise ProtocolError("DecompressionError", f"Payload inflates past the limit of {limit} bytes.")
+        if decompressor.unused_data or not decompressor.eof:
+            raise ProtocolError("DecompressionError", "Payload is not a single complete zlib stream.")
+        return inflated
+
+
+@dataclass(slots=True)
+class CompressionStats:
+    packed: int = 0
+    compressed: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    compress_time: float = 0.0
+    unpacked: int = 0
+    decompressed: int = 0
+    decompress_time: float = 0.0
+
+    @property
+    def ratio(self) -> float:
+        """Original to compressed size of the payloads that got compressed."""
+        return self.bytes_in / self.bytes_out if self.bytes_out else 1.0
+
+
+class PayloadCompression:
+    """
+    Per-session compression of encoded payloads.
+
+    Every payload gets a one byte header telling whether the rest is compressed, payloads smaller than
+    `threshold` (or that don't shrink) are sent as they are. Received payloads may inflate to `max_size` bytes at most.
+    """
+    def __init__(self, compressor: Compressor, threshold: int, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.compressor = compressor
+        self.threshold = threshold
+        self.max_size = max_size
+        self.stats = CompressionStats()
+
+    def pack(self, payload: bytes) -> bytes:
+        stats = self.stats
+        stats.packed += 1
+        if len(payload) < self.threshold:
+            return _PLAIN + payload
+
+        started_at = time.perf_counter()
+        compressed = self.compressor.compress(payload)
+        stats.compress_time += time.perf_counter() - started_at
+
+        if len(compressed) >= len(payload):
+            return _PLAIN + payload
+
+        stats.compressed += 1
+        stats.bytes_in += len(payload)
+        stats.bytes_out += len(compressed)
+        return _COMPRESSED + compressed
+
+    def unpack(self, payload: bytes) -> bytes:
+        stats = self.stats
+        stats.unpacked += 1
+        if payload[:1] != _COMPRESSED:
+            return payload[1:]
+
+        started_at = time.perf_counter()
+        data = self.compressor.decompress(payload[1:], self.max_size)
+        stats.decompress_time += time.perf_counter() - started_at
+        stats.decompressed += 1
+        return data
+
+
+class CompressedCodec(PayloadCodec):
+    """Wraps a codec of a session that negotiated compression."""
+    def __init__(self, codec: PayloadCodec, compression: PayloadCompression) -> None:
+        self.codec = codec
+        self.compression = compression
+        self.name = codec.name
+
+    def encode(self, value: Any) -> bytes:
+        return self.compression.pack(self.codec.encode(value))
+
+    def decode(self, data: bytes) -> Any:
+        return self.codec.decode(self.compression.unpack(data))
+
+
+class CompressionRegistry:
+    """
+    Compressors available for negotiation, keyed by their capability flag.
+    Nothing is advertised (and thus compressed) unless at least one compressor is registered.
+    `max_size` caps what a received payload may inflate to, normally the max payload size of the limits.
+    """
+    def __init__(self, compressors: Iterable[Compressor] = (), threshold: int = 1024, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.threshold = threshold
+        self.max_size = max_size
+        self._compressors: dict[str, Compressor] = {}
+
+        for compressor in compressors:
+            self.register(compressor)
+
+    @property
+    def capabilities(self) -> list[str]:
+        return list(self._compressors)
+
+    def register(self, compressor: Compressor) -> None:
+        self._compressors[compressor.name] = compressor
+
+    def negotiate(self, preferred: Sequence[str], accepted: Sequence[str]) -> PayloadCompression | None:
+        """Compression for a new session, first compressor of the `preferred` capabilities `accepted` by the other side."""
+        accepted_caps = set(accepted)
+        for cap in preferred:
+            compressor = self._compressors.get(cap)
+            if compressor is not None and cap in accepted_caps:
+                return PayloadCompression(compressor, self.threshold, self.max_size)
+
+        return None
+
+
+__all__ = [
+    "Compressor",
+    "ZlibCompressor",
+    "CompressionStats",
+    "PayloadCompression",
+    "CompressedCodec",
+    "CompressionRegistry",
+]
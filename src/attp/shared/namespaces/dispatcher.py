@@ -1,22 +1,69 @@
 import asyncio
-from collections import defaultdict
-from typing import Literal, MutableMapping, cast
+from typing import Literal, cast
 
 from attp.shared.sessions.driver import AttpSessionDriver, SessionTerminatorMixin
-from attp.shared.utils.qsequence import QSequence
+from attp.shared.utils.qsequence import FrozenQSequence
+
+
+_EMPTY: FrozenQSequence[AttpSessionDriver] = FrozenQSequence()
 
 
 class NamespaceDispatcher:
-    namespaces: MutableMapping[str, QSequence[AttpSessionDriver]]
-    
+    """
+    Registry of live sessions indexed by namespace, by `(namespace, role)` and by session ID.
+
+    Adding, removing and looking sessions up are O(1). Candidate lists are handed out as immutable
+    `FrozenQSequence` snapshots, rebuilt lazily only after the membership of their namespace changed,
+    so strategies may cache anything derived from a snapshot by its identity.
+
+    Draining sessions stay registered, so pinned lookups by session ID still reach them,
+    but are left out of the snapshots and thus never picked by the balancer.
+    """
     def __init__(self) -> None:
-        self.namespaces = defaultdict(QSequence[AttpSessionDriver])
+        # Insertion-ordered sets (dicts with `None` values) keep the order sessions joined in.
+        self._by_namespace: dict[str, dict[AttpSessionDriver, None]] = {}
+        self._by_role: dict[tuple[str, str], dict[AttpSessionDriver, None]] = {}
+        self._by_session_id: dict[str, AttpSessionDriver] = {}
+        # Keys a session was indexed under, the driver's own session ID and role may be gone on removal.
+        self._entries: dict[AttpSessionDriver, tuple[str, str | None, str | None]] = {}
+        self._snapshots: dict[tuple[str, str | None], FrozenQSequence[AttpSessionDriver]] = {}
+        self._draining: set[AttpSessionDriver] = set()
+    
+    @property
+    def namespaces(self) -> dict[str, FrozenQSequence[AttpSessionDriver]]:
+        return {namespace: self._snapshot(namespace, None) for namespace in self._by_namespace}
     
     def add_session(self, namespace: str, session: AttpSessionDriver):
-        self.namespaces[namespace].append(session)
+        if session in self._entries:
+            self.remove_session(self._entries[session][0], session)
+        
+        role = getattr(session, "_role", None)
+        session_id = session.session_id
+        
+        self._by_namespace.setdefault(namespace, {})[session] = None
+        if role is not None:
+            self._by_role.setdefault((namespace, role), {})[session] = None
+        if session_id is not None:
+            self._by_session_id[session_id] = session
+        
+        self._entries[session] = (namespace, role, session_id)
+        self._invalidate(namespace, role)
 
     def remove_session(self, namespace: str, session: AttpSessionDriver):
-        self.namespaces[namespace].remove(session)
+        entry = self._entries.get(session)
+        if entry is None or entry[0] != namespace:
+            raise ValueError(f"Session {session.session_id} is not registered in namespace {namespace}.")
+        
+        _, role, session_id = self._entries.pop(session)
+        self._draining.discard(session)
+        
+        self._discard(self._by_namespace, namespace, session)
+        if role is not None:
+            self._discard(self._by_role, (namespace, role), session)
+        if session_id is not None and self._by_session_id.get(session_id) is session:
+            del self._by_session_id[session_id]
+        
+        self._invalidate(namespace, role)
     
     def dispatch(
         self,
@@ -24,23 +71,75 @@ class NamespaceDispatcher:
         sid: str | None = None,
         role: Literal["client", "server"] | None = None
     ):
-        print(self.namespaces)
-        sessions = self.namespaces[namespace]
-        if role:
-            sessions = sessions.where(lambda s: s.role == role)
-
         if sid:
-            session = sessions.find_or_none(lambda s: s.session_id == sid)
+            session = self._by_session_id.get(sid)
+            if session is None:
+                return None
+            
+            session_namespace, session_role, _ = self._entries[session]
+            if session_namespace != namespace or (role and session_role != role):
+                return None
     
             return session
         
-        return sessions
+        return self._snapshot(namespace, role)
+    
+    def mark_draining(self, session: AttpSessionDriver):
+        """Stops handing the session out in candidate snapshots, no-op for unregistered sessions."""
+        entry = self._entries.get(session)
+        if entry is None or session in self._draining:
+            return
+        
+        self._draining.add(session)
+        self._invalidate(entry[0], entry[1])
+    
+    async def drain_all(self, timeout: float, *, role: Literal["client", "server"] | None = None) -> int:
+        """
+        Drains every registered session (of the given role) concurrently, see `SessionTerminatorMixin.drain`.
+        Returns how many sessions were closed with work still in flight.
+        """
+        sessions = [
+            cast(SessionTerminatorMixin, session)
+            for session, (_, session_role, _) in list(self._entries.items())
+            if role is None or session_role == role
+        ]
+        results = await asyncio.gather(*(session.drain(timeout) for session in sessions), return_exceptions=True)
+        return sum(1 for result in results if result is not True)
     
     async def terminate_all(self):
         _tasks = []
         
-        for _, sessions in self.namespaces.items():
-            for session in sessions:
-                _tasks.append(cast(SessionTerminatorMixin, session).close())
+        for session in list(self._entries):
+            _tasks.append(cast(SessionTerminatorMixin, session).close())
             
         await asyncio.gather(*_tasks)
+    
+    def _snapshot(self, namespace: str, role: str | None) -> FrozenQSequence[AttpSessionDriver]:
+        snapshot = self._snapshots.get((namespace, role))
+        if snapshot is not None:
+            return snapshot
+        
+        members = self._by_namespace.get(namespace) if role is None else self._by_role.get((namespace, role))
+        if not members:
+            return _EMPTY
+        
+        if self._draining:
+            members = [member for member in members if member not in self._draining]
+        
+        snapshot = self._snapshots[(namespace, role)] = FrozenQSequence(members)
+        return snapshot
+    
+    def _invalidate(self, namespace: str, role: str | None):
+        self._snapshots.pop((namespace, None), None)
+        if role is not None:
+            self._snapshots.pop((namespace, role), None)
+    
+    @staticmethod
+    def _discard(index: dict, key, session: AttpSessionDriver):
+        members = index.get(key)
+        if members is None:
+            return
+        
+        members.pop(session, None)
+        if not members:
+            del index[key]
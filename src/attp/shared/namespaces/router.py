@@ -2,6 +2,7 @@ from collections import defaultdict
 from hashlib import blake2b
 from threading import Lock
 from typing import Any, Callable, Iterable, Literal, Sequence
+from attp.shared.utils.executor import CallPlan, compile_call_plan
 from attp.shared.utils.qsequence import QSequence
 from attp.types.exceptions.protocol_error import ProtocolError
 from attp.types.frames.route_mapping import IRouteMapping
@@ -12,14 +13,18 @@ class AttpRouter:
     routes: QSequence[AttpRouteMapping]
     remote_routes_client: dict[str, QSequence[IRouteMapping]]
     remote_routes_server: dict[str, QSequence[IRouteMapping]]
-    errors: dict[str, QSequence[tuple[str, Callable[..., Any]]]]
+    errors: dict[str, QSequence[tuple[str, CallPlan]]]
     
     def __init__(self) -> None:
         self.routes = QSequence()
         self.remote_routes_client = defaultdict(QSequence[IRouteMapping])
         self.remote_routes_server = defaultdict(QSequence[IRouteMapping])
-        self.errors = defaultdict(QSequence[tuple[str, Callable[..., Any]]])
+        self.errors = defaultdict(QSequence[tuple[str, CallPlan]])
         self._remote_routes_lock = Lock()
+        # Hash indexes used by the hot paths (`relevant_route` / `dispatch`), later registrations
+        # overwrite earlier ones which keeps the "last match wins" semantics of the linear scans.
+        self._local_index: dict[tuple[str, int], AttpRouteMapping] = {}
+        self._remote_index: dict[tuple[str, str, str, RouteType], IRouteMapping] = {}
         self.increment_index = 2 # 0 and 1 are reserved for:
         # 1. Zero's are reserved for connect/disconnect events.
         # 2. One's are reserved for authentication and authentication errors
@@ -30,23 +35,33 @@ class AttpRouter:
         pattern: str, 
         callback: Callable[..., Any],
         *,
-        namespace: str | None = None
+        namespace: str | None = None,
+        codec: str | None = None
     ):
+        """
+        Registers a local route, `codec` pins the payload codec (capability name, e.g. "schema/json")
+        of the route's requests and responses instead of the codec negotiated per session.
+        """
         if pattern in ("connect", "disconnect") and route_type in ("connect", "disconnect"):
-            self.routes.append(AttpRouteMapping(pattern, 0, route_type, callback, namespace or "default"))
+            self._register_local(AttpRouteMapping(pattern, 0, route_type, callback, namespace or "default", compile_call_plan(callback)))
             return
         
-        self.routes.append(AttpRouteMapping(pattern, self.increment_index, route_type, callback, namespace or "default"))
+        self._register_local(AttpRouteMapping(pattern, self.increment_index, route_type, callback, namespace or "default", compile_call_plan(callback), codec))
         self.increment_index += 1
     
+    def _register_local(self, mapping: AttpRouteMapping):
+        self.routes.append(mapping)
+        self._local_index[(mapping.namespace, mapping.route_id)] = mapping
+    
     def add_event(
         self,
         pattern: str,
         callback: Callable[..., Any],
         *,
-        namespace: str | None = None
+        namespace: str | None = None,
+        codec: str | None = None
     ):
-        self.add_route("event", pattern, callback, namespace=namespace)
+        self.add_route("event", pattern, callback, namespace=namespace, codec=codec)
     
     def add_error_handler(
         self,
@@ -55,7 +70,7 @@ class AttpRouter:
         *,
         namespace: str | None = None
     ):
-        self.errors[pattern].append((namespace or "default", callback))
+        self.errors[pattern].append((namespace or "default", compile_call_plan(callback)))
     
     def include_remote_routes(
         self,
@@ -91,6 +106,10 @@ class AttpRouter:
                 return
 
             target[namespace] = QSequence(routes)
+            for route in routes:
+                if route.namespace != namespace:
+                    continue
+                self._remote_index[(namespace, role, route.pattern, route.route_type)] = route
     
     def dispatch(
         self,
@@ -100,13 +119,10 @@ class AttpRouter:
         namespace: str = "default",
         role: Literal["client", "server"] = "server"
     ):
-        target = self.remote_routes_client if role == "client" else self.remote_routes_server
-        print(target[namespace], role)
-        return target[namespace].filter(lambda r: r.pattern == pattern and r.route_type == route_type and r.namespace == namespace).last()
+        return self._remote_index.get((namespace, role, pattern, route_type))
     
     def relevant_route(self, route_id: int, namespace: str = "default"):
-        # print("RELEVANT ROUTE SEEK", self.routes, route_id, namespace)
-        return self.routes.filter(lambda r: r.route_id == route_id and r.namespace == namespace).last()
+        return self._local_index.get((namespace, route_id))
     
     def get_error_handler(self, pattern: str, namespace: str = "default"):
         return self.errors[pattern].where(lambda n: n[0] == namespace).map(lambda n: n[1]).last()
@@ -0,0 +1,6 @@
+from ascender.common import BaseDTO
+from pydantic import Field
+
+
+class FrameDispatcherConfigs(BaseDTO):
+    max_concurrency: int = Field(default=64, ge=1)
@@ -1,4 +1,6 @@
 import asyncio
+from collections import deque
+from attp.shared.objects.configs import FrameDispatcherConfigs
 from attp.shared.objects.eventbus import EventBus
 from attp.shared.receiver import AttpReceiver
 from attp.shared.sessions.additional_mixins import EnhancedFrameTransmitterMixin
@@ -21,9 +23,15 @@ ReceiverPayload: TypeAlias = tuple[AttpSessionDriver | EnhancedFrameTransmitterM
 
 
 class AttpFrameDispatcher:
-    def __init__(self, eventbus: EventBus, transmitter: AttpTransmitter) -> None:
+    def __init__(
+        self,
+        eventbus: EventBus,
+        transmitter: AttpTransmitter,
+        configs: FrameDispatcherConfigs
+    ) -> None:
         self.eventbus = eventbus
         self.transmitter = transmitter
+        self.configs = configs
 
         self._tasks: dict[AttpReceiver[ReceiverPayload], asyncio.Task] = {}
 
@@ -60,47 +68,111 @@ class AttpFrameDispatcher:
 
 
     async def _run(self, receiver: AttpReceiver[ReceiverPayload]) -> None:
+        """
+        Consumes the receiver with up to `configs.max_concurrency` frames in flight.
+        Frames sharing a correlation ID are queued into the same lane and handled in order.
+        """
+        slots = asyncio.Semaphore(self.configs.max_concurrency)
+        lanes: dict[bytes, deque[ReceiverPayload]] = {}
+        workers: dict[asyncio.Task, deque[ReceiverPayload]] = {}
+        waiting: ReceiverPayload | None = None
+
         try:
             while True:
-                session, msg = await receiver.get()
-                
-                try:
-                    if msg.command_type == AttpCommand.ERR:
-                        await self.transmitter.handle_response(msg)
-                        await self.eventbus.emit(cast(EnhancedFrameTransmitterMixin, session), msg)
-                        
-                    elif msg.command_type in (
-                        AttpCommand.ACK,
-                        AttpCommand.DEFER,
-                        AttpCommand.STREAMBOS,
-                        AttpCommand.CHUNK,
-                        AttpCommand.STREAMEOS,
-                    ):
-                        # await self.router.handle_response(msg)
-                        await self.transmitter.handle_response(msg)
-
-                    else:
-                        await self.eventbus.emit(cast(EnhancedFrameTransmitterMixin, session), msg)
-
-                except Exception:
-                    traceback.print_exc()
-
-                    if (
-                        msg.command_type == AttpCommand.CALL
-                        and msg.correlation_id
-                    ):
-                        await cast(EnhancedFrameTransmitterMixin, session).send_error(
-                            msg.route_id,
-                            error_frame=IAttpErr(
-                                code=500,
-                                message="Dispatcher failed to process frame."
-                            ),
-                            correlation_id=msg.correlation_id,
-                        )
+                item = await receiver.get()
+                key = item[1].correlation_id
 
-                finally:
-                    receiver.task_done()
+                if key is not None and key in lanes:
+                    lanes[key].append(item)
+                    continue
+
+                waiting = item
+                await slots.acquire()
+                waiting = None
+
+                queue = deque([item])
+                if key is not None:
+                    lanes[key] = queue
+
+                worker = asyncio.create_task(self._drain_lane(receiver, queue, key, lanes, slots))
+                workers[worker] = queue
+                worker.add_done_callback(lambda task: workers.pop(task, None))
 
         except asyncio.CancelledError:
-            # Graceful shutdown
-            pass
+            # Graceful shutdown, workers cancelled before their first step never run their `finally`,
+            # so whatever is left in their queues is settled here.
+            queues = list(workers.values())
+            for worker in list(workers):
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+            if waiting is not None:
+                self._settle(receiver, waiting)
+            for queue in queues:
+                while queue:
+                    self._settle(receiver, queue.popleft())
+            lanes.clear()
+
+    async def _drain_lane(
+        self,
+        receiver: AttpReceiver[ReceiverPayload],
+        queue: deque[ReceiverPayload],
+        key: bytes | None,
+        lanes: dict[bytes, deque[ReceiverPayload]],
+        slots: asyncio.Semaphore,
+    ) -> None:
+        try:
+            while queue:
+                item = queue.popleft()
+                try:
+                    await self._handle(*item)
+                finally:
+                    self._settle(receiver, item)
+
+            if key is not None:
+                lanes.pop(key, None)
+        finally:
+            slots.release()
+
+    def _settle(self, receiver: AttpReceiver[ReceiverPayload], item: ReceiverPayload) -> None:
+        item[0].inbound -= 1
+        receiver.task_done()
+
+    async def _handle(
+        self,
+        session: AttpSessionDriver | EnhancedFrameTransmitterMixin,
+        msg: PyAttpMessage
+    ) -> None:
+        try:
+            if msg.command_type == AttpCommand.ERR:
+                # Pending requests were already failed by the session's response fast-path.
+                await self.eventbus.emit(cast(EnhancedFrameTransmitterMixin, session), msg)
+                
+            elif msg.command_type in (
+                AttpCommand.ACK,
+                AttpCommand.DEFER,
+                AttpCommand.STREAMBOS,
+                AttpCommand.CHUNK,
+                AttpCommand.STREAMEOS,
+            ):
+                # Normally delivered by the session's response fast-path, these are late or unmatched frames.
+                await self.transmitter.handle_response(msg)
+
+            else:
+                await self.eventbus.emit(cast(EnhancedFrameTransmitterMixin, session), msg)
+
+        except Exception:
+            traceback.print_exc()
+
+            if (
+                msg.command_type == AttpCommand.CALL
+                and msg.correlation_id
+            ):
+                await cast(EnhancedFrameTransmitterMixin, session).send_error(
+                    msg.route_id,
+                    error_frame=IAttpErr(
+                        code=500,
+                        message="Dispatcher failed to process frame."
+                    ),
+                    correlation_id=msg.correlation_id,
+                )
@@ -59,7 +59,7 @@ class EventBus:
                         # Since this is an event which has no ACK feature (this is send and forget method) we silently return nothing.
                         return
                     
-                    await execute_event(frame, relevant_route)
+                    await execute_event(frame, relevant_route, session=session)
                 
                 case AttpCommand.ERR:
                     if relevant_route.route_type in ["err", "connect", "disconnect"]:
@@ -1,7 +1,6 @@
 from typing import Any
 from uuid import uuid4
 
-import msgpack
 from attp.shared.sessions.driver import FrameTransmitterMixin
 from attp.types.exceptions.attp_exception import AttpException
 from attp.types.frame import AttpFrameDTO
@@ -19,7 +18,8 @@ class EnhancedFrameTransmitterMixin(FrameTransmitterMixin):
         route_id: int,
         data: AttpFrameDTO | Any | None,
         *,
-        correlation_id: bytes | None = None
+        correlation_id: bytes | None = None,
+        codec: str | None = None
     ) -> bytes:
         """
         Sends CALL command to the receiving side.
@@ -28,6 +28,7 @@ class EnhancedFrameTransmitterMixin(FrameTransmitterMixin):
             route_id (int): The mandatory ID of the route.
             data (AttpFrameDTO): Data frame of ATTP message.
             correlation_id (bytes | None, optional): The mandatory correlation ID of the CALL message. Defaults to None. If None was passed, correlation ID will be auto-generated
+            codec (str | None, optional): Payload codec pinned by the route. Defaults to None, the codec negotiated for the session.
 
         Raises:
             ValueError: If reserved route_id was used.
@@ -41,15 +42,7 @@ class EnhancedFrameTransmitterMixin(FrameTransmitterMixin):
         if not correlation_id:
             correlation_id = uuid4().bytes
         
-        await self.send_frame(
-            PyAttpMessage(
-                route_id=route_id,
-                command_type=AttpCommand.CALL,
-                correlation_id=correlation_id,
-                payload=data.mpd() if isinstance(data, AttpFrameDTO) else (msgpack.packb(data) if data is not None else None),
-                version=self.version_bytes()
-            )
-        )
+        await self.send_frame(self.build_call_frame(route_id, data, correlation_id, codec=codec))
         
         return correlation_id
     
@@ -57,6 +50,8 @@ class EnhancedFrameTransmitterMixin(FrameTransmitterMixin):
         self,
         route_id: int,
         data: AttpFrameDTO | Any | None,
+        *,
+        codec: str | None = None
     ):
         """
         Send EMIT frame to the receiver side.
@@ -67,20 +62,59 @@ class EnhancedFrameTransmitterMixin(FrameTransmitterMixin):
         Args:
             route_id (int): ID of the route, NOTE: 1 or 0 are reserved and can't be used.
             data (AttpFrameDTO): Data frame of an ATTP message.
+            codec (str | None, optional): Payload codec pinned by the route. Defaults to None, the codec negotiated for the session.
         """
         if route_id < 1:
             raise ValueError("Cannot use reserved `route_id`s 0 and 1, they are not meant for Attp `CALL` requests.")
 
-        await self.send_frame(
-            PyAttpMessage(
-                route_id=route_id,
-                command_type=AttpCommand.EMIT,
-                correlation_id=None,
-                payload=data.mpd() if isinstance(data, AttpFrameDTO) else (msgpack.packb(data) if data is not None else None),
-                version=self.version_bytes()
-            )
+        await self.send_frame(self.build_event_frame(route_id, data, codec=codec))
+    
+    def build_call_frame(self, route_id: int, data: AttpFrameDTO | Any | None, correlation_id: bytes, *, codec: str | None = None) -> PyAttpMessage:
+        """Serializes a CALL frame without sending it, used for batched writes."""
+        if route_id < 1:
+            raise ValueError("Cannot use reserved `route_id`s 0 and 1, they are not meant for Attp `CALL` requests.")
+        
+        return PyAttpMessage(
+            route_id=route_id,
+            command_type=AttpCommand.CALL,
+            correlation_id=correlation_id,
+            payload=self.encode_payload(data, codec),
+            version=self.version_bytes()
+        )
+    
+    def build_event_frame(self, route_id: int, data: AttpFrameDTO | Any | None, *, codec: str | None = None) -> PyAttpMessage:
+        """Serializes an EMIT frame without sending it, used for batched writes."""
+        if route_id < 1:
+            raise ValueError("Cannot use reserved `route_id`s 0 and 1, they are not meant for Attp `CALL` requests.")
+        
+        return PyAttpMessage(
+            route_id=route_id,
+            command_type=AttpCommand.EMIT,
+            correlation_id=None,
+            payload=self.encode_payload(data, codec),
+            version=self.version_bytes()
         )
 
+    def build_ack_frame(self, route_id: int, data: AttpFrameDTO | Any | None, correlation_id: bytes, *, codec: str | None = None) -> PyAttpMessage:
+        """Serializes an ACK frame carrying the handler's response, bytes are treated as an already encoded payload."""
+        if isinstance(data, (bytes, bytearray)):
+            payload = bytes(data)
+            if self.compression is not None:
+                payload = self.compression.pack(payload)
+        else:
+            payload = self.encode_payload(data, codec)
+        
+        return PyAttpMessage(
+            route_id=route_id,
+            command_type=AttpCommand.ACK,
+            correlation_id=correlation_id,
+            payload=payload,
+            version=self.version_bytes()
+        )
+    
+    async def send_ack(self, route_id: int, data: AttpFrameDTO | Any | None, *, correlation_id: bytes, codec: str | None = None):
+        """Sends ACK frame responding to the CALL with `correlation_id`."""
+        await self.send_frame(self.build_ack_frame(route_id, data, correlation_id, codec=codec))
     
     async def send_error(
         self,
@@ -106,7 +140,7 @@ class EnhancedFrameTransmitterMixin(FrameTransmitterMixin):
 
 class StreamingFrameTransmitterMixin(FrameTransmitterMixin):
     
-    async def start_stream(self, route_id: int, correlation_id: bytes | None = None):
+    async def start_stream(self, route_id: int, correlation_id: bytes | None = None, *, codec: str | None = None):
         if route_id < 1:
             raise ValueError("Cannot use reserved `route_id`s 0 and 1, they are not meant for Attp `CALL` requests.")
 
@@ -119,14 +153,14 @@ class StreamingFrameTransmitterMixin(FrameTransmitterMixin):
             payload=None, version=self.version_bytes()
         ))
         
-        return StreamingSignature(route_id=route_id, correlation_id=correlation_id)
+        return StreamingSignature(route_id=route_id, correlation_id=correlation_id, codec=codec)
     
     async def send_chunk(self, info: StreamingSignature, data: AttpFrameDTO | Any):
         await self.send_frame(PyAttpMessage(
             route_id=info.route_id,
             command_type=AttpCommand.CHUNK,
             correlation_id=info.correlation_id,
-            payload=data.mpd() if isinstance(data, AttpFrameDTO) else msgpack.packb(data),
+            payload=self.encode_payload(data, info.codec),
             version=self.version_bytes()
         ))
     
@@ -0,0 +1,11 @@
+from ascender.common import BaseDTO
+from pydantic import Field
+
+
+class SessionConfigs(BaseDTO):
+    coalesce_window: float = Field(default=0.0, ge=0)
+    max_batch_frames: int = Field(default=128, ge=1)
+    max_batch_bytes: int = Field(default=256 * 1024, ge=1)
+    keepalive_interval: float = Field(default=15.0, ge=0)
+    keepalive_timeout: float = Field(default=5.0, gt=0)
+    keepalive_max_missed: int = Field(default=3, ge=1)
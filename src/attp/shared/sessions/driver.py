@@ -3,17 +3,36 @@ import asyncio
 from logging import Logger
 import traceback
 from typing import Any, Callable, Literal, Self
+from uuid import uuid4
 
 from ascender.core import inject
 
+from attp.shared.codecs import CodecRegistry, PayloadCodec
+from attp.shared.compression import CompressedCodec, CompressionRegistry, CompressionStats, PayloadCompression
 from attp.shared.receiver import AttpReceiver
+from attp.shared.sessions.configs import SessionConfigs
+from attp.shared.sessions.writer import OutboundWriter
+from attp.shared.utils.ack_gate import StatefulAckGate
 
 from attp_core.rs_api import Session, PyAttpMessage, AttpCommand
 
 from attp.shared.utils.qsequence import QSequence
+from attp.types.exceptions.attp_exception import SessionClosedError
+from attp.types.frames.accepted import IAcceptedDTO
+from attp.types.frames.drain import IDrainDTO
 from attp.types.frames.ready import IReadyDTO
 
 
+RESPONSE_COMMANDS = (
+    AttpCommand.ACK,
+    AttpCommand.DEFER,
+    AttpCommand.STREAMBOS,
+    AttpCommand.CHUNK,
+    AttpCommand.STREAMEOS,
+)
+DRAIN_CAP = "drain"
+
+
 class AttpSessionDriver:
     _session: Session | None
     
@@ -26,19 +45,42 @@ class AttpSessionDriver:
     def __init__(
         self,
         session: Session,
-        on_termination: Callable[[Self], Any] | None = None
+        on_termination: Callable[[Self], Any] | None = None,
+        on_draining: Callable[[Self], Any] | None = None,
+        capabilities: list[str] | None = None
     ) -> None:
         self._session = session
-        self._capabilities = ["schema/msgpack", "streaming"]
+        self._capabilities = list(capabilities) if capabilities is not None else ["schema/msgpack", "streaming"]
         self._version = None
         
         self._namespace = "default"
         
         self.incoming_listener = asyncio.Queue()
         self.on_termination = on_termination
+        self.on_draining = on_draining
         self.logger = inject("ASC_LOGGER")
+        self.ack_gate: StatefulAckGate = inject(StatefulAckGate)
+        self.session_configs: SessionConfigs = inject(SessionConfigs)
+        self.codecs: CodecRegistry = inject(CodecRegistry)
+        self.codec: PayloadCodec = self.codecs.default
+        self.compressors: CompressionRegistry = inject(CompressionRegistry)
+        self.compression: PayloadCompression | None = None
+        self._compressed_codecs: dict[str, PayloadCodec] = {}
+        self._capabilities = self._advertised(self._capabilities)
+        self.supported = list(self._capabilities)
+        self.peer_supported: frozenset[str] = frozenset()
+        self.writer = OutboundWriter(session, self.session_configs)
+        
+        self.last_rtt: float | None = None
+        self.smoothed_rtt: float | None = None
+        self.missed_pongs = 0
+        self._pings: dict[bytes, asyncio.Future[float]] = {}
+        
+        self.draining = False
+        self.inbound = 0
         
         self.auth_flag = asyncio.Event()
+        self.ready_flag = asyncio.Event()
     
     @property
     def is_authenticated(self):
@@ -48,10 +90,25 @@ class AttpSessionDriver:
     def session_id(self):
         return self._session.session_id if self._session else None
     
+    @property
+    def in_flight(self) -> int:
+        """Requests sent over this session that are still awaiting their response."""
+        return self.ack_gate.outstanding(self.session_id)
+    
+    @property
+    def is_idle(self) -> bool:
+        """No requests awaiting responses and no incoming frames left to be handled."""
+        return not self.in_flight and not self.inbound and self.incoming_listener.empty()
+    
     @property
     def capabilities(self):
         return self._capabilities
     
+    @property
+    def compression_stats(self) -> CompressionStats | None:
+        """Compression ratio and time spent (de)compressing, `None` unless the session negotiated compression."""
+        return self.compression.stats if self.compression else None
+    
     @property
     def namespace(self):
         return self._namespace
@@ -64,6 +121,35 @@ class AttpSessionDriver:
     def role(self):
         return self._role
 
+    def _advertised(self, capabilities: list[str]) -> list[str]:
+        """
+        `capabilities` plus the protocol features of this driver (session draining) and the registered compressors,
+        which are advertised whenever compression is configured.
+        """
+        implied = [DRAIN_CAP, *self.compressors.capabilities]
+        return list(capabilities) + [cap for cap in implied if cap not in capabilities]
+
+    def resolve_codec(self, name: str | None = None) -> PayloadCodec:
+        """Codec pinned by a route (`name`), or the one negotiated for the session."""
+        codec = self.codec if name is None else self.codecs.get(name)
+        if self.compression is None:
+            return codec
+        
+        compressed = self._compressed_codecs.get(codec.name)
+        if compressed is None:
+            compressed = self._compressed_codecs[codec.name] = CompressedCodec(codec, self.compression)
+        return compressed
+    
+    def encode_payload(self, data: Any, codec: str | None = None) -> bytes | None:
+        if data is None:
+            return None
+        return self.resolve_codec(codec).encode(data)
+    
+    def decode_payload(self, payload: bytes | None, codec: str | None = None) -> Any:
+        if not payload:
+            return None
+        return self.resolve_codec(codec).decode(payload)
+
     def version_bytes(self) -> bytes:
         version = str(self.version)
         parts = version.split(".")
@@ -87,6 +173,8 @@ class AttpSessionDriver:
                 break
             
             self.logger.debug("[cyan]ATTP[/] ┆ Emitting the incoming frame in the listener to responder...")
+            # Released by the frame dispatcher once the frame is handled.
+            self.inbound += 1
             receiver.on_next((self, frame))
 
     @abstractmethod
@@ -103,7 +191,20 @@ class AttpSessionDriver:
         if frame.proto != "ATTP":
             return
         
-        self._capabilities = frame.caps
+        # Both sides agree on the server's order of preference, ACCEPTED is what the server sends.
+        if isinstance(frame, IAcceptedDTO):
+            preferred, accepted = frame.caps, self._capabilities
+        else:
+            preferred, accepted = self._capabilities, frame.caps
+        
+        self._capabilities = [cap for cap in preferred if cap in accepted]
+        # Older peers copy the server's `caps` into their READY, only `accepts` tells what they really support.
+        self.peer_supported = frozenset(frame.accepts or ())
+        # Payload encodings past the defaults need the peer's own word, older peers keep msgpack uncompressed.
+        negotiable = [cap for cap in preferred if cap in self.peer_supported]
+        self.codec = self.codecs.negotiate(negotiable, accepted)
+        self.compression = self.compressors.negotiate(negotiable, accepted)
+        self._compressed_codecs.clear()
         self._version = frame.ver
     
     def _enqueue_incoming(self, event: PyAttpMessage | None) -> None:
@@ -113,24 +214,100 @@ class AttpSessionDriver:
         else:
             self.incoming_listener.put_nowait(event)
     
+    def _route_incoming(self, event: PyAttpMessage) -> None:
+        """
+        Response frames (ACK, DEFER, stream frames) skip the namespace queues and go straight to the
+        pending request table, ERR frames are delivered there as well as to the dispatcher for error handlers.
+        """
+        command = event.command_type
+        if command in RESPONSE_COMMANDS:
+            self._deliver_response(event, fallback=True)
+            return
+        
+        if command == AttpCommand.PONG:
+            self._deliver_pong(event)
+            return
+        
+        if command == AttpCommand.PING:
+            # Already answered by the transport.
+            return
+        
+        if command == AttpCommand.EMIT and event.route_id == 0 and DRAIN_CAP in self.peer_supported:
+            # Only peers that advertised draining send the notice, route 0 events of others are theirs to handle.
+            self._deliver_drain(event)
+            return
+        
+        if command == AttpCommand.ERR and event.correlation_id:
+            self._deliver_response(event, fallback=False)
+        
+        self._enqueue_incoming(event)
+    
+    def _deliver_response(self, event: PyAttpMessage, *, fallback: bool) -> None:
+        loop = self._loop
+        if loop and loop.is_running():
+            loop.call_soon_threadsafe(self._resolve_response, event, fallback)
+        else:
+            self._resolve_response(event, fallback)
+    
+    def _deliver_pong(self, event: PyAttpMessage) -> None:
+        loop = self._loop
+        if loop and loop.is_running():
+            loop.call_soon_threadsafe(self._resolve_pong, event.correlation_id)
+        else:
+            self._resolve_pong(event.correlation_id)
+    
+    def _resolve_pong(self, correlation_id: bytes | None) -> None:
+        waiter = self._pings.pop(correlation_id, None) if correlation_id else None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(waiter.get_loop().time())
+    
+    def _deliver_drain(self, event: PyAttpMessage) -> None:
+        loop = self._loop
+        if loop and loop.is_running():
+            loop.call_soon_threadsafe(self._mark_draining, "peer")
+        else:
+            self._mark_draining("peer")
+    
+    def _mark_draining(self, initiator: Literal["peer", "local"]) -> None:
+        if self.draining:
+            return
+        
+        self.draining = True
+        self.logger.info("[cyan]ATTP[/] ┆ Session %s is draining (initiated by %s)", self.session_id, initiator)
+        if self.on_draining:
+            try:
+                self.on_draining(self)
+            except Exception:
+                traceback.print_exc()
+    
+    def _resolve_response(self, event: PyAttpMessage, fallback: bool) -> None:
+        if not self.ack_gate.resolve(event) and fallback:
+            # Nobody awaits this response here, let the regular listener pipeline see it.
+            self.incoming_listener.put_nowait(event)
+    
     async def _terminate(self):
         if self.on_termination:
             try:
                 await self.on_termination(self)
             except Exception:
                 traceback.print_exc()
+    
+    def _fail_pending(self, session_id: str | None) -> None:
+        failed = self.ack_gate.fail_session(session_id, SessionClosedError(session_id))
+        if failed:
+            self.logger.info("[cyan]ATTP[/] ┆ Failed %s pending request(s) of closed session %s", failed, session_id)
 
 
 class FrameTransmitterMixin(AttpSessionDriver):
     async def send_frame(self, frame: PyAttpMessage):
         if not self._session:
             raise ConnectionError("Cannot send an ATTP message to dead session!")
-        await self._session.send(frame)
+        await self.writer.write(frame)
 
     async def send_batch(self, frames: QSequence[PyAttpMessage]):
         if not self._session:
             raise ConnectionError("Cannot send an ATTP message to dead session!")
-        await self._session.send_batch(frames.to_list())
+        await self.writer.write_many(frames.to_list())
 
 
 class LifecyclesMixin(AttpSessionDriver):
@@ -141,8 +318,10 @@ class LifecyclesMixin(AttpSessionDriver):
         self.logger.info("[cyan]ATTP[/] ┆ Session %s requested disconnect", session_label)
         if self._session:
             self.stop_listener()
+            self.writer.abort(ConnectionError(f"ATTP session {session_label} disconnected."))
             self._session.disconnect()
         await self._terminate()
+        self._fail_pending(session_label)
         self._session = None
         self.auth_flag.clear()
     
@@ -170,8 +349,118 @@ class LifecyclesMixin(AttpSessionDriver):
         self._session.stop_listener()
     
 
-class SessionTerminatorMixin(LifecyclesMixin, FrameTransmitterMixin):
+class KeepaliveMixin(LifecyclesMixin, FrameTransmitterMixin):
+    """
+    Pings the peer every `keepalive_interval` seconds while the session is listening.
+
+    Round-trip times are kept in `last_rtt` / `smoothed_rtt`, a session that misses
+    `keepalive_max_missed` pongs in a row is considered dead and gets disconnected.
+    """
+    async def listen(self, receiver: AttpReceiver[tuple["AttpSessionDriver", PyAttpMessage]]):
+        keepalive = None
+        if self.session_configs.keepalive_interval > 0:
+            keepalive = asyncio.create_task(self._keepalive())
+        
+        try:
+            await super().listen(receiver)
+        finally:
+            if keepalive:
+                keepalive.cancel()
+    
+    async def ping(self, timeout: float | None = None) -> float:
+        """Sends PING and returns the round-trip time in seconds, raises `TimeoutError` if no PONG arrives in time."""
+        loop = asyncio.get_running_loop()
+        correlation_id = uuid4().bytes
+        waiter = self._pings[correlation_id] = loop.create_future()
+        started_at = loop.time()
+        try:
+            await self.send_frame(PyAttpMessage(
+                route_id=0,
+                command_type=AttpCommand.PING,
+                correlation_id=correlation_id,
+                payload=None,
+                version=self.version_bytes()
+            ))
+            async with asyncio.timeout(timeout or self.session_configs.keepalive_timeout):
+                received_at = await waiter
+        finally:
+            self._pings.pop(correlation_id, None)
+        
+        rtt = received_at - started_at
+        self.last_rtt = rtt
+        # Same smoothing as TCP's SRTT.
+        self.smoothed_rtt = rtt if self.smoothed_rtt is None else self.smoothed_rtt * 0.875 + rtt * 0.125
+        return rtt
+    
+    async def _keepalive(self):
+        configs = self.session_configs
+        while self._session:
+            await asyncio.sleep(configs.keepalive_interval)
+            try:
+                await self.ping()
+                self.missed_pongs = 0
+            except Exception as e:
+                # Whatever kept the ping from completing, the peer didn't answer it.
+                self.missed_pongs += 1
+                self.logger.warning(
+                    "[cyan]ATTP[/] ┆ Session %s missed a keepalive pong (%s/%s): %s",
+                    self.session_id, self.missed_pongs, configs.keepalive_max_missed, str(e) or type(e).__name__
+                )
+            
+            if self.missed_pongs >= configs.keepalive_max_missed:
+                self.logger.warning("[cyan]ATTP[/] ┆ Session %s is unresponsive, disconnecting", self.session_id)
+                # Shielded, tearing the session down ends `listen` which cancels this task.
+                await asyncio.shield(self.handle_disconnect())
+                return
+
+
+class SessionTerminatorMixin(KeepaliveMixin):
+    async def drain(self, timeout: float, *, reason: str | None = "shutdown") -> bool:
+        """
+        Tells the peer this session is draining so its balancer stops picking it, waits up to `timeout` seconds
+        for in-flight calls and streams in both directions to finish, then closes the session.
+
+        Peers that didn't advertise the "drain" capability aren't told, they'd take the notice for a lifecycle event.
+
+        Returns False if the deadline passed with work still in flight.
+        """
+        if self._session and DRAIN_CAP in self.peer_supported:
+            try:
+                await self.send_frame(PyAttpMessage(
+                    route_id=0,
+                    command_type=AttpCommand.EMIT,
+                    correlation_id=None,
+                    payload=IDrainDTO(deadline=timeout, reason=reason).mpd(),
+                    version=self.version_bytes()
+                ))
+            except ConnectionError:
+                pass
+        
+        self._mark_draining("local")
+        idle = await self.wait_idle(timeout)
+        if not idle:
+            self.logger.warning(
+                "[cyan]ATTP[/] ┆ Session %s drain deadline passed with %s outgoing and %s incoming request(s) in flight",
+                self.session_id, self.in_flight, self.inbound
+            )
+        
+        await self.close()
+        return idle
+    
+    async def wait_idle(self, timeout: float, *, poll_interval: float = 0.05) -> bool:
+        """Waits until the session is idle, returns False if it is still busy after `timeout` seconds."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._session and not self.is_idle:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(poll_interval, remaining))
+        
+        return True
+    
     async def close(self) -> None:
+        session_label = self.session_id
         if self._session:
             self.stop_listener()
             await self.send_frame(PyAttpMessage(
@@ -181,9 +470,12 @@ class SessionTerminatorMixin(LifecyclesMixin, FrameTransmitterMixin):
                 payload=None,
                 version=b"01"
             ))
+            await self.writer.flush()
+            self.writer.abort(ConnectionError(f"ATTP session {session_label} closed."))
             self._session.disconnect()
 
         await self._terminate()
+        self._fail_pending(session_label)
         del self._session
         self._session = None
         self.auth_flag.clear()
@@ -193,5 +485,6 @@ __all__ = [
     "AttpSessionDriver",
     "FrameTransmitterMixin",
     "LifecyclesMixin",
+    "KeepaliveMixin",
     "SessionTerminatorMixin"
 ]
@@ -0,0 +1,244 @@
+import asyncio
+from typing import Any, Callable, Self
+from uuid import uuid4
+
+from ascender.core import inject
+from pydantic import BaseModel
+
+from attp_core.rs_api import PyAttpMessage, AttpCommand
+
+from attp.shared.codecs import MsgpackCodec, PayloadCodec
+from attp.shared.namespaces.router import AttpRouter
+from attp.shared.sessions.additional_mixins import EnhancedFrameTransmitterMixin, StreamingFrameTransmitterMixin
+from attp.shared.sessions.driver import SessionTerminatorMixin
+from attp.shared.utils.qsequence import QSequence
+from attp.types.frame import AttpFrameDTO
+from attp.types.streaming_signature import StreamingSignature
+
+
+LOOPBACK_SCHEME = "loopback://"
+
+_MSGPACK = MsgpackCodec()
+
+
+class LoopbackFrame:
+    """
+    Frame passed between loopback sessions without being serialized.
+
+    Carries the Python object as `value`, `payload` encodes it lazily (and once) with the frame's codec
+    the same way a regular frame would, so code that reads raw payloads keeps working.
+    """
+    __slots__ = ("route_id", "command_type", "correlation_id", "value", "version", "codec", "_payload")
+
+    def __init__(
+        self,
+        route_id: int,
+        command_type: AttpCommand,
+        correlation_id: bytes | None,
+        value: Any,
+        version: bytes | None = None,
+        codec: PayloadCodec | None = None
+    ) -> None:
+        self.route_id = route_id
+        self.command_type = command_type
+        self.correlation_id = correlation_id
+        self.value = value
+        self.version = version
+        self.codec = codec or _MSGPACK
+        self._payload: bytes | None = None
+
+    @property
+    def payload(self) -> bytes | None:
+        if self._payload is None and self.value is not None:
+            value = self.value
+            if isinstance(value, (bytes, bytearray)):
+                self._payload = bytes(value)
+            else:
+                self._payload = self.codec.encode(value)
+        return self._payload
+
+    def unwrap(self) -> Any:
+        """The carried object, raw bytes are decoded like a regular payload would be."""
+        if isinstance(self.value, (bytes, bytearray)):
+            return self.codec.decode(bytes(self.value))
+        return self.value
+
+    def plain(self) -> Any:
+        """The carried object as the peer would see it after decoding, i.e. models are dumped to dicts."""
+        value = self.unwrap()
+        if isinstance(value, BaseModel):
+            return value.model_dump(mode="json")
+        return value
+
+
+class LoopbackSession:
+    """
+    In-process stand-in for the transport `Session`, frames are handed straight to the paired session's event handler.
+    """
+    def __init__(self) -> None:
+        self.session_id = str(uuid4())
+        self.peername = "loopback"
+        self.peer: "LoopbackSession | None" = None
+
+        self._handler: Callable[[list[Any]], Any] | None = None
+        self._stopped = asyncio.Event()
+        self._closed = False
+        self._reset = False
+
+    @classmethod
+    def pair(cls) -> tuple["LoopbackSession", "LoopbackSession"]:
+        left, right = cls(), cls()
+        left.peer, right.peer = right, left
+        return left, right
+
+    def add_event_handler(self, handler: Callable[[list[Any]], Any]) -> None:
+        self._handler = handler
+
+    async def start_handler(self) -> None:
+        return
+
+    async def start_listener(self) -> None:
+        await self._stopped.wait()
+        if self._reset:
+            raise ConnectionResetError(f"Loopback session {self.session_id} was closed by its peer.")
+
+    def stop_listener(self) -> None:
+        self._stopped.set()
+
+    async def send(self, frame: Any) -> None:
+        await self.send_batch([frame])
+
+    async def send_batch(self, frames: list[Any]) -> None:
+        peer = self.peer
+        if self._closed or peer is None or peer._closed:
+            raise ConnectionResetError(f"Loopback session {self.session_id} is closed.")
+
+        if peer._handler is not None:
+            await peer._handler(frames)
+
+    def disconnect(self) -> None:
+        if self._closed:
+            return
+
+        self._closed = True
+        self._stopped.set()
+        if self.peer is not None and not self.peer._closed:
+            # What a dropped socket looks like to the other side.
+            self.peer._closed = True
+            self.peer._reset = True
+            self.peer._stopped.set()
+
+
+class LoopbackSessionDriver(
+    SessionTerminatorMixin,
+    EnhancedFrameTransmitterMixin,
+    StreamingFrameTransmitterMixin
+):
+    """
+    Session driver for a namespace served by route handlers of this very process.
+
+    Drivers come in pairs made by `pair(...)`, the "client" end is registered in `NamespaceDispatcher`
+    like any remote peer while the "server" end is listened on by the frame dispatcher, so calls keep
+    the regular request/response, streaming and error semantics but skip the socket stack and the handshake.
+
+    Unless `serialize` is set, payloads travel as `LoopbackFrame`s and handlers get the caller's objects
+    (validated, not copied), with `serialize` every frame is encoded by its codec as it would be on the wire.
+    A loopback namespace shares route IDs with the local router, so it can't be mixed with remote peers of the same namespace.
+    """
+    router: AttpRouter = inject(AttpRouter)
+
+    def __init__(
+        self,
+        session: LoopbackSession,
+        on_termination: Callable[[Self], Any] | None = None,
+        on_draining: Callable[[Self], Any] | None = None,
+        *,
+        serialize: bool = False
+    ) -> None:
+        super().__init__(session, on_termination, on_draining)  # type: ignore[arg-type]
+        self.serialize = serialize
+
+    @classmethod
+    def pair(
+        cls,
+        namespace: str,
+        *,
+        serialize: bool = False,
+        on_termination: Callable[[Self], Any] | None = None,
+        on_draining: Callable[[Self], Any] | None = None
+    ) -> tuple[Self, Self]:
+        """Returns the `(client, server)` ends of a new loopback connection."""
+        client_session, server_session = LoopbackSession.pair()
+        client = cls(client_session, on_termination, on_draining, serialize=serialize)
+        server = cls(server_session, serialize=serialize)
+
+        for driver, role in ((client, "client"), (server, "server")):
+            driver._role = role
+            driver._namespace = namespace
+        client.peer_supported, server.peer_supported = frozenset(server.supported), frozenset(client.supported)
+
+        return client, server
+
+    async def start(self):
+        asyncio.create_task(self.start_listener())
+        if self.role == "client":
+            # The peer's routes are our own local routes of the namespace.
+            self.router.include_remote_routes(self.namespace, self.router.get_routes(namespace=self.namespace), "client")
+
+        self.auth_flag.set()
+        self.ready_flag.set()
+        return self.namespace, self.session_id
+
+    async def _on_event(self, events: list[PyAttpMessage]):
+        for event in events:
+            if event.command_type == AttpCommand.DISCONNECT:
+                await self.handle_disconnect()
+                return
+
+            self._route_incoming(event)
+
+    async def send_frame(self, frame: PyAttpMessage | LoopbackFrame):
+        if not self._session:
+            raise ConnectionError("Cannot send an ATTP message to dead session!")
+        await self._session.send(frame)
+
+    async def send_batch(self, frames: QSequence[PyAttpMessage]):
+        if not self._session:
+            raise ConnectionError("Cannot send an ATTP message to dead session!")
+        await self._session.send_batch(frames.to_list())
+
+    async def ping(self, timeout: float | None = None) -> float:
+        # Nothing in between to measure.
+        self.last_rtt = self.smoothed_rtt = 0.0
+        return 0.0
+
+    def build_call_frame(self, route_id: int, data: AttpFrameDTO | Any | None, correlation_id: bytes, *, codec: str | None = None) -> PyAttpMessage:
+        if self.serialize:
+            return super().build_call_frame(route_id, data, correlation_id, codec=codec)
+        if route_id < 1:
+            raise ValueError("Cannot use reserved `route_id`s 0 and 1, they are not meant for Attp `CALL` requests.")
+
+        return LoopbackFrame(route_id, AttpCommand.CALL, correlation_id, data, self.version_bytes(), self.resolve_codec(codec))  # type: ignore[return-value]
+
+    def build_event_frame(self, route_id: int, data: AttpFrameDTO | Any | None, *, codec: str | None = None) -> PyAttpMessage:
+        if self.serialize:
+            return super().build_event_frame(route_id, data, codec=codec)
+        if route_id < 1:
+            raise ValueError("Cannot use reserved `route_id`s 0 and 1, they are not meant for Attp `CALL` requests.")
+
+        return LoopbackFrame(route_id, AttpCommand.EMIT, None, data, self.version_bytes(), self.resolve_codec(codec))  # type: ignore[return-value]
+
+    def build_ack_frame(self, route_id: int, data: AttpFrameDTO | Any | None, correlation_id: bytes, *, codec: str | None = None) -> PyAttpMessage:
+        if self.serialize:
+            return super().build_ack_frame(route_id, data, correlation_id, codec=codec)
+
+        return LoopbackFrame(route_id, AttpCommand.ACK, correlation_id, data, self.version_bytes(), self.resolve_codec(codec))  # type: ignore[return-value]
+
+    async def send_chunk(self, info: StreamingSignature, data: AttpFrameDTO | Any):
+        if self.serialize:
+            return await super().send_chunk(info, data)
+
+        await self.send_frame(LoopbackFrame(info.route_id, AttpCommand.CHUNK, info.correlation_id, data, self.version_bytes(), self.resolve_codec(info.codec)))
+
+
+__all__ = ["LOOPBACK_SCHEME", "LoopbackFrame", "LoopbackSession", "LoopbackSessionDriver"]
@@ -0,0 +1,160 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+
+from attp_core.rs_api import Session, PyAttpMessage
+
+from attp.shared.sessions.configs import SessionConfigs
+
+
+@dataclass(slots=True)
+class WriterStats:
+    frames: int = 0
+    bytes: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    largest_batch: int = 0
+
+    @property
+    def average_batch(self) -> float:
+        return self.frames / self.flushes if self.flushes else 0.0
+
+
+class OutboundWriter:
+    """
+    Per-session outbound writer coalescing frames into `Session.send_batch` calls.
+
+    Frames written within the same loop tick (or within `coalesce_window` seconds) are flushed together,
+    a batch is cut early once it reaches `max_batch_frames` or `max_batch_bytes`.
+    Frames written while a flush is in progress are queued for the next batch, so the ordering is preserved.
+    """
+    def __init__(self, session: Session, configs: SessionConfigs) -> None:
+        self.session = session
+        self.configs = configs
+        self.stats = WriterStats()
+
+        self._frames: deque[tuple[PyAttpMessage, int, asyncio.Future[None]]] = deque()
+        self._pending_bytes = 0
+        self._task: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Future[None] | None = None
+        self._closed: BaseException | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._frames)
+
+    async def write(self, frame: PyAttpMessage) -> None:
+        await self.write_many([frame])
+
+    async def write_many(self, frames: list[PyAttpMessage]) -> None:
+        """Queues frames in order and waits until they are handed to the session."""
+        if self._closed is not None:
+            raise ConnectionError("Cannot send an ATTP message to dead session!") from self._closed
+
+        if not frames:
+            return
+
+        loop = asyncio.get_running_loop()
+        waiters: list[asyncio.Future[None]] = []
+        for frame in frames:
+            size = len(frame.payload or b"")
+            waiter = loop.create_future()
+            self._frames.append((frame, size, waiter))
+            self._pending_bytes += size
+            waiters.append(waiter)
+
+        if self._full():
+            self._wake()
+
+        if self._task is None:
+            self._task = loop.create_task(self._drain())
+
+        if len(waiters) == 1:
+            await waiters[0]
+        else:
+            # Retrieves every waiter's outcome, not just the first failure.
+            await asyncio.gather(*waiters)
+
+    async def flush(self) -> None:
+        """Waits until all queued frames are flushed."""
+        task = self._task
+        if task is not None:
+            self._wake()
+            await asyncio.shield(task)
+
+    def abort(self, exc: BaseException) -> None:
+        """Fails every queued frame, no more frames are accepted afterwards."""
+        self._closed = exc
+        while self._frames:
+            _, _, waiter = self._frames.popleft()
+            if not waiter.done():
+                waiter.set_exception(exc)
+        self._pending_bytes = 0
+        self._wake()
+
+    def _full(self) -> bool:
+        return len(self._frames) >= self.configs.max_batch_frames or self._pending_bytes >= self.configs.max_batch_bytes
+
+    def _wake(self) -> None:
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _linger(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._wakeup = loop.create_future()
+        handle = loop.call_later(self.configs.coalesce_window, self._wake)
+        try:
+            await self._wakeup
+        finally:
+            handle.cancel()
+            self._wakeup = None
+
+    async def _drain(self) -> None:
+        try:
+            while self._frames:
+                if self.configs.coalesce_window > 0 and not self._full():
+                    await self._linger()
+
+                batch, waiters = self._take_batch()
+                if not batch:
+                    continue
+
+                try:
+                    await self.session.send_batch(batch)
+                except BaseException as exc:
+                    self.stats.failed_flushes += 1
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(exc)
+                    if not isinstance(exc, Exception):
+                        raise
+                    continue
+
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+        finally:
+            self._task = None
+
+    def _take_batch(self) -> tuple[list[PyAttpMessage], list[asyncio.Future[None]]]:
+        batch: list[PyAttpMessage] = []
+        waiters: list[asyncio.Future[None]] = []
+        size = 0
+        while self._frames and len(batch) < self.configs.max_batch_frames:
+            frame, frame_size, waiter = self._frames[0]
+            if batch and size + frame_size > self.configs.max_batch_bytes:
+                break
+
+            self._frames.popleft()
+            batch.append(frame)
+            waiters.append(waiter)
+            size += frame_size
+
+        self._pending_bytes -= size
+        if batch:
+            self.stats.frames += len(batch)
+            self.stats.bytes += size
+            self.stats.flushes += 1
+            self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+
+        return batch, waiters
@@ -1,19 +1,25 @@
+import asyncio
+import time
 from contextvars import ContextVar
-from typing import Any, AsyncIterable, Callable, Literal, TypeVar, overload
+from typing import Any, AsyncIterable, Callable, Literal, Sequence, TypeVar, overload
+from uuid import uuid4
 from ascender.common import Injectable
-import msgpack
 from pydantic import TypeAdapter
 
 from attp.loadbalancer.balancer import AttpLoadBalancer
+from attp.shared.codecs import CodecRegistry, PayloadCodec
 from attp.shared.namespaces.dispatcher import NamespaceDispatcher
 from attp.shared.namespaces.router import AttpRouter
+from attp.shared.sessions.loopback import LoopbackFrame
 from attp.shared.utils.ack_gate import StatefulAckGate
+from attp.shared.utils.qsequence import QSequence
 from attp.shared.utils.stream_receiver import StreamReceiver
 from attp.types.context import AttpContext
 
 from attp_core.rs_api import PyAttpMessage, AttpCommand
 
-from attp.types.exceptions.attp_exception import AttpException
+from attp.types.exceptions.attp_exception import AttpException, SessionClosedError
+from attp.types.exceptions.load_balancer import NoBalancingCandidateFound
 from attp.types.exceptions.protocol_error import SerializationError
 from attp.types.frame import AttpFrameDTO
 
@@ -24,12 +30,13 @@ S = TypeVar("S")
 
 @Injectable(provided_in=None)
 class AttpTransmitter:
-    def __init__(self, balancer: AttpLoadBalancer, router: AttpRouter):
+    def __init__(self, balancer: AttpLoadBalancer, router: AttpRouter, ack_gate: StatefulAckGate, codecs: CodecRegistry):
         self.attp_context = ContextVar("attpcontext", default=None)
         self.context = ContextVar[AttpContext | None]("sessioncontext", default=None)
-        self.ack_gate = StatefulAckGate()
+        self.ack_gate = ack_gate
         self.balancer = balancer
         self.router = router
+        self.codecs = codecs
     
     @property
     def attpcontext(self):
@@ -40,8 +47,8 @@ class AttpTransmitter:
         
         return context
     
-    def convert_message(self, expected_type: type[T], message: PyAttpMessage) -> T | Any:
-        return self.__format_response(expected_type=expected_type, response_data=message)
+    def convert_message(self, expected_type: type[T], message: PyAttpMessage, codec: PayloadCodec | None = None) -> T | Any:
+        return self.__format_response(expected_type=expected_type, response_data=message, codec=codec or self.codecs.default)
     
     @overload
     async def send(
@@ -79,7 +86,9 @@ class AttpTransmitter:
         namespace: str = "default",
         expected_response: type[T] | None,
         session_id: str | None,
-        role: Literal["client", "server"] | None = "client"
+        role: Literal["client", "server"] | None = "client",
+        retries: int = 0,
+        balance_key: str | bytes | int | None = None
     ) -> T | Any: ...
     
     async def send(
@@ -90,32 +99,66 @@ class AttpTransmitter:
         namespace: str = "default",
         expected_response: type[T] | None = None,
         session_id: str | None = None,
-        role: Literal["client", "server"] | None = "client"
+        role: Literal["client", "server"] | None = "client",
+        retries: int = 0,
+        balance_key: str | bytes | int | None = None
     ) -> T | Any:
-        session = await self.balancer.acquire_session(namespace, session_id=session_id, role=role)
-        print("ACQUIRED SESSION:", session)
-        if not session.session_id:
-            print(session.session_id)
-            self.balancer.rerotate_session(namespace, session)
-            return await self.send(route=route, data=data, timeout=timeout, namespace=namespace, expected_response=expected_response, session_id=session_id, role=role)
-        
-        relevant_route = self.router.dispatch(route, route_type="message", namespace=namespace, role=session.role)
-        
-        if not relevant_route:
-            raise AttpException(404, message="Route not found error.")
+        """
+        Sends CALL to the remote route and waits for its response.
+
+        If the session dies while the call is pending, `SessionClosedError` is raised right away.
+        With `retries` the call is transparently re-sent to another candidate that many times,
+        pinned calls (`session_id`) are never retried.
         
-        try:
-            correlation_id = await session.send_call(route_id=relevant_route.route_id, data=data) # type: ignore
-            queue = await self.ack_gate.request_ack(correlation_id)
+        Calls sharing a `balance_key` stick to the same session with key-aware strategies (e.g. "consistent-hash").
+        """
+        failed: list[str] = []
+        closed: SessionClosedError | None = None
+        while True:
+            try:
+                session = await self.balancer.acquire_session(namespace, session_id=session_id, role=role, balance_key=balance_key, exclude=failed)
+            except NoBalancingCandidateFound:
+                # Every candidate left already failed this call.
+                if closed is not None:
+                    raise closed
+                raise
             
-            response_data = await self.ack_gate.wait_for_ack(correlation_id, timeout, queue=queue)
-        except Exception as e:
-            raise e
-        
-        finally:
-            await self.ack_gate.complete_ack(correlation_id)
-        
-        return self.convert_message(expected_type=expected_response or Any, message=response_data)
+            if not session.session_id:
+                self.balancer.rerotate_session(namespace, session)
+                continue
+            
+            relevant_route = self.router.dispatch(route, route_type="message", namespace=namespace, role=session.role)
+            
+            if not relevant_route:
+                raise AttpException(404, message="Route not found error.")
+            
+            codec = session.resolve_codec(relevant_route.codec)
+            # Register before sending, the response fast-path may resolve it before `send_call` returns.
+            correlation_id = uuid4().bytes
+            pending = self.ack_gate.request_ack(correlation_id, session_id=session.session_id)
+            started_at = time.perf_counter()
+            try:
+                try:
+                    await session.send_call(route_id=relevant_route.route_id, data=data, correlation_id=correlation_id, codec=relevant_route.codec) # type: ignore
+                except SessionClosedError:
+                    self.balancer.report(session, False)
+                    raise
+                response_data = await self._await_ack(session, correlation_id, pending, timeout, started_at)
+            
+            except SessionClosedError as e:
+                if retries < 1 or session_id is not None:
+                    raise
+                
+                # `finally` releases this attempt's correlation ID before the next one is sent.
+                retries -= 1
+                failed.append(session.session_id)
+                closed = e
+                continue
+            
+            finally:
+                self.ack_gate.complete_ack(correlation_id)
+            
+            return self.convert_message(expected_type=expected_response or Any, message=response_data, codec=codec)
     
     @overload
     async def request_stream(
@@ -161,7 +204,9 @@ class AttpTransmitter:
         formatter: None = ...,
         format_to: type[S] = ...,
         session_id: str | None,
-        role: Literal["client", "server"] | None = "client"
+        role: Literal["client", "server"] | None = "client",
+        deadline: Literal["idle", "total"] = "idle",
+        balance_key: str | bytes | int | None = None
     ) -> AsyncIterable[Any]: ...
     
     async def request_stream(
@@ -174,36 +219,73 @@ class AttpTransmitter:
         formatter: Callable[[PyAttpMessage], S | None] | None = None,
         format_to: type[S] | None = None,
         session_id: str | None = None,
-        role: Literal["client", "server"] | None = "client"
+        role: Literal["client", "server"] | None = "client",
+        deadline: Literal["idle", "total"] = "idle",
+        balance_key: str | bytes | int | None = None
     ) -> AsyncIterable[Any] | AsyncIterable[S]:
-        session = await self.balancer.acquire_session(namespace, session_id=session_id, role=role)
+        """
+        Opens a stream on the remote route.
+
+        `deadline="idle"` bounds every wait for the next frame by `timeout`,
+        `deadline="total"` bounds the whole stream instead.
+        """
+        session = await self.balancer.acquire_session(namespace, session_id=session_id, role=role, balance_key=balance_key)
         
         if not session.session_id:
             self.balancer.rerotate_session(namespace, session)
-            return await self.request_stream(route=route, data=data, timeout=timeout, namespace=namespace, formatter=formatter, session_id=session_id, role=role) # type: ignore
+            return await self.request_stream(route=route, data=data, timeout=timeout, namespace=namespace, formatter=formatter, format_to=format_to, session_id=session_id, role=role, deadline=deadline, balance_key=balance_key) # type: ignore
         
         relevant_route = self.router.dispatch(route, route_type="message", namespace=namespace, role=session.role)
         if not relevant_route:
             raise AttpException(404, message="Route not found error.")
         
+        codec = session.resolve_codec(relevant_route.codec)
+        correlation_id = uuid4().bytes
+        pending = self.ack_gate.request_stream(correlation_id, session_id=session.session_id)
+        started_at = time.perf_counter()
         try:
-            correlation_id = await session.send_call(route_id=relevant_route.route_id, data=data) # type: ignore
-            queue = await self.ack_gate.request_ack(correlation_id)
+            await session.send_call(route_id=relevant_route.route_id, data=data, correlation_id=correlation_id, codec=relevant_route.codec) # type: ignore
+        except SessionClosedError:
+            self.ack_gate.complete_ack(correlation_id)
+            self.balancer.report(session, False)
+            raise
         except Exception:
-            await self.ack_gate.complete_ack(correlation_id)
+            self.ack_gate.complete_ack(correlation_id)
             raise
 
         async def _stream():
+            # Latency of a stream is the time to its first frame, the rest is up to the producer.
+            observed = False
             try:
-                async for frame in self.ack_gate.stream_ack(correlation_id, timeout, queue=queue):
+                async for frame in self.ack_gate.stream_ack(correlation_id, timeout, pending=pending, deadline=deadline):
+                    if not observed:
+                        observed = True
+                        self.balancer.observe(session, time.perf_counter() - started_at)
                     yield frame
+
+            except TimeoutError:
+                if not observed:
+                    self.balancer.observe(session, time.perf_counter() - started_at)
+                self.balancer.report(session, False)
+                raise
+
+            except AttpException as e:
+                # Same as for calls, closed sessions (503) and server-side errors count against the session.
+                self.balancer.report(session, e.code < 500)
+                raise
+
+            else:
+                if not observed:
+                    self.balancer.observe(session, time.perf_counter() - started_at)
+                self.balancer.report(session, True)
+
             finally:
-                await self.ack_gate.complete_ack(correlation_id)
+                self.ack_gate.complete_ack(correlation_id)
 
         if not formatter and format_to is not None:
-            formatter = lambda m: self.convert_message(format_to, m)
+            formatter = lambda m: self.convert_message(format_to, m, codec)
         
-        stream = StreamReceiver(_stream(), formatter=formatter)
+        stream = StreamReceiver(_stream(), formatter=formatter, codec=codec)
         
         return stream
     
@@ -226,25 +308,198 @@ class AttpTransmitter:
         if not relevant_route:
             return
         
-        await session.send_event(relevant_route.route_id, data=data) # type: ignore
+        await session.send_event(relevant_route.route_id, data=data, codec=relevant_route.codec) # type: ignore
+        
+    async def send_many(
+        self,
+        items: Sequence[tuple[str, AttpFrameDTO | Any | None]],
+        timeout: float = 50,
+        *,
+        namespace: str = "default",
+        expected_response: type[T] | None = None,
+        role: Literal["client", "server"] | None = "client"
+    ) -> list[T | Any | BaseException]:
+        """
+        Sends CALLs for all `(route, data)` items at once and waits for their responses.
+
+        Routes are resolved once per distinct route, frames are grouped by the session
+        the balancer picks for them and each group is written with a single `send_batch`.
+        Results come back in the input order, a failed item holds its exception instead of a result.
+        """
+        results: list[Any] = [None] * len(items)
+        codecs: list[Any] = [None] * len(items)
+        groups = await self._group_frames(items, "message", namespace, role, results, codecs)
+
+        pendings = {}
+        batches = []
+        for session, entries in groups.values():
+            frames = QSequence()
+            for index, frame in entries:
+                correlation_id: bytes = frame.correlation_id # type: ignore
+                pendings[index] = (session, correlation_id, self.ack_gate.request_ack(correlation_id, session_id=session.session_id))
+                frames.append(frame)
+            batches.append(session.send_batch(frames))
+
+        started_at = time.perf_counter()
+        try:
+            outcomes = await asyncio.gather(*batches, return_exceptions=True)
+            for (session, entries), outcome in zip(groups.values(), outcomes):
+                if isinstance(outcome, BaseException):
+                    for index, _ in entries:
+                        results[index] = outcome
+                        self.balancer.report(session, False)
+                        self.ack_gate.complete_ack(pendings.pop(index)[1])
+
+            indexes = list(pendings)
+            responses = await asyncio.gather(
+                *(self._await_ack(session, cid, pending, timeout, started_at) for session, cid, pending in pendings.values()),
+                return_exceptions=True
+            )
+            for index, response in zip(indexes, responses):
+                if isinstance(response, BaseException):
+                    results[index] = response
+                    continue
+                try:
+                    results[index] = self.convert_message(expected_type=expected_response or Any, message=response, codec=codecs[index])
+                except Exception as e:
+                    results[index] = e
+        
+        finally:
+            for _, cid, _ in pendings.values():
+                self.ack_gate.complete_ack(cid)
         
+        return results
+    
+    async def emit_many(
+        self,
+        items: Sequence[tuple[str, AttpFrameDTO | Any | None]],
+        *,
+        namespace: str = "default",
+        role: Literal["client", "server"] | None = "client"
+    ) -> list[BaseException | None]:
+        """
+        Emits events for all `(route, data)` items, grouped into one `send_batch` per session.
+        Returns a list in the input order holding `None` for written items and the exception for failed ones.
+        """
+        results: list[Any] = [None] * len(items)
+        groups = await self._group_frames(items, "event", namespace, role, results)
+        
+        outcomes = await asyncio.gather(
+            *(session.send_batch(QSequence(frame for _, frame in entries)) for session, entries in groups.values()),
+            return_exceptions=True
+        )
+        for (session, entries), outcome in zip(groups.values(), outcomes):
+            failed = isinstance(outcome, BaseException)
+            for index, _ in entries:
+                # Events get no response, the outcome of the write is all there is to report.
+                self.balancer.report(session, not failed)
+                if failed:
+                    results[index] = outcome
+        
+        return results
+    
+    async def _group_frames(
+        self,
+        items: Sequence[tuple[str, AttpFrameDTO | Any | None]],
+        route_type: Literal["message", "event"],
+        namespace: str,
+        role: Literal["client", "server"] | None,
+        results: list[Any],
+        codecs: list[Any] | None = None
+    ) -> dict[str | None, tuple[Any, list[tuple[int, PyAttpMessage]]]]:
+        routes: dict[tuple[str, str], Any] = {}
+        groups: dict[str | None, tuple[Any, list[tuple[int, PyAttpMessage]]]] = {}
+        
+        for index, (route, data) in enumerate(items):
+            try:
+                session = await self.balancer.acquire_session(namespace, role=role)
+                while not session.session_id:
+                    self.balancer.rerotate_session(namespace, session)
+                    session = await self.balancer.acquire_session(namespace, role=role)
+                
+                route_key = (route, session.role)
+                if route_key not in routes:
+                    routes[route_key] = self.router.dispatch(route, route_type=route_type, namespace=namespace, role=session.role)
+                
+                relevant_route = routes[route_key]
+                if not relevant_route:
+                    raise AttpException(404, message="Route not found error.")
+                
+                if route_type == "message":
+                    frame = session.build_call_frame(relevant_route.route_id, data, uuid4().bytes, codec=relevant_route.codec) # type: ignore
+                else:
+                    frame = session.build_event_frame(relevant_route.route_id, data, codec=relevant_route.codec) # type: ignore
+                
+                if codecs is not None:
+                    codecs[index] = session.resolve_codec(relevant_route.codec)
+            
+            except Exception as e:
+                results[index] = e
+                continue
+            
+            group = groups.get(session.session_id)
+            if group is None:
+                group = groups[session.session_id] = (session, [])
+            group[1].append((index, frame))
+        
+        return groups
+    
+    async def _await_ack(self, session: Any, correlation_id: bytes, pending: Any, timeout: float, started_at: float) -> PyAttpMessage:
+        """Waits for the response of a CALL, reporting its latency and outcome to the balancer."""
+        try:
+            response = await self.ack_gate.wait_for_ack(correlation_id, timeout, pending=pending)
+        
+        except TimeoutError:
+            # A timed out peer is at least as slow as the timeout, let latency-aware strategies know.
+            self.balancer.observe(session, time.perf_counter() - started_at)
+            self.balancer.report(session, False)
+            raise
+        
+        except SessionClosedError:
+            self.balancer.report(session, False)
+            raise
+        
+        except AttpException as e:
+            # Client errors (4xx) are the caller's fault, only server-side failures count against the session.
+            self.balancer.report(session, e.code < 500)
+            raise
+        
+        self.balancer.observe(session, time.perf_counter() - started_at)
+        self.balancer.report(session, True)
+        return response
+    
     async def handle_response(self, message: PyAttpMessage) -> None:
-        if not message.correlation_id:
-            return
-        await self.ack_gate.feed(message)
+        self.ack_gate.resolve(message)
     
-    def __format_response(self, expected_type: Any, response_data: PyAttpMessage):
+    def __format_response(self, expected_type: Any, response_data: PyAttpMessage, codec: PayloadCodec):
+        if isinstance(response_data, LoopbackFrame):
+            return self.__format_loopback_response(expected_type, response_data)
+        
         if issubclass(expected_type, AttpFrameDTO):
             if not response_data.payload:
                 raise SerializationError(f"Nonetype payload received from session while expected type {expected_type.__name__}")
             try:
-                return expected_type.mps(response_data.payload)
+                return expected_type.model_validate(codec.decode(response_data.payload))
             except Exception as e:
                 raise SerializationError(str(e))
         
-        serialized = msgpack.unpackb(response_data.payload, raw=False) if response_data.payload else None
+        serialized = codec.decode(response_data.payload) if response_data.payload else None
         
         if expected_type is not None:
             return serialized
         
         return TypeAdapter(expected_type, config={"arbitrary_types_allowed": True}).validate_python(serialized)
+    
+    def __format_loopback_response(self, expected_type: Any, response_data: LoopbackFrame):
+        if issubclass(expected_type, AttpFrameDTO):
+            value = response_data.unwrap()
+            if isinstance(value, expected_type):
+                return value
+            if value is None:
+                raise SerializationError(f"Nonetype payload received from session while expected type {expected_type.__name__}")
+            try:
+                return expected_type.model_validate(response_data.plain())
+            except Exception as e:
+                raise SerializationError(str(e))
+        
+        return response_data.plain()
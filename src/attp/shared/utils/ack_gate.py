@@ -1,87 +1,268 @@
 import asyncio
+import math
+from collections import deque
+from typing import Literal
 
 from attp_core.rs_api import PyAttpMessage, AttpCommand
 
+from attp.shared.utils.timer_wheel import DeadlineWheel
 from attp.types.exceptions.attp_exception import AttpException
 from attp.types.exceptions.protocol_error import ProtocolError
 from attp.types.frames.error import IAttpErr
 
 
+class PendingRequest:
+    """
+    Unary request awaiting a single ACK or ERR frame, DEFER frames only push its deadline further.
+    """
+    __slots__ = ("correlation_id", "session_id", "future", "timeout", "deadline", "wheel_slot")
+
+    def __init__(self, correlation_id: bytes, loop: asyncio.AbstractEventLoop, session_id: str | None = None) -> None:
+        self.correlation_id = correlation_id
+        self.session_id = session_id
+        self.future: asyncio.Future[PyAttpMessage] = loop.create_future()
+        self.timeout: float | None = None
+        self.deadline = math.inf
+        self.wheel_slot: int | None = None
+
+    def push(self, message: PyAttpMessage) -> None:
+        if self.future.done():
+            return
+
+        command = message.command_type
+        if command == AttpCommand.ACK or command == AttpCommand.ERR:
+            self.future.set_result(message)
+
+        elif command == AttpCommand.DEFER and self.timeout is not None:
+            self.deadline = self.future.get_loop().time() + self.timeout
+
+    def expire(self) -> None:
+        self.fail(TimeoutError(f"ATTP request {self.correlation_id.hex()} timed out."))
+
+    def fail(self, exc: BaseException) -> None:
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+class PendingStream:
+    """
+    Streaming request, frames are buffered until the consumer reads them.
+    """
+    __slots__ = ("correlation_id", "session_id", "frames", "error", "deadline", "wheel_slot", "_loop", "_waiter")
+
+    def __init__(self, correlation_id: bytes, loop: asyncio.AbstractEventLoop, session_id: str | None = None) -> None:
+        self.correlation_id = correlation_id
+        self.session_id = session_id
+        self.frames: deque[PyAttpMessage] = deque()
+        self.error: BaseException | None = None
+        self.deadline = math.inf
+        self.wheel_slot: int | None = None
+        self._loop = loop
+        self._waiter: asyncio.Future[None] | None = None
+
+    def push(self, message: PyAttpMessage) -> None:
+        self.frames.append(message)
+        self._wake()
+
+    def expire(self) -> None:
+        self.fail(TimeoutError(f"ATTP stream {self.correlation_id.hex()} timed out."))
+
+    def fail(self, exc: BaseException) -> None:
+        if self.error is None:
+            self.error = exc
+        self._wake()
+
+    async def wait(self) -> None:
+        self._waiter = self._loop.create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    def _wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
 
 class StatefulAckGate:
-    def __init__(self) -> None:
-        self.pendings: dict[bytes, asyncio.Queue] = {}
-        self.pending_lock = asyncio.Lock()
-    
-    async def request_ack(self, correlation_id: bytes):
-        async with self.pending_lock:
-            queue = self.pendings.get(correlation_id)
-            if queue is None:
-                queue = asyncio.Queue()
-                self.pendings[correlation_id] = queue
-        
-        return queue
+    """
+    Table of requests awaiting their responses, keyed by correlation ID.
+
+    Everything runs on a single event loop so the table is accessed without locks,
+    unary calls are backed by one future and streams by a small frame buffer.
+    Deadlines of all pending requests share one coarse-grained `DeadlineWheel`.
+
+    Requests registered with a `session_id` are also indexed by the session they were sent on,
+    so they can be failed at once with `fail_session(...)` when that session goes away.
+    """
+    def __init__(self, tick: float = 0.05) -> None:
+        self.pendings: dict[bytes, PendingRequest | PendingStream] = {}
+        self.deadlines = DeadlineWheel(tick)
+        self._by_session: dict[str, set[bytes]] = {}
+
+    def request_ack(self, correlation_id: bytes, *, session_id: str | None = None) -> PendingRequest:
+        pending = self.pendings.get(correlation_id)
+        if not isinstance(pending, PendingRequest):
+            pending = PendingRequest(correlation_id, asyncio.get_running_loop(), session_id)
+            self._register(pending)
+
+        return pending
+
+    def request_stream(self, correlation_id: bytes, *, session_id: str | None = None) -> PendingStream:
+        pending = self.pendings.get(correlation_id)
+        if not isinstance(pending, PendingStream):
+            pending = PendingStream(correlation_id, asyncio.get_running_loop(), session_id)
+            self._register(pending)
+
+        return pending
+
+    def outstanding(self, session_id: str | None) -> int:
+        """Number of requests still awaiting their response on the session."""
+        if session_id is None:
+            return 0
+
+        correlation_ids = self._by_session.get(session_id)
+        return len(correlation_ids) if correlation_ids else 0
+
+    def fail_session(self, session_id: str | None, exc: BaseException) -> int:
+        """
+        Fails every request still pending on the session with `exc`, returns how many were failed.
+        Must be called from the event loop thread.
+        """
+        if session_id is None:
+            return 0
+
+        correlation_ids = self._by_session.pop(session_id, None)
+        if not correlation_ids:
+            return 0
+
+        for correlation_id in correlation_ids:
+            pending = self.pendings.get(correlation_id)
+            if pending is not None:
+                pending.fail(exc)
+
+        return len(correlation_ids)
 
     async def feed(self, message: PyAttpMessage) -> None:
+        self.resolve(message)
+
+    def resolve(self, message: PyAttpMessage) -> bool:
+        """
+        Delivers the response frame to its pending request without awaiting.
+        Must be called from the event loop thread, returns False if nobody awaits the correlation ID.
+        """
         if not message.correlation_id:
-            return
+            return False
 
-        async with self.pending_lock:
-            queue = self.pendings.get(message.correlation_id)
-            if queue is None:
-                return
+        pending = self.pendings.get(message.correlation_id)
+        if pending is None:
+            return False
+
+        pending.push(message)
+        return True
 
-        queue.put_nowait(message)
-    
     async def wait_for_ack(
-        self, 
-        correlation_id: bytes, 
+        self,
+        correlation_id: bytes,
         timeout: float,
-        *, queue: asyncio.Queue[PyAttpMessage] | None = None
+        *, pending: PendingRequest | None = None
     ):
-        if not queue:
-            queue = self.pendings.get(correlation_id) or await self.request_ack(correlation_id)
-        
-        while True:
-            message = await asyncio.wait_for(queue.get(), timeout=timeout)
-            
-            if message.command_type == AttpCommand.ERR:
-                raise AttpException.from_ierr(IAttpErr.mps(message.payload) if message.payload else IAttpErr(code=500, message="Internal server error.", detail="Payload less error."))
-
-            if message.command_type == AttpCommand.DEFER:
-                continue
-            
-            if message.command_type == AttpCommand.ACK:
-                return message
-    
+        if not pending:
+            pending = self.request_ack(correlation_id)
+
+        pending.timeout = timeout
+        self.deadlines.schedule(pending, self.deadlines.time() + timeout)
+        try:
+            message = await pending.future
+        finally:
+            self.deadlines.cancel(pending)
+
+        if message.command_type == AttpCommand.ERR:
+            raise _error_from(message)
+
+        return message
+
     async def stream_ack(
         self,
         correlation_id: bytes,
         timeout: float,
-        *, queue: asyncio.Queue[PyAttpMessage] | None = None
+        *,
+        pending: PendingStream | None = None,
+        deadline: Literal["idle", "total"] = "idle"
     ):
-        if not queue:
-            queue = self.pendings.get(correlation_id) or await self.request_ack(correlation_id)
+        """
+        Yields CHUNK frames of the stream.
+
+        With `deadline="idle"` the timeout applies to every wait for the next frame,
+        with `deadline="total"` the whole stream has to complete within the timeout.
+        """
+        if not pending:
+            pending = self.request_stream(correlation_id)
+
+        idle = deadline == "idle"
+        if not idle:
+            self.deadlines.schedule(pending, self.deadlines.time() + timeout)
+
+        try:
+            while True:
+                message = await self._next_frame(pending, timeout, idle=idle)
+
+                if message.command_type == AttpCommand.ERR:
+                    raise _error_from(message)
 
+                if message.command_type == AttpCommand.STREAMBOS:
+                    continue
+
+                if message.command_type == AttpCommand.CHUNK:
+                    yield message
+
+                if message.command_type == AttpCommand.STREAMEOS:
+                    return
+
+                if message.command_type == AttpCommand.ACK:
+                    raise ProtocolError("Malformed ATTP response", "Expected STREAMEOS responses but got ACK response!")
+        finally:
+            self.deadlines.cancel(pending)
+
+    async def _next_frame(self, pending: PendingStream, timeout: float, *, idle: bool) -> PyAttpMessage:
         while True:
-            message = await asyncio.wait_for(queue.get(), timeout=timeout)
-            
-            if message.command_type == AttpCommand.ERR:
-                raise AttpException.from_ierr(IAttpErr.mps(message.payload) if message.payload else IAttpErr(code=500, message="Internal server error.", detail="Payload less error."))
-            
-            if message.command_type == AttpCommand.STREAMBOS:
-                continue
-            
-            if message.command_type == AttpCommand.CHUNK:
-                yield message
-            
-            if message.command_type == AttpCommand.STREAMEOS:
-                return
-            
-            if message.command_type == AttpCommand.ACK:
-                raise ProtocolError("Malformed ATTP response", "Expected STREAMEOS responses but got ACK response!")
-        
-    async def complete_ack(self, correlation_id: bytes):
+            # Frames that made it before the failure are still delivered, STREAMEOS included.
+            if pending.frames:
+                return pending.frames.popleft()
+
+            if pending.error is not None:
+                raise pending.error
+
+            if idle:
+                self.deadlines.schedule(pending, self.deadlines.time() + timeout)
+                try:
+                    await pending.wait()
+                finally:
+                    self.deadlines.cancel(pending)
+            else:
+                await pending.wait()
+
+    def complete_ack(self, correlation_id: bytes):
         """Call when response is returned and theres no need for the corr_id to be hanging on pending"""
-        async with self.pending_lock:
-            self.pendings.pop(correlation_id, None)
+        pending = self.pendings.pop(correlation_id, None)
+        if pending is None or pending.session_id is None:
+            return
+
+        correlation_ids = self._by_session.get(pending.session_id)
+        if correlation_ids is not None:
+            correlation_ids.discard(correlation_id)
+            if not correlation_ids:
+                del self._by_session[pending.session_id]
+
+    def _register(self, pending: PendingRequest | PendingStream) -> None:
+        if pending.correlation_id in self.pendings:
+            self.complete_ack(pending.correlation_id)
+
+        self.pendings[pending.correlation_id] = pending
+        if pending.session_id is not None:
+            self._by_session.setdefault(pending.session_id, set()).add(pending.correlation_id)
+
+
+def _error_from(message: PyAttpMessage) -> AttpException:
+    return AttpException.from_ierr(IAttpErr.mps(message.payload) if message.payload else IAttpErr(code=500, message="Internal server error.", detail="Payload less error."))
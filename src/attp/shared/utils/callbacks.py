@@ -1,11 +1,13 @@
-from typing import TYPE_CHECKING, Any, Callable
+from typing import TYPE_CHECKING, Any, Callable, cast
 
 import msgpack
 from attp_core.rs_api import PyAttpMessage, AttpCommand
 
 from attp.shared.objects.stream import StreamObject
-from attp.shared.sessions.additional_mixins import StreamingFrameTransmitterMixin
-from attp.shared.utils.executor import execute_validated
+from attp.shared.sessions.additional_mixins import EnhancedFrameTransmitterMixin, StreamingFrameTransmitterMixin
+from attp.shared.sessions.driver import AttpSessionDriver
+from attp.shared.sessions.loopback import LoopbackFrame
+from attp.shared.utils.executor import CallPlan, compile_call_plan
 from attp.types.frame import AttpFrameDTO
 from attp.types.routes import AttpRouteMapping
 
@@ -15,19 +17,14 @@ async def execute_call(
     mapping: AttpRouteMapping,
     *, session: StreamingFrameTransmitterMixin
 ):
-    callback = mapping.callback
+    plan = mapping.plan or compile_call_plan(mapping.callback)
     
-    payload = {}
-    
-    if frame.payload:
-        payload = msgpack.unpackb(frame.payload, raw=False)
-    
-    response = await execute_validated(callback, payload, frame=frame)
+    response = await plan.execute(_decode_payload(frame, session, mapping.codec), frame=frame)
     
     if isinstance(response, StreamObject):
 
         assert frame.correlation_id
-        _signature = await session.start_stream(route_id=frame.route_id, correlation_id=frame.correlation_id)
+        _signature = await session.start_stream(route_id=frame.route_id, correlation_id=frame.correlation_id, codec=mapping.codec)
 
         if response.is_async:
             iterable = response.aiterate()
@@ -50,45 +47,37 @@ async def execute_call(
         await session.end_stream(_signature)
         return
     
-    if isinstance(response, AttpFrameDTO):
-        response_payload = response.mpd()
-    elif response is None:
-        response_payload = None
-    elif isinstance(response, (bytes, bytearray)):
-        response_payload = bytes(response)
-    else:
-        response_payload = msgpack.packb(response, use_bin_type=True)
-
     assert frame.correlation_id
-    await session.send_frame(PyAttpMessage(
-        route_id=frame.route_id,
-        command_type=AttpCommand.ACK,
-        correlation_id=frame.correlation_id,
-        payload=response_payload,
-        version=session.version_bytes(),
-    ))
+    await cast(EnhancedFrameTransmitterMixin, session).send_ack(frame.route_id, response, correlation_id=frame.correlation_id, codec=mapping.codec)
 
 async def execute_event(
     frame: PyAttpMessage,
-    mapping: AttpRouteMapping
+    mapping: AttpRouteMapping,
+    *, session: AttpSessionDriver | None = None
 ):
-    callback = mapping.callback
-    
-    payload = {}
+    plan = mapping.plan or compile_call_plan(mapping.callback)
     
-    if frame.payload:
-        payload = msgpack.unpackb(frame.payload, raw=False)
-    
-    await execute_validated(callback, payload, frame=frame)
+    await plan.execute(_decode_payload(frame, session, mapping.codec), frame=frame)
 
 
 async def execute_event_callback(
     frame: PyAttpMessage,
-    callback: Callable[..., Any]
+    callback: CallPlan | Callable[..., Any]
 ):
-    payload = {}
+    await compile_call_plan(callback).execute(_decode_payload(frame), frame=frame)
+
+
+def _decode_payload(frame: PyAttpMessage | LoopbackFrame, session: AttpSessionDriver | None = None, codec: str | None = None) -> Any:
+    if isinstance(frame, LoopbackFrame):
+        # Handed over in-process, only validated by the call plan.
+        value = frame.unwrap()
+        return {} if value is None else value
+    
+    if not frame.payload:
+        return {}
     
-    if frame.payload:
-        payload = msgpack.unpackb(frame.payload, raw=False)
+    if session is None:
+        # Control frames (e.g. ERR) are always msgpack.
+        return msgpack.unpackb(frame.payload, raw=False)
     
-    await execute_validated(callback, payload, frame=frame)
+    return session.decode_payload(frame.payload, codec)
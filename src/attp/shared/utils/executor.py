@@ -1,5 +1,6 @@
 import inspect
-from typing import Any, get_args, get_origin
+from dataclasses import dataclass, field
+from typing import Any, Callable, Literal, get_args, get_origin
 
 from pydantic import BaseModel, TypeAdapter
 
@@ -8,119 +9,193 @@ from attp_core.rs_api import PyAttpMessage
 from attp.types.frame import AttpFrameDTO
 
 
-async def execute_validated(callback: Any, payload: Any, *, frame: PyAttpMessage | None = None):
-    """Thx GPT-5 for the call validator!"""
-    sig = inspect.signature(callback)
-    params = list(sig.parameters.values())
-
-    # Drop "self" / "cls" if present in signature
-    if params and params[0].name in ("self", "cls"):
-        params = params[1:]
-        sig = sig.replace(parameters=params)
-
-    def _payload_as_dict(value: Any) -> dict[str, Any] | None:
-        if value is None:
-            return None
-        if isinstance(value, dict):
-            return value
-        if isinstance(value, (AttpFrameDTO, BaseModel)):
-            if hasattr(value, "model_dump"):
-                return value.model_dump(mode="python")  # type: ignore[attr-defined]
-            return value.__dict__
-        return None
-
-    payload_dict = _payload_as_dict(payload)
-    payload_maps: list[dict[str, Any]] = []
-    if payload_dict:
-        payload_maps.append(payload_dict)
-        for key in ("data", "payload", "body", "params"):
-            nested = payload_dict.get(key)
-            if isinstance(nested, dict):
-                payload_maps.append(nested)
-    elif hasattr(payload, "data") and isinstance(getattr(payload, "data"), dict):
-        payload_maps.append(getattr(payload, "data"))
-
-    def wants_frame(param: inspect.Parameter) -> bool:
-        if frame is None:
-            return False
-
-        ann = param.annotation
-        if ann is PyAttpMessage:
-            return True
-
-        origin = get_origin(ann)
-        if origin is not None and PyAttpMessage in get_args(ann):
-            return True
-
-        return ann is inspect._empty and param.name in ("message", "frame")
-
-    # --- Case 1: single-param message frame ---
-    if len(params) == 1:
-        param = params[0]
-        if wants_frame(param):
-            if inspect.iscoroutinefunction(callback):
-                return await callback(frame)
-            return callback(frame)
-
-        # --- Case 2: single-param model ---
-        ann = param.annotation
-
-        if ann is not inspect._empty and (issubclass_safe(ann, AttpFrameDTO) or issubclass_safe(ann, BaseModel)):
-            if inspect.isclass(ann) and isinstance(payload, ann):
+BindingStrategy = Literal["frame", "model", "kwargs"]
+
+
+@dataclass(slots=True)
+class ParameterBinding:
+    name: str
+    annotation: Any
+    default: Any
+    wants_frame: bool
+    model: type[BaseModel] | None
+    _adapter: TypeAdapter | None = field(default=None, init=False, repr=False)
+
+    @property
+    def required(self) -> bool:
+        return self.default is inspect.Parameter.empty
+
+    @property
+    def annotated(self) -> bool:
+        return self.annotation is not inspect.Parameter.empty
+
+    def validate(self, value: Any) -> Any:
+        if self._adapter is None:
+            self._adapter = TypeAdapter(self.annotation)
+        return self._adapter.validate_python(value)
+
+
+class CallPlan:
+    """
+    Invocation plan of a route callback, compiled once when the route gets registered.
+
+    Holds everything `execute_validated` used to recompute on every call: the parameter
+    binding strategy, model validators, cached `TypeAdapter`s and the sync/async flag.
+    """
+    def __init__(self, callback: Callable[..., Any]) -> None:
+        self.callback = callback
+        self.is_async = inspect.iscoroutinefunction(callback)
+
+        params = list(inspect.signature(callback).parameters.values())
+
+        # Drop "self" / "cls" if present in signature
+        if params and params[0].name in ("self", "cls"):
+            params = params[1:]
+
+        self.bindings = [
+            ParameterBinding(
+                name=param.name,
+                annotation=param.annotation,
+                default=param.default,
+                wants_frame=_wants_frame(param),
+                model=param.annotation if _is_model(param.annotation) else None,
+            )
+            for param in params
+        ]
+
+        self.strategy: BindingStrategy = "kwargs"
+        self.model_fields: tuple[str, ...] = ()
+
+        if len(self.bindings) == 1:
+            binding = self.bindings[0]
+            if binding.wants_frame:
+                self.strategy = "frame"
+            elif binding.model is not None:
+                self.strategy = "model"
+                self.model_fields = tuple(_model_field_names(binding.model))
+
+    async def execute(self, payload: Any, *, frame: PyAttpMessage | None = None):
+        if self.strategy == "frame" and frame is not None:
+            return await self._invoke(frame)
+
+        payload_dict = _payload_as_dict(payload)
+        payload_maps: list[dict[str, Any]] = []
+        if payload_dict:
+            payload_maps.append(payload_dict)
+            for key in ("data", "payload", "body", "params"):
+                nested = payload_dict.get(key)
+                if isinstance(nested, dict):
+                    payload_maps.append(nested)
+        elif hasattr(payload, "data") and isinstance(getattr(payload, "data"), dict):
+            payload_maps.append(getattr(payload, "data"))
+
+        if self.strategy == "model":
+            model_cls = self.bindings[0].model
+            if isinstance(payload, model_cls):  # type: ignore[arg-type]
                 model = payload
             else:
                 source = payload_dict
                 if payload_dict and payload_maps:
-                    field_names = ()
-                    if hasattr(ann, "model_fields"):
-                        field_names = ann.model_fields.keys()  # type: ignore[attr-defined]
-                    elif hasattr(ann, "__fields__"):
-                        field_names = ann.__fields__.keys()  # type: ignore[attr-defined]
-                    if field_names and not any(name in payload_dict for name in field_names):
+                    if self.model_fields and not any(name in payload_dict for name in self.model_fields):
                         source = payload_maps[1] if len(payload_maps) > 1 else payload_dict
-                model = ann.model_validate(source) if hasattr(ann, "model_validate") else ann(**(source or {}))
-            if inspect.iscoroutinefunction(callback):
-                return await callback(model)
-            return callback(model)
-
-    # --- Case 3: normal kwargs mapping ---
-    bound_args = {}
-    for name, param in sig.parameters.items():
-        if wants_frame(param):
-            bound_args[name] = frame
-            continue
-
-        value = None
-        found = False
-        for mapping in payload_maps:
-            if name in mapping:
-                value = mapping[name]
-                found = True
-                break
-
-        if not found:
-            if param.default is inspect.Parameter.empty:
-                raise TypeError(f"Missing required argument: {name}")
-            value = param.default
-        else:
-            if param.annotation is not inspect._empty and (issubclass_safe(param.annotation, AttpFrameDTO) or issubclass_safe(param.annotation, BaseModel)):
-                if inspect.isclass(param.annotation) and isinstance(value, param.annotation):
-                    bound_args[name] = value
+                model = _validate_model(model_cls, source)  # type: ignore[arg-type]
+            return await self._invoke(model)
+
+        bound_args = {}
+        for binding in self.bindings:
+            if binding.wants_frame and frame is not None:
+                bound_args[binding.name] = frame
+                continue
+
+            value = None
+            found = False
+            for mapping in payload_maps:
+                if binding.name in mapping:
+                    value = mapping[binding.name]
+                    found = True
+                    break
+
+            if not found:
+                if binding.required:
+                    raise TypeError(f"Missing required argument: {binding.name}")
+                value = binding.default
+            elif binding.model is not None:
+                if isinstance(value, binding.model):
+                    bound_args[binding.name] = value
                     continue
                 if isinstance(value, dict):
-                    value = param.annotation.model_validate(value) if hasattr(param.annotation, "model_validate") else param.annotation(**value)
-                bound_args[name] = value
+                    value = _validate_model(binding.model, value)
+                bound_args[binding.name] = value
                 continue
 
-        if param.annotation is not inspect._empty:
-            adapter = TypeAdapter(param.annotation)
-            value = adapter.validate_python(value)
+            if binding.annotated:
+                value = binding.validate(value)
+
+            bound_args[binding.name] = value
+
+        return await self._invoke(**bound_args)
+
+    async def _invoke(self, *args: Any, **kwargs: Any):
+        if self.is_async:
+            return await self.callback(*args, **kwargs)
+        return self.callback(*args, **kwargs)
+
+
+def compile_call_plan(callback: Callable[..., Any] | CallPlan) -> CallPlan:
+    if isinstance(callback, CallPlan):
+        return callback
+    return CallPlan(callback)
+
+
+async def execute_validated(callback: Any, payload: Any, *, frame: PyAttpMessage | None = None):
+    """
+    Validates the payload against callback's signature and invokes it.
+
+    Prefer compiling the plan once with `compile_call_plan(...)`, this helper compiles it on every call.
+    """
+    return await compile_call_plan(callback).execute(payload, frame=frame)
+
+
+def _payload_as_dict(value: Any) -> dict[str, Any] | None:
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, (AttpFrameDTO, BaseModel)):
+        if hasattr(value, "model_dump"):
+            return value.model_dump(mode="python")  # type: ignore[attr-defined]
+        return value.__dict__
+    return None
+
+
+def _wants_frame(param: inspect.Parameter) -> bool:
+    ann = param.annotation
+    if ann is PyAttpMessage:
+        return True
+
+    origin = get_origin(ann)
+    if origin is not None and PyAttpMessage in get_args(ann):
+        return True
+
+    return ann is inspect._empty and param.name in ("message", "frame")
+
+
+def _is_model(annotation: Any) -> bool:
+    return annotation is not inspect._empty and (issubclass_safe(annotation, AttpFrameDTO) or issubclass_safe(annotation, BaseModel))
+
+
+def _model_field_names(model: Any):
+    if hasattr(model, "model_fields"):
+        return model.model_fields.keys()
+    if hasattr(model, "__fields__"):
+        return model.__fields__.keys()
+    return ()
 
-        bound_args[name] = value
 
-    if inspect.iscoroutinefunction(callback):
-        return await callback(**bound_args)
-    return callback(**bound_args)
+def _validate_model(model: Any, source: dict[str, Any] | None):
+    if hasattr(model, "model_validate"):
+        return model.model_validate(source)
+    return model(**(source or {}))
 
 
 def issubclass_safe(obj: Any, cls: type) -> bool:
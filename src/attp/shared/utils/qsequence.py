@@ -215,5 +215,27 @@ class QSequence(list[T], Generic[T]):
         super().__delitem__(key)
 
 
+class FrozenQSequence(QSequence[T]):
+    """
+    Immutable, eagerly materialized QSequence.
+
+    Meant for snapshots that are shared between many readers, e.g. balancing candidates,
+    so they can be handed out without copying and cached by identity.
+    """
+    def __init__(self, iterable: Iterable[T] | None = None) -> None:
+        if iterable is not None and not isinstance(iterable, (list, tuple)):
+            iterable = list(iterable)
+        super().__init__(iterable)
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("FrozenQSequence is immutable.")
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable  # type: ignore[assignment]
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable  # type: ignore[assignment]
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return id(self)
+
+
 class QSequenceIterator(QSequence[T]):
     pass
@@ -3,6 +3,9 @@ import msgpack
 from typing import AsyncIterable, AsyncIterator, Callable, Generic, TypeVar
 from attp_core.rs_api import PyAttpMessage
 
+from attp.shared.codecs import PayloadCodec
+from attp.shared.sessions.loopback import LoopbackFrame
+
 
 T = TypeVar("T")
 
@@ -13,17 +16,25 @@ class StreamReceiver(Generic[T]):
         _generator: AsyncIterable[PyAttpMessage],
         *,
         formatter: Callable[[PyAttpMessage], T | None] | None = None,
+        codec: PayloadCodec | None = None,
     ) -> None:
         self.generator = _generator
         self.formatter = formatter
+        self.codec = codec
 
     def __aiter__(self) -> AsyncIterator[T]:
         return self.__iter_stream()
 
     def default_formatter(self, data: PyAttpMessage):
+        if isinstance(data, LoopbackFrame):
+            return data.plain()
+        
         if not data.payload:
             return None
         
+        if self.codec is not None:
+            return self.codec.decode(data.payload)
+        
         return msgpack.unpackb(data.payload)
 
     async def __iter_stream(self):
@@ -0,0 +1,115 @@
+import asyncio
+import math
+from typing import Protocol
+
+
+class DeadlineEntry(Protocol):
+    deadline: float
+    wheel_slot: int | None
+
+    def expire(self) -> None: ...
+
+
+class DeadlineWheel:
+    """
+    Hashed timer wheel tracking many deadlines with coarse ticks.
+
+    Entries are bucketed by `ceil(deadline / tick)`, so scheduling and cancelling are dict operations
+    and the loop only keeps one timer handle for the whole wheel, armed while there is something to expire.
+    Pushing an entry's deadline further is free, it gets re-bucketed lazily when its old slot comes due.
+    """
+    def __init__(self, tick: float = 0.05) -> None:
+        if tick <= 0:
+            raise ValueError("Timer wheel tick must be positive.")
+
+        self.tick = tick
+        self._buckets: dict[int, set[DeadlineEntry]] = {}
+        self._size = 0
+        self._cursor: int | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def time(self) -> float:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return self._loop.time()
+
+    def schedule(self, entry: DeadlineEntry, deadline: float) -> None:
+        entry.deadline = deadline
+        slot = math.ceil(deadline / self.tick)
+
+        if entry.wheel_slot is not None:
+            if entry.wheel_slot <= slot:
+                # Already due no later than the new deadline, re-bucketed when the old slot fires.
+                return
+            self._discard(entry)
+
+        self._insert(entry, slot)
+
+    def cancel(self, entry: DeadlineEntry) -> None:
+        if entry.wheel_slot is not None:
+            self._discard(entry)
+
+        if not self._size and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+            self._cursor = None
+
+    def _insert(self, entry: DeadlineEntry, slot: int) -> None:
+        bucket = self._buckets.get(slot)
+        if bucket is None:
+            bucket = self._buckets[slot] = set()
+
+        bucket.add(entry)
+        entry.wheel_slot = slot
+        self._size += 1
+
+        if self._cursor is None or slot < self._cursor:
+            self._cursor = min(slot, math.floor(self.time() / self.tick))
+
+        if self._handle is None:
+            loop = self._loop or asyncio.get_running_loop()
+            self._loop = loop
+            self._handle = loop.call_later(self.tick, self._on_tick)
+
+    def _discard(self, entry: DeadlineEntry) -> None:
+        bucket = self._buckets.get(entry.wheel_slot)  # type: ignore[arg-type]
+        if bucket is not None and entry in bucket:
+            bucket.discard(entry)
+            self._size -= 1
+            if not bucket:
+                del self._buckets[entry.wheel_slot]  # type: ignore[arg-type]
+
+        entry.wheel_slot = None
+
+    def _on_tick(self) -> None:
+        self._handle = None
+        now = self.time()
+        current = math.floor(now / self.tick)
+        expired: list[DeadlineEntry] = []
+
+        cursor = self._cursor if self._cursor is not None else current
+        while cursor <= current and self._size:
+            bucket = self._buckets.pop(cursor, None)
+            cursor += 1
+            if not bucket:
+                continue
+
+            self._size -= len(bucket)
+            for entry in bucket:
+                entry.wheel_slot = None
+                if entry.deadline > now:
+                    self._insert(entry, max(math.ceil(entry.deadline / self.tick), current + 1))
+                else:
+                    expired.append(entry)
+
+        self._cursor = cursor if self._size else None
+
+        if self._size and self._handle is None:
+            self._handle = self._loop.call_later(self.tick, self._on_tick)  # type: ignore[union-attr]
+
+        for entry in expired:
+            entry.expire()
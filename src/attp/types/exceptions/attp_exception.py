@@ -56,4 +56,15 @@ class AttpException(Exception):
     
     @staticmethod
     def from_ierr(err: IAttpErr):
-        return AttpException(**err.model_dump())
\ No newline at end of file
+        return AttpException(**err.model_dump())
+
+class SessionClosedError(AttpException):
+    """Raised to requests that were still pending on a session when it was closed or lost."""
+    def __init__(self, session_id: str | None) -> None:
+        self.session_id = session_id
+        super().__init__(
+            503,
+            message="ATTP session closed before the response was received.",
+            detail={"session_id": session_id},
+            retryable=True,
+        )
@@ -2,6 +2,8 @@ from typing import Any, Self
 from ascender.common import BaseDTO
 import msgpack
 
+from attp.types.packing import compile_decoder, packb, unpackb
+
 
 class AttpFrameDTO(BaseDTO):
     @classmethod
@@ -47,21 +49,32 @@ class AttpFrameDTO(BaseDTO):
         obj : bytes
             Binary packed by Message Pack object.
         """
-        unpack_configs = {"raw": False}
-        if mp_configs:
-            unpack_configs.update(mp_configs)
-        obj = msgpack.unpackb(obj, **unpack_configs)
+        if not mp_configs and strict is None and from_attributes is None and context is None and by_alias is None and by_name is None:
+            return compile_decoder(cls)(obj)
+        
+        obj = unpackb(obj, **(mp_configs or {}))
         
         return cls.model_validate(obj, strict=strict, from_attributes=from_attributes, context=context, by_alias=by_alias, by_name=by_name)
     
-    def mpd(self, mp_configs: dict[str, Any] | None = None, **kwargs) -> bytes | None:
+    def mpd(self, mp_configs: dict[str, Any] | None = None, *, native: bool = False, **kwargs) -> bytes | None:
         """
         Message Pack Dump
         
         Dumps and packs the model to the binary by utilizing Message Pack library.
         
         Opposite method: `mps(...)`
+        
+        Without `mp_configs` or dump options the model is packed by the class' compiled encoder,
+        skipping the intermediate `model_dump(mode="json")` tree.
+        
+        With `native` bytes, datetimes and UUIDs keep their msgpack types (bin, timestamp and UUID ext)
+        instead of being dumped to strings (ignored along with `mp_configs`), `mps(...)` decodes both forms.
         """
+        if not mp_configs:
+            if not kwargs:
+                return packb(self, native=native)
+            return packb(self.model_dump(**kwargs) if native else self.model_dump(mode="json", **kwargs), native=native)
+        
         pack_configs = {"use_bin_type": True}
         if mp_configs:
             pack_configs.update(mp_configs)
@@ -0,0 +1,8 @@
+from typing import Annotated
+from typing_extensions import Doc
+from attp.types.frame import AttpFrameDTO
+
+
+class IDrainDTO(AttpFrameDTO):
+    deadline: Annotated[float | None, Doc("Seconds the draining node keeps the session open for in-flight calls and streams.")] = None
+    reason: Annotated[str | None, Doc("A human readable reason of draining, e.g. 'shutdown'.")] = None
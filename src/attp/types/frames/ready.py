@@ -9,5 +9,6 @@ class IReadyDTO(AttpFrameDTO):
     proto: Annotated[str, Doc("Protocol ID")] = "ATTP"
     ver: Annotated[str, Doc("Semver for example: 2.0")] = "2.0"
     caps: Annotated[list[str], Doc("Capability flags e.g. ['schemas/msgpack', 'streaming']")] = Field(default_factory=lambda: ['schemas/msgpack', 'streaming'])
+    accepts: Annotated[list[str] | None, Doc("Capability flags the sender itself supports, never copied from the other side. `None` from peers that predate it.")] = None
     routes: Annotated[list[IRouteMapping], Doc("Remote's route pattern mappings, ATTP converts all routes into binary")]
     data: Annotated[Any, Doc("Any additional data that can `read` payload carry, NOTE: this data will be passed to @AttpEvent() connect callback.")]
\ No newline at end of file
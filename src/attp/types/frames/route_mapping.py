@@ -7,7 +7,8 @@ class IRouteMapping(AttpFrameDTO):
     route_id: int
     route_type: RouteType
     namespace: str
+    codec: str | None = None
     
     @staticmethod
     def from_route_mapper(mapper: AttpRouteMapping):
-        return IRouteMapping(pattern=mapper.pattern, route_id=mapper.route_id, route_type=mapper.route_type, namespace=mapper.namespace)
\ No newline at end of file
+        return IRouteMapping(pattern=mapper.pattern, route_id=mapper.route_id, route_type=mapper.route_type, namespace=mapper.namespace, codec=mapper.codec)
\ No newline at end of file
@@ -0,0 +1,219 @@
+import threading
+import types
+from collections.abc import Sequence as AbcSequence
+from datetime import datetime
+from enum import Enum
+from functools import cached_property
+from operator import attrgetter
+from typing import Annotated, Any, Callable, Literal, Sequence, Union, get_args, get_origin
+from uuid import UUID
+
+import msgpack
+from pydantic import BaseModel, PlainSerializer, RootModel, WrapSerializer
+from pydantic_core import to_jsonable_python
+
+
+Encoder = Callable[[BaseModel], Any]
+Decoder = Callable[[bytes], BaseModel]
+
+EXT_UUID = 1
+"""Application ext type carrying the 16 bytes of a UUID in native mode, datetimes use msgpack's own timestamp ext (-1)."""
+
+_NATIVE_TYPES = (str, int, float, bool, type(None))
+_SEQUENCE_ORIGINS = (list, tuple, Sequence, AbcSequence)
+_JSON_CONFIG_KEYS = ("serialize_by_alias", "json_encoders", "ser_json_timedelta", "ser_json_temporal", "ser_json_bytes", "ser_json_inf_nan", "val_json_bytes")
+
+_instance_dict: Encoder = attrgetter("__dict__")
+
+_encoders: dict[type, Encoder] = {}
+_native_encoders: dict[type, Encoder] = {}
+_decoders: dict[type, Decoder] = {}
+_local = threading.local()
+
+
+class _NotCompilable(Exception):
+    pass
+
+
+def packb(value: Any, *, native: bool = False) -> bytes:
+    """
+    Packs `value` with the msgpack `Packer` of the current thread.
+
+    Lists, dicts and scalars are walked by msgpack itself, models (at any depth) go through
+    their compiled encoder and any other object is converted the way `model_dump(mode="json")` would.
+
+    With `native` bytes are sent as `bin`, timezone aware datetimes as timestamp ext and UUIDs as `EXT_UUID` ext
+    instead of strings, only peers that decode with `unpackb` understand it.
+    """
+    if native:
+        packer = getattr(_local, "native_packer", None)
+        if packer is None:
+            packer = _local.native_packer = msgpack.Packer(default=_native_default, use_bin_type=True, datetime=True)
+        return packer.pack(value)
+
+    packer = getattr(_local, "packer", None)
+    if packer is None:
+        packer = _local.packer = msgpack.Packer(default=_default, use_bin_type=True)
+    return packer.pack(value)
+
+
+def unpackb(data: bytes, **options: Any) -> Any:
+    """
+    Unpacks payloads of both modes, timestamps become aware datetimes and `EXT_UUID` UUIDs.
+    Unknown ext types are kept as `msgpack.ExtType` rather than failing, `options` go to `msgpack.unpackb`.
+    """
+    if options:
+        return msgpack.unpackb(data, **{"raw": False, "timestamp": 3, "ext_hook": _ext_hook, **options})
+    return msgpack.unpackb(data, raw=False, timestamp=3, ext_hook=_ext_hook)
+
+
+def compile_encoder(model: type[BaseModel], *, native: bool = False) -> Encoder:
+    """
+    Encoder of `model` instances into what msgpack can walk, compiled once per class.
+
+    The output is what `model_dump(mode="json")` produces for the same model, but values that msgpack
+    carries natively (scalars, lists, string keyed dicts and nested models) are passed as they are
+    instead of being copied into a new tree. Models with custom serializers, computed fields or
+    JSON-specific config keep using `model_dump`.
+
+    `native` encoders pass every field as it is and leave the rest to the native packer.
+    """
+    cache = _native_encoders if native else _encoders
+    encoder = cache.get(model)
+    if encoder is None:
+        try:
+            encoder = _compile_encoder(model, native)
+        except _NotCompilable:
+            encoder = _dump_python if native else _dump_json
+        if model.__pydantic_complete__:
+            # Fields of incomplete models change once `model_rebuild` resolves their forward references.
+            cache[model] = encoder
+    return encoder
+
+
+def compile_decoder(model: type[BaseModel]) -> Decoder:
+    """
+    Decoder of msgpack bytes into `model`, validated by the model's core validator directly.
+    The validator is looked up on every call, `model_rebuild` replaces it.
+    """
+    decoder = _decoders.get(model)
+    if decoder is None:
+        decoder = _decoders[model] = lambda data: model.__pydantic_validator__.validate_python(unpackb(data))
+    return decoder
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == EXT_UUID and len(data) == 16:
+        return UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+def _native_default(value: Any) -> Any:
+    encoder = _native_encoders.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    if isinstance(value, BaseModel):
+        return compile_encoder(type(value), native=True)(value)
+    if isinstance(value, UUID):
+        return msgpack.ExtType(EXT_UUID, value.bytes)
+    if isinstance(value, datetime):
+        # Naive ones, timestamps can't tell them apart from UTC.
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return to_jsonable_python(value)
+
+
+def _default(value: Any) -> Any:
+    encoder = _encoders.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    if isinstance(value, BaseModel):
+        return compile_encoder(type(value))(value)
+    return to_jsonable_python(value)
+
+
+def _dump_json(model: BaseModel) -> Any:
+    return model.model_dump(mode="json")
+
+
+def _dump_python(model: BaseModel) -> Any:
+    return model.model_dump()
+
+
+def _jsonable(value: Any) -> Any:
+    if type(value) in _NATIVE_TYPES:
+        return value
+    return to_jsonable_python(value)
+
+
+def _compile_encoder(model: type[BaseModel], native: bool) -> Encoder:
+    decorators = model.__pydantic_decorators__
+    if issubclass(model, RootModel) or decorators.field_serializers or decorators.model_serializers or model.model_computed_fields:
+        raise _NotCompilable
+    if not native and any(model.model_config.get(key) for key in _JSON_CONFIG_KEYS):
+        raise _NotCompilable
+    if any(isinstance(attr, cached_property) for cls in model.__mro__ for attr in vars(cls).values()):
+        # Would end up in `__dict__` next to the fields.
+        raise _NotCompilable
+
+    fields: list[tuple[str, Callable[[Any], Any] | None]] = []
+    for name, info in model.__pydantic_fields__.items():
+        if info.exclude_if is not None:
+            raise _NotCompilable
+        if info.exclude:
+            continue
+        if _has_serializer(info.metadata):
+            raise _NotCompilable
+        fields.append((name, None if native else _field_converter(info.annotation)))
+
+    extra = model.model_config.get("extra") == "allow"
+
+    if not extra and len(fields) == len(model.__pydantic_fields__) and all(converter is None for _, converter in fields):
+        # Field values are stored in `__dict__` in declaration order, exactly what has to be packed.
+        return _instance_dict
+
+    def encode(instance: BaseModel) -> dict[str, Any]:
+        values = instance.__dict__
+        encoded = {
+            name: values[name] if converter is None else converter(values[name])
+            for name, converter in fields
+        }
+        if extra and instance.__pydantic_extra__:
+            encoded.update(instance.__pydantic_extra__ if native else {key: _jsonable(value) for key, value in instance.__pydantic_extra__.items()})
+        return encoded
+
+    return encode
+
+
+def _field_converter(annotation: Any) -> Callable[[Any], Any] | None:
+    """`None` when msgpack can carry values of `annotation` as they are, a converter otherwise."""
+    if annotation in _NATIVE_TYPES:
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return None
+
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Annotated:
+        if _has_serializer(args[1:]):
+            raise _NotCompilable
+        return _field_converter(args[0])
+    if origin is Literal:
+        return None if all(type(arg) in _NATIVE_TYPES for arg in args) else _jsonable
+    if origin in (Union, types.UnionType) or origin in _SEQUENCE_ORIGINS:
+        inner = [arg for arg in args if arg is not Ellipsis]
+        return None if all(_field_converter(arg) is None for arg in inner) else _jsonable
+    if origin is dict and args:
+        return None if args[0] is str and _field_converter(args[1]) is None else _jsonable
+
+    return _jsonable
+
+
+def _has_serializer(metadata: Sequence[Any]) -> bool:
+    return any(isinstance(item, (PlainSerializer, WrapSerializer)) for item in metadata)
+
+
+__all__ = ["EXT_UUID", "packb", "unpackb", "compile_encoder", "compile_decoder"]
@@ -1,5 +1,8 @@
-from dataclasses import dataclass
-from typing import Any, Literal, TypeAlias
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal, TypeAlias
+
+if TYPE_CHECKING:
+    from attp.shared.utils.executor import CallPlan
 
 # from core.attp.interfaces.handshake.mapping import IRouteMapping
 
@@ -14,6 +17,8 @@ class AttpRouteMapping:
     route_type: RouteType
     callback: Any
     namespace: str
+    plan: "CallPlan | None" = field(default=None, repr=False)
+    codec: str | None = None
 
     def __eq__(self, value: object) -> bool:
         if isinstance(value, AttpRouteMapping):
@@ -4,3 +4,4 @@ from ascender.common import BaseDTO
 class StreamingSignature(BaseDTO):
     route_id: int
     correlation_id: bytes
+    codec: str | None = None
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from typing import Any
+
+import pytest
+
+from attp.shared.codecs import CodecRegistry
+from attp.shared.compression import CompressionRegistry
+from attp.shared.sessions import driver
+from attp.shared.sessions.configs import SessionConfigs
+from attp.shared.utils.ack_gate import StatefulAckGate
+
+
+@pytest.fixture
+def providers(monkeypatch: pytest.MonkeyPatch) -> dict[Any, Any]:
+    """
+    Stands in for the Ascender DI container of session drivers, tests can swap entries before building a driver.
+    """
+    values: dict[Any, Any] = {
+        "ASC_LOGGER": logging.getLogger("attp.tests"),
+        StatefulAckGate: StatefulAckGate(),
+        SessionConfigs: SessionConfigs(keepalive_interval=0),
+        CodecRegistry: CodecRegistry(),
+        CompressionRegistry: CompressionRegistry(),
+    }
+    monkeypatch.setattr(driver, "inject", lambda key: values[key])
+    return values
+
+
+class StubSession:
+    """Bare stand-in for a session driver as the namespace dispatcher and the balancer see it."""
+    def __init__(self, session_id: str, role: str = "client") -> None:
+        self.session_id = session_id
+        self._role = role
+        self.role = role
+        self.in_flight = 0
+        self.smoothed_rtt = None
+        self.draining = False
+
+    def __repr__(self) -> str:
+        return f"StubSession({self.session_id!r})"
+
+
+@pytest.fixture
+def stub_session() -> type[StubSession]:
+    return StubSession
+
+
+@pytest.fixture
+def make_balancer():
+    """Builds a load balancer over a fresh `NamespaceDispatcher` with the default strategies."""
+    from attp.loadbalancer.balancer import AttpLoadBalancer
+    from attp.loadbalancer.caches.memory_cache import SimpleInMemoryCacher
+    from attp.loadbalancer.configs import BalancerConfigs
+    from attp.loadbalancer.strategies.consistent_hash import ConsistentHashStrategy
+    from attp.loadbalancer.strategies.least_outstanding import LeastOutstandingStrategy
+    from attp.loadbalancer.strategies.peak_ewma import PeakEwmaStrategy
+    from attp.loadbalancer.strategies.round_robin import BasicRoundRobinStrategy
+    from attp.shared.namespaces.dispatcher import NamespaceDispatcher
+
+    def factory(strategy: str = "round-robin", **configs: Any) -> AttpLoadBalancer:
+        return AttpLoadBalancer(
+            NamespaceDispatcher(),
+            [BasicRoundRobinStrategy, LeastOutstandingStrategy, PeakEwmaStrategy, ConsistentHashStrategy],
+            BalancerConfigs(balancing_strategy=strategy, **configs),
+            SimpleInMemoryCacher(),
+        )
+
+    return factory
+
+
+class FakePeer:
+    """
+    Stands in for `ServiceDiscovery` as a `PeerPool` sees it.
+
+    `connect` pops the next outcome of `outcomes` (an exception is raised, `None` fails the handshake)
+    and connects once they run out, `listen` holds a session until `drop(...)` is called for it.
+    """
+    def __init__(self, *, outcomes=(), reconnection: bool = True, base_delay: float = 0.01, max_delay: float = 0.04) -> None:
+        from attp.client.configs import ServiceDiscoveryConfigs
+        from attp.shared.limits import AttpLimits
+
+        self.configs = ServiceDiscoveryConfigs(
+            peers=[],
+            limits=AttpLimits(),
+            reconnection=reconnection,
+            reconnect_base_delay=base_delay,
+            reconnect_max_delay=max_delay,
+        )
+        self.logger = logging.getLogger("attp.tests")
+        self.outcomes = list(outcomes)
+        self.attempts: list[float] = []
+        self.sessions: list[StubSession] = []
+        self.closed: list[StubSession] = []
+        self._connections: dict[StubSession, asyncio.Event] = {}
+
+    async def connect(self, config, conn_authenticator=None):
+        self.attempts.append(asyncio.get_running_loop().time())
+        if self.outcomes:
+            outcome = self.outcomes.pop(0)
+            if isinstance(outcome, BaseException):
+                raise outcome
+            if outcome is None:
+                return None
+
+        session = StubSession(f"session-{len(self.sessions)}")
+        session.close = self._closer(session)  # type: ignore[attr-defined]
+        self.sessions.append(session)
+        self._connections[session] = asyncio.Event()
+        return session
+
+    async def listen(self, session) -> None:
+        await self._connections[session].wait()
+
+    def drop(self, session) -> None:
+        self._connections[session].set()
+
+    def _closer(self, session):
+        async def close() -> None:
+            self.closed.append(session)
+        return close
+
+
+@pytest.fixture
+def fake_peer() -> type[FakePeer]:
+    return FakePeer
@@ -0,0 +1,124 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from attp_core.rs_api import AttpCommand, PyAttpMessage
+
+from attp.shared.utils.ack_gate import StatefulAckGate
+from attp.types.exceptions.attp_exception import SessionClosedError
+
+
+def _frame(command: AttpCommand, correlation_id: bytes, payload: bytes | None = None) -> PyAttpMessage:
+    return PyAttpMessage(route_id=2, command_type=command, correlation_id=correlation_id, payload=payload, version=b"\x01\x00")
+
+
+def test_buffered_stream_is_delivered_before_session_failure():
+    async def scenario():
+        gate = StatefulAckGate()
+        correlation_id = uuid4().bytes
+        pending = gate.request_stream(correlation_id, session_id="session")
+
+        for command in (AttpCommand.STREAMBOS, AttpCommand.CHUNK, AttpCommand.CHUNK, AttpCommand.STREAMEOS):
+            gate.resolve(_frame(command, correlation_id, b"\x01"))
+        gate.fail_session("session", SessionClosedError("gone"))
+
+        return [frame async for frame in gate.stream_ack(correlation_id, 1.0, pending=pending)]
+
+    assert len(asyncio.run(scenario())) == 2
+
+
+def test_session_failure_surfaces_once_buffer_is_drained():
+    async def scenario():
+        gate = StatefulAckGate()
+        correlation_id = uuid4().bytes
+        pending = gate.request_stream(correlation_id, session_id="session")
+
+        gate.resolve(_frame(AttpCommand.CHUNK, correlation_id, b"\x01"))
+        gate.fail_session("session", SessionClosedError("gone"))
+
+        received = []
+        with pytest.raises(SessionClosedError):
+            async for frame in gate.stream_ack(correlation_id, 1.0, pending=pending):
+                received.append(frame)
+        return received
+
+    assert len(asyncio.run(scenario())) == 1
+
+
+def test_unanswered_request_times_out():
+    async def scenario():
+        gate = StatefulAckGate(tick=0.01)
+        correlation_id = uuid4().bytes
+        pending = gate.request_ack(correlation_id, session_id="session")
+
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        with pytest.raises(TimeoutError):
+            await gate.wait_for_ack(correlation_id, 0.05, pending=pending)
+        return loop.time() - started_at, len(gate.deadlines)
+
+    elapsed, scheduled = asyncio.run(scenario())
+    assert 0.05 <= elapsed < 0.5
+    assert scheduled == 0
+
+
+def test_defer_pushes_the_deadline_further():
+    async def scenario():
+        gate = StatefulAckGate(tick=0.01)
+        correlation_id = uuid4().bytes
+        pending = gate.request_ack(correlation_id, session_id="session")
+
+        async def respond():
+            for _ in range(3):
+                await asyncio.sleep(0.05)
+                gate.resolve(_frame(AttpCommand.DEFER, correlation_id))
+            await asyncio.sleep(0.05)
+            gate.resolve(_frame(AttpCommand.ACK, correlation_id, b"\xc0"))
+
+        responder = asyncio.create_task(respond())
+        ack = await gate.wait_for_ack(correlation_id, 0.1, pending=pending)
+        await responder
+        return ack.command_type
+
+    assert asyncio.run(scenario()) == AttpCommand.ACK
+
+
+async def _trickle(gate: StatefulAckGate, correlation_id: bytes, chunks: int, interval: float) -> None:
+    gate.resolve(_frame(AttpCommand.STREAMBOS, correlation_id))
+    for _ in range(chunks):
+        await asyncio.sleep(interval)
+        gate.resolve(_frame(AttpCommand.CHUNK, correlation_id, b"\x01"))
+    gate.resolve(_frame(AttpCommand.STREAMEOS, correlation_id))
+
+
+def test_idle_stream_deadline_restarts_with_every_frame():
+    async def scenario():
+        gate = StatefulAckGate(tick=0.01)
+        correlation_id = uuid4().bytes
+        pending = gate.request_stream(correlation_id, session_id="session")
+
+        producer = asyncio.create_task(_trickle(gate, correlation_id, 5, 0.04))
+        chunks = [frame async for frame in gate.stream_ack(correlation_id, 0.1, pending=pending, deadline="idle")]
+        await producer
+        return len(chunks)
+
+    assert asyncio.run(scenario()) == 5
+
+
+def test_total_stream_deadline_covers_the_whole_stream():
+    async def scenario():
+        gate = StatefulAckGate(tick=0.01)
+        correlation_id = uuid4().bytes
+        pending = gate.request_stream(correlation_id, session_id="session")
+
+        producer = asyncio.create_task(_trickle(gate, correlation_id, 5, 0.04))
+        received = []
+        with pytest.raises(TimeoutError):
+            async for frame in gate.stream_ack(correlation_id, 0.1, pending=pending, deadline="total"):
+                received.append(frame)
+        producer.cancel()
+        return len(received), len(gate.deadlines)
+
+    received, scheduled = asyncio.run(scenario())
+    assert received < 5
+    assert scheduled == 0
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from attp_core.rs_api import AttpCommand, PyAttpMessage
+from pydantic import BaseModel, ValidationError
+
+from attp.shared.utils.executor import CallPlan, compile_call_plan, execute_validated
+
+
+class User(BaseModel):
+    id: int
+    name: str
+
+
+def _frame() -> PyAttpMessage:
+    return PyAttpMessage(route_id=2, command_type=AttpCommand.CALL, correlation_id=b"\x01" * 16, payload=None, version=b"\x01\x00")
+
+
+def _run(plan: CallPlan, payload, frame: PyAttpMessage | None = None):
+    return asyncio.run(plan.execute(payload, frame=frame))
+
+
+def test_single_frame_parameter_gets_the_frame():
+    def on_frame(frame: PyAttpMessage):
+        return frame.route_id
+
+    plan = compile_call_plan(on_frame)
+    assert plan.strategy == "frame"
+    assert _run(plan, {"ignored": True}, _frame()) == 2
+
+
+def test_unannotated_message_parameter_gets_the_frame():
+    plan = compile_call_plan(lambda message: message.command_type)
+    assert plan.strategy == "frame"
+    assert _run(plan, None, _frame()) == AttpCommand.CALL
+
+
+def test_single_model_parameter_is_validated_from_the_payload():
+    async def on_user(user: User):
+        return user
+
+    plan = compile_call_plan(on_user)
+    assert plan.strategy == "model"
+    assert plan.is_async
+    assert _run(plan, {"id": "7", "name": "ada"}) == User(id=7, name="ada")
+
+
+def _annotated_model_handler(user: User):
+    return user
+
+
+def test_model_parameter_falls_back_to_nested_data():
+    plan = compile_call_plan(_annotated_model_handler)
+    assert _run(plan, {"data": {"id": 1, "name": "nested"}}) == User(id=1, name="nested")
+
+
+def test_model_instances_are_passed_as_they_are():
+    user = User(id=1, name="ada")
+    assert _run(compile_call_plan(_annotated_model_handler), user) is user
+
+
+def test_invalid_model_payloads_raise():
+    with pytest.raises(ValidationError):
+        _run(compile_call_plan(_annotated_model_handler), {"id": "not a number", "name": "ada"})
+
+
+def test_kwargs_are_bound_by_name_and_validated():
+    def on_call(user_id: int, user: User, limit: int = 10, frame: PyAttpMessage | None = None):
+        return user_id, user, limit, frame
+
+    plan = compile_call_plan(on_call)
+    assert plan.strategy == "kwargs"
+
+    frame = _frame()
+    user_id, user, limit, received = _run(plan, {"user_id": "3", "user": {"id": 3, "name": "ada"}}, frame)
+    assert (user_id, user, limit, received) == (3, User(id=3, name="ada"), 10, frame)
+
+
+def test_kwargs_are_looked_up_in_nested_payload_maps():
+    def on_call(user_id: int, limit: int):
+        return user_id, limit
+
+    assert _run(compile_call_plan(on_call), {"limit": 5, "params": {"user_id": 9}}) == (9, 5)
+
+
+def test_missing_required_kwargs_raise():
+    def on_call(user_id: int):
+        return user_id
+
+    with pytest.raises(TypeError, match="user_id"):
+        _run(compile_call_plan(on_call), {"other": 1})
+
+
+def test_methods_skip_self():
+    class Handlers:
+        def on_user(self, user: User):
+            return user
+
+    plan = compile_call_plan(Handlers.on_user)
+    assert plan.strategy == "model"
+
+
+def test_compiled_plans_are_reused():
+    plan = compile_call_plan(_annotated_model_handler)
+    assert compile_call_plan(plan) is plan
+    assert asyncio.run(execute_validated(plan, {"id": 2, "name": "b"})) == User(id=2, name="b")
@@ -0,0 +1,46 @@
+import zlib
+
+import pytest
+
+from attp.shared.compression import CompressionRegistry, PayloadCompression, ZlibCompressor
+from attp.types.exceptions.protocol_error import ProtocolError
+
+
+@pytest.mark.parametrize("dictionary", [None, b"attp-route-payload" * 8])
+def test_round_trip_within_limit(dictionary):
+    compression = PayloadCompression(ZlibCompressor(dictionary=dictionary), threshold=16, max_size=4096)
+    payload = b"attp-route-payload " * 100
+
+    packed = compression.pack(payload)
+    assert len(packed) < len(payload)
+    assert compression.unpack(packed) == payload
+
+
+def test_oversized_inflated_payload_is_rejected():
+    compression = PayloadCompression(ZlibCompressor(), threshold=16, max_size=64 * 1024)
+    bomb = b"\x01" + zlib.compress(b"\x00" * (64 * 1024 * 1024), 9)
+
+    with pytest.raises(ProtocolError):
+        compression.unpack(bomb)
+
+
+def test_payload_exactly_at_limit_is_accepted():
+    compression = PayloadCompression(ZlibCompressor(), threshold=16, max_size=1024)
+    assert compression.unpack(b"\x01" + zlib.compress(b"\x00" * 1024)) == b"\x00" * 1024
+
+
+@pytest.mark.parametrize("stream", [
+    zlib.compress(b"payload" * 50) + b"trailing",
+    zlib.compress(b"payload" * 50)[:-4],
+    b"not zlib at all",
+])
+def test_malformed_streams_are_rejected(stream):
+    compression = PayloadCompression(ZlibCompressor(), threshold=16, max_size=4096)
+    with pytest.raises(ProtocolError):
+        compression.unpack(b"\x01" + stream)
+
+
+def test_registry_passes_its_limit_to_sessions():
+    registry = CompressionRegistry([ZlibCompressor()], max_size=2048)
+    compression = registry.negotiate(["compress/zlib"], ["compress/zlib"])
+    assert compression is not None and compression.max_size == 2048
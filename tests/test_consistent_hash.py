@@ -0,0 +1,95 @@
+import asyncio
+
+from attp.loadbalancer.caches.memory_cache import SimpleInMemoryCacher
+from attp.loadbalancer.strategies import consistent_hash
+from attp.loadbalancer.strategies.consistent_hash import ConsistentHashStrategy
+from attp.shared.namespaces.dispatcher import NamespaceDispatcher
+
+
+KEYS = [f"user-{index}" for index in range(4000)]
+
+
+def _owners(strategy: ConsistentHashStrategy, candidates) -> dict[str, str]:
+    async def scenario():
+        return {key: (await strategy.balance_keyed(key, candidates[0], candidates)).session_id for key in KEYS}
+
+    return asyncio.run(scenario())
+
+
+def _registry(stub_session, count: int) -> tuple[NamespaceDispatcher, list]:
+    registry = NamespaceDispatcher()
+    sessions = [stub_session(f"s{index}") for index in range(count)]
+    for session in sessions:
+        registry.add_session("ns", session)
+    return registry, sessions
+
+
+def test_same_key_sticks_to_the_same_session(stub_session):
+    registry, _ = _registry(stub_session, 5)
+    strategy = ConsistentHashStrategy(None, SimpleInMemoryCacher())
+    owners = _owners(strategy, registry.dispatch("ns"))
+
+    assert _owners(strategy, registry.dispatch("ns")) == owners
+    # A fresh strategy and snapshot of the same members hash the keys the same way.
+    assert _owners(ConsistentHashStrategy(None, SimpleInMemoryCacher()), registry.dispatch("ns")) == owners
+    assert len(set(owners.values())) == 5
+
+
+def test_adding_a_session_only_moves_keys_to_it(stub_session):
+    registry, _ = _registry(stub_session, 8)
+    strategy = ConsistentHashStrategy(None, SimpleInMemoryCacher())
+    before = _owners(strategy, registry.dispatch("ns"))
+
+    registry.add_session("ns", stub_session("s8"))
+    after = _owners(strategy, registry.dispatch("ns"))
+
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert {after[key] for key in moved} == {"s8"}
+    # About 1/9 of the keys, give or take the unevenness of 160 virtual nodes.
+    assert 0.6 / 9 < len(moved) / len(KEYS) < 1.4 / 9
+
+
+def test_removing_a_session_only_moves_its_keys(stub_session):
+    registry, sessions = _registry(stub_session, 8)
+    strategy = ConsistentHashStrategy(None, SimpleInMemoryCacher())
+    before = _owners(strategy, registry.dispatch("ns"))
+
+    registry.remove_session("ns", sessions[3])
+    after = _owners(strategy, registry.dispatch("ns"))
+
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert moved == [key for key in KEYS if before[key] == "s3"]
+    assert "s3" not in after.values()
+    assert 0.6 / 8 < len(moved) / len(KEYS) < 1.4 / 8
+
+
+def test_ring_is_built_once_per_snapshot(stub_session, monkeypatch):
+    built = []
+    real_ring = consistent_hash.HashRing
+
+    def counting_ring(candidates, virtual_nodes):
+        built.append(candidates)
+        return real_ring(candidates, virtual_nodes)
+
+    monkeypatch.setattr(consistent_hash, "HashRing", counting_ring)
+    registry, sessions = _registry(stub_session, 4)
+    strategy = ConsistentHashStrategy(None, SimpleInMemoryCacher())
+
+    _owners(strategy, registry.dispatch("ns"))
+    _owners(strategy, registry.dispatch("ns"))
+    assert len(built) == 1 and built[0] is registry.dispatch("ns")
+
+    registry.remove_session("ns", sessions[0])
+    _owners(strategy, registry.dispatch("ns"))
+    assert len(built) == 2 and built[1] is registry.dispatch("ns")
+
+
+def test_unkeyed_requests_are_spread_round_robin(stub_session):
+    registry, _ = _registry(stub_session, 3)
+    strategy = ConsistentHashStrategy(None, SimpleInMemoryCacher())
+    candidates = registry.dispatch("ns")
+
+    async def scenario():
+        return [(await strategy.balance(candidates[0], candidates)).session_id for _ in range(6)]
+
+    assert asyncio.run(scenario()) == ["s0", "s1", "s2", "s0", "s1", "s2"]
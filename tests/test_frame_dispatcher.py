@@ -0,0 +1,82 @@
+import asyncio
+from uuid import uuid4
+
+from attp_core.rs_api import AttpCommand, PyAttpMessage
+
+from attp.shared.objects.configs import FrameDispatcherConfigs
+from attp.shared.objects.dispatcher import AttpFrameDispatcher
+from attp.shared.receiver import AttpReceiver
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.inbound = 0
+
+
+class BlockingEventBus:
+    def __init__(self) -> None:
+        self.started = 0
+        self.release = asyncio.Event()
+
+    async def emit(self, session, frame) -> None:
+        self.started += 1
+        await self.release.wait()
+
+
+def _call(correlation_id: bytes) -> PyAttpMessage:
+    return PyAttpMessage(route_id=2, command_type=AttpCommand.CALL, correlation_id=correlation_id, payload=None, version=b"\x01\x00")
+
+
+def test_cancelled_dispatcher_settles_every_frame():
+    async def scenario():
+        eventbus = BlockingEventBus()
+        dispatcher = AttpFrameDispatcher(eventbus, None, FrameDispatcherConfigs(max_concurrency=4))  # type: ignore[arg-type]
+        receiver: AttpReceiver = AttpReceiver()
+        session = FakeSession()
+
+        shared = uuid4().bytes
+        frames = [_call(shared), _call(shared), _call(shared)] + [_call(uuid4().bytes) for _ in range(5)]
+        for frame in frames:
+            session.inbound += 1
+            receiver.on_next((session, frame))
+
+        dispatcher.start(receiver)
+        # The dispatcher reads and spawns workers, none of them got to run yet.
+        await asyncio.sleep(0)
+        assert eventbus.started == 0
+
+        dispatcher.stop_all()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        # Only frames the dispatcher never read (blocked on its semaphore) may stay unsettled.
+        unread = receiver._queue.qsize()
+        return session.inbound - unread, receiver._queue._unfinished_tasks - unread
+
+    assert asyncio.run(scenario()) == (0, 0)
+
+
+def test_frames_of_a_lane_are_handled_in_order():
+    async def scenario():
+        handled: list[int] = []
+
+        class RecordingEventBus:
+            async def emit(self, session, frame) -> None:
+                await asyncio.sleep(0.01 if frame.route_id == 2 else 0)
+                handled.append(frame.route_id)
+
+        dispatcher = AttpFrameDispatcher(RecordingEventBus(), None, FrameDispatcherConfigs(max_concurrency=4))  # type: ignore[arg-type]
+        receiver: AttpReceiver = AttpReceiver()
+        session = FakeSession()
+
+        lane = uuid4().bytes
+        for route_id in (2, 3, 4):
+            session.inbound += 1
+            receiver.on_next((session, PyAttpMessage(route_id=route_id, command_type=AttpCommand.CALL, correlation_id=lane, payload=None, version=b"\x01\x00")))
+
+        dispatcher.start(receiver)
+        await asyncio.wait_for(receiver._queue.join(), timeout=1)
+        dispatcher.stop_all()
+        return handled, session.inbound
+
+    assert asyncio.run(scenario()) == ([2, 3, 4], 0)
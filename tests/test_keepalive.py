@@ -0,0 +1,153 @@
+import asyncio
+import logging
+
+import pytest
+from attp_core.rs_api import AttpCommand, PyAttpMessage
+
+from attp.shared.sessions.configs import SessionConfigs
+from attp.shared.sessions.driver import SessionTerminatorMixin
+
+
+class PongSession:
+    """Answers PINGs with a PONG after `delays` (one per ping, None for no answer), or fails with `error`."""
+    session_id = "session-1"
+
+    def __init__(self, delays=(), error: Exception | None = None) -> None:
+        self.delays = list(delays)
+        self.error = error
+        self.driver: "Driver | None" = None
+        self.pings: list[bytes] = []
+
+    async def send_batch(self, frames) -> None:
+        if self.error is not None:
+            raise self.error
+
+        loop = asyncio.get_running_loop()
+        for frame in frames:
+            if frame.command_type != AttpCommand.PING:
+                continue
+            self.pings.append(frame.correlation_id)
+            delay = self.delays.pop(0) if self.delays else None
+            if delay is None:
+                continue
+            # Another peer's PONG first, it must not resolve this ping.
+            loop.call_soon(self.driver._route_incoming, _pong(b"\x00" * 16))
+            loop.call_later(delay, self.driver._route_incoming, _pong(frame.correlation_id))
+
+    def stop_listener(self) -> None:
+        pass
+
+    def disconnect(self) -> None:
+        pass
+
+
+class Driver(SessionTerminatorMixin):
+    async def start(self):
+        ...
+
+    async def _on_event(self, events):
+        ...
+
+
+def _pong(correlation_id: bytes) -> PyAttpMessage:
+    return PyAttpMessage(route_id=0, command_type=AttpCommand.PONG, correlation_id=correlation_id, payload=None, version=b"\x01\x00")
+
+
+def _driver(session: PongSession) -> Driver:
+    driver = Driver(session)  # type: ignore[arg-type]
+    driver._loop = asyncio.get_running_loop()
+    session.driver = driver
+    return driver
+
+
+@pytest.fixture
+def keepalive(providers):
+    providers[SessionConfigs] = SessionConfigs(keepalive_interval=0.01, keepalive_timeout=0.05, keepalive_max_missed=3)
+    return providers[SessionConfigs]
+
+
+def test_pong_resolves_the_ping_with_its_correlation_id(providers):
+    async def scenario():
+        session = PongSession(delays=[0.02])
+        driver = _driver(session)
+        rtt = await driver.ping(timeout=1)
+        return rtt, driver.last_rtt, driver._pings
+
+    rtt, last_rtt, pings = asyncio.run(scenario())
+    assert rtt >= 0.015
+    assert last_rtt == rtt
+    assert pings == {}
+
+
+def test_ping_times_out_without_a_matching_pong(providers):
+    async def scenario():
+        driver = _driver(PongSession(delays=[None]))
+        with pytest.raises(TimeoutError):
+            await driver.ping(timeout=0.05)
+        return driver._pings, driver.last_rtt
+
+    assert asyncio.run(scenario()) == ({}, None)
+
+
+def test_smoothed_rtt_folds_in_an_eighth_of_every_sample(providers):
+    async def scenario():
+        driver = _driver(PongSession(delays=[0.05, 0.0, 0.0]))
+        samples, smoothed = [], []
+        for _ in range(3):
+            samples.append(await driver.ping(timeout=1))
+            smoothed.append(driver.smoothed_rtt)
+        return samples, smoothed
+
+    samples, smoothed = asyncio.run(scenario())
+    expected = samples[0]
+    assert smoothed[0] == expected
+    for sample, value in zip(samples[1:], smoothed[1:]):
+        expected = expected * 0.875 + sample * 0.125
+        assert value == pytest.approx(expected)
+    assert samples[0] > samples[1] and smoothed[2] > samples[2]
+
+
+def _record_disconnects(driver: Driver) -> list[str]:
+    disconnects: list[str] = []
+
+    async def handle_disconnect():
+        disconnects.append(driver.session_id)
+        driver._session = None
+
+    driver.handle_disconnect = handle_disconnect  # type: ignore[method-assign]
+    return disconnects
+
+
+def test_missed_pongs_disconnect_the_session(keepalive):
+    async def scenario():
+        session = PongSession(delays=[0.0, None, None, None])
+        driver = _driver(session)
+        disconnects = _record_disconnects(driver)
+        await asyncio.wait_for(driver._keepalive(), 2)
+        return disconnects, driver.missed_pongs, len(session.pings)
+
+    assert asyncio.run(scenario()) == (["session-1"], 3, 4)
+
+
+def test_answered_ping_resets_the_missed_count(keepalive):
+    async def scenario():
+        session = PongSession(delays=[None, None, 0.0, None, None, None])
+        driver = _driver(session)
+        disconnects = _record_disconnects(driver)
+        await asyncio.wait_for(driver._keepalive(), 2)
+        return disconnects, len(session.pings)
+
+    # Two misses, an answer, then three misses in a row.
+    assert asyncio.run(scenario()) == (["session-1"], 6)
+
+
+def test_unexpected_ping_errors_count_as_missed_pongs(keepalive, caplog):
+    async def scenario():
+        driver = _driver(PongSession(error=RuntimeError("writer broke")))
+        disconnects = _record_disconnects(driver)
+        await asyncio.wait_for(driver._keepalive(), 2)
+        return disconnects, driver.missed_pongs
+
+    with caplog.at_level(logging.WARNING, logger="attp.tests"):
+        assert asyncio.run(scenario()) == (["session-1"], 3)
+    assert "missed a keepalive pong (1/3): writer broke" in caplog.text
@@ -0,0 +1,123 @@
+import asyncio
+from collections import Counter
+
+import msgpack
+from attp_core.rs_api import AttpCommand, PyAttpMessage
+
+from attp.loadbalancer.caches.memory_cache import SimpleInMemoryCacher
+from attp.loadbalancer.strategies import least_outstanding
+from attp.loadbalancer.strategies.least_outstanding import LeastOutstandingStrategy
+from attp.shared.codecs import CodecRegistry
+from attp.shared.transmitter import AttpTransmitter
+from attp.shared.utils.ack_gate import StatefulAckGate
+from attp.shared.utils.qsequence import QSequence
+
+
+class Route:
+    route_id = 7
+    codec = None
+
+
+class StaticRouter:
+    def dispatch(self, route, route_type, namespace, role):
+        return Route()
+
+
+class HeldSession:
+    """Session whose in-flight count is the ack gate's, calls stay pending until `answer()`."""
+    def __init__(self, session_id: str, gate: StatefulAckGate) -> None:
+        self.session_id = session_id
+        self._role = self.role = "client"
+        self.smoothed_rtt = None
+        self.draining = False
+        self.gate = gate
+        self.held: list[PyAttpMessage] = []
+
+    @property
+    def in_flight(self) -> int:
+        return self.gate.outstanding(self.session_id)
+
+    def resolve_codec(self, name=None):
+        return CodecRegistry().default
+
+    async def send_call(self, route_id, data, correlation_id, codec=None):
+        self.held.append(PyAttpMessage(route_id=route_id, command_type=AttpCommand.ACK, correlation_id=correlation_id, payload=msgpack.packb(data), version=b"\x01\x00"))
+
+    def answer(self) -> None:
+        for frame in self.held:
+            self.gate.resolve(frame)
+        self.held.clear()
+
+
+def _pick(strategy: LeastOutstandingStrategy, candidates: QSequence, picks: int = 1) -> Counter:
+    async def scenario():
+        return [await strategy.balance(candidates[0], candidates) for _ in range(picks)]
+
+    return Counter(candidate.session_id for candidate in asyncio.run(scenario()))
+
+
+def test_picks_the_lighter_of_two_sampled_candidates(stub_session, monkeypatch):
+    candidates = QSequence([stub_session(name) for name in "abc"])
+    for candidate, in_flight in zip(candidates, (5, 1, 3)):
+        candidate.in_flight = in_flight
+
+    sampled = []
+
+    def sample(population, k):
+        sampled.append(k)
+        return [population[0], population[2]]
+
+    monkeypatch.setattr(least_outstanding.random, "sample", sample)
+    assert _pick(LeastOutstandingStrategy({}, SimpleInMemoryCacher()), candidates) == {"c": 1}
+    assert sampled == [2]
+
+
+def test_most_loaded_candidate_is_never_picked_with_two_choices(stub_session):
+    candidates = QSequence([stub_session(name) for name in "abc"])
+    for candidate, in_flight in zip(candidates, (9, 1, 2)):
+        candidate.in_flight = in_flight
+
+    picks = _pick(LeastOutstandingStrategy({}, SimpleInMemoryCacher()), candidates, 300)
+    assert "a" not in picks
+    # "b" wins every sample it is part of, that is two out of three pairs.
+    assert picks["b"] > picks["c"]
+
+
+def test_zero_choices_compare_every_candidate(stub_session):
+    candidates = QSequence([stub_session(name) for name in "abcd"])
+    for candidate, in_flight in zip(candidates, (4, 3, 0, 2)):
+        candidate.in_flight = in_flight
+
+    assert _pick(LeastOutstandingStrategy({"choices": 0}, SimpleInMemoryCacher()), candidates, 20) == {"c": 20}
+
+
+def test_pending_calls_steer_picks_until_their_responses_are_reported(providers, make_balancer):
+    async def scenario():
+        gate = StatefulAckGate()
+        balancer = make_balancer("least-outstanding")
+        outcomes: list[tuple[str, bool]] = []
+        balancer.report = lambda session, success: outcomes.append((session.session_id, success))
+
+        busy, idle = HeldSession("busy", gate), HeldSession("idle", gate)
+        balancer.namespaces.add_session("ns", busy)
+        transmitter = AttpTransmitter(balancer, StaticRouter(), gate, CodecRegistry())  # type: ignore[arg-type]
+
+        calls = [asyncio.create_task(transmitter.send("echo", {"i": i}, timeout=1, namespace="ns")) for i in range(3)]
+        while len(busy.held) < 3:
+            await asyncio.sleep(0)
+        balancer.namespaces.add_session("ns", idle)
+
+        loaded = busy.in_flight, [(await balancer.acquire_session("ns")).session_id for _ in range(10)]
+
+        busy.answer()
+        results = await asyncio.gather(*calls)
+        released = busy.in_flight, Counter([(await balancer.acquire_session("ns")).session_id for _ in range(200)])
+        return loaded, results, outcomes, released
+
+    loaded, results, outcomes, (in_flight, picks) = asyncio.run(scenario())
+    assert loaded == (3, ["idle"] * 10)
+    assert results == [{"i": 0}, {"i": 1}, {"i": 2}]
+    assert outcomes == [("busy", True)] * 3
+    assert in_flight == 0
+    # Both are idle again, ties are broken randomly.
+    assert set(picks) == {"busy", "idle"}
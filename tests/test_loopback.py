@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+from attp_core.rs_api import AttpCommand
+
+from attp.shared.codecs import CodecRegistry
+from attp.shared.sessions.loopback import LoopbackFrame, LoopbackSession, LoopbackSessionDriver
+from attp.shared.transmitter import AttpTransmitter
+from attp.shared.utils.ack_gate import StatefulAckGate
+from attp.shared.utils.callbacks import _decode_payload
+from attp.types.exceptions.attp_exception import AttpException, SessionClosedError
+from attp.types.frames.error import IAttpErr
+
+
+ROUTES = {"echo": 7, "count": 8, "fail": 9}
+
+
+class Route:
+    codec = None
+
+    def __init__(self, route_id: int) -> None:
+        self.route_id = route_id
+
+
+class StaticRouter:
+    def __init__(self) -> None:
+        self.included: list[tuple[str, str]] = []
+
+    def dispatch(self, route, route_type, namespace, role):
+        return Route(ROUTES[route])
+
+    def get_routes(self, namespace):
+        return []
+
+    def include_remote_routes(self, namespace, routes, role):
+        self.included.append((namespace, role))
+
+
+async def _serve(server: LoopbackSessionDriver, calls: list) -> None:
+    """Answers CALLs read off the server end like route handlers would: echo, a counted stream or an error."""
+    while (frame := await server.incoming_listener.get()) is not None:
+        if frame.command_type != AttpCommand.CALL:
+            continue
+
+        calls.append(frame)
+        data = _decode_payload(frame, server)
+        if frame.route_id == ROUTES["echo"]:
+            await server.send_ack(frame.route_id, data, correlation_id=frame.correlation_id)
+        elif frame.route_id == ROUTES["count"]:
+            stream = await server.start_stream(frame.route_id, frame.correlation_id)
+            for index in range(data["chunks"]):
+                await server.send_chunk(stream, {"index": index})
+            await server.end_stream(stream)
+        else:
+            await server.send_error(frame.route_id, error_frame=IAttpErr(code=409, message=data["reason"]), correlation_id=frame.correlation_id)
+
+
+@pytest.fixture
+def loopback(providers, make_balancer, monkeypatch: pytest.MonkeyPatch):
+    """Runs `scenario(transmitter)` against a started loopback pair whose server end is served by `_serve`."""
+    router = StaticRouter()
+    monkeypatch.setattr(LoopbackSessionDriver, "router", router)
+
+    def run(scenario, *, serialize: bool):
+        async def main():
+            client, server = LoopbackSessionDriver.pair("ns", serialize=serialize)
+            await server.start()
+            await client.start()
+
+            balancer = make_balancer()
+            balancer.namespaces.add_session("ns", client)
+            transmitter = AttpTransmitter(balancer, router, providers[StatefulAckGate], providers[CodecRegistry])  # type: ignore[arg-type]
+            calls: list = []
+            serving = asyncio.create_task(_serve(server, calls))
+            try:
+                return await asyncio.wait_for(scenario(transmitter), timeout=1), calls
+            finally:
+                serving.cancel()
+
+        result, calls = asyncio.run(main())
+        assert router.included == [("ns", "client")]
+        # Only `serialize` puts encoded frames on the wire, otherwise the caller's objects are handed over.
+        assert calls and all(isinstance(frame, LoopbackFrame) is not serialize for frame in calls)
+        return result
+
+    return run
+
+
+@pytest.mark.parametrize("serialize", [False, True])
+def test_call_is_answered_with_its_ack(loopback, serialize):
+    async def scenario(transmitter):
+        return [await transmitter.send("echo", {"i": index}, namespace="ns") for index in range(3)]
+
+    assert loopback(scenario, serialize=serialize) == [{"i": 0}, {"i": 1}, {"i": 2}]
+
+
+@pytest.mark.parametrize("serialize", [False, True])
+def test_stream_delivers_every_chunk(loopback, serialize):
+    async def scenario(transmitter):
+        stream = await transmitter.request_stream("count", {"chunks": 4}, namespace="ns")
+        return [chunk async for chunk in stream]
+
+    assert loopback(scenario, serialize=serialize) == [{"index": index} for index in range(4)]
+
+
+@pytest.mark.parametrize("serialize", [False, True])
+def test_error_reaches_the_caller(loopback, serialize):
+    async def scenario(transmitter):
+        with pytest.raises(AttpException) as error:
+            await transmitter.send("fail", {"reason": "conflict"}, namespace="ns")
+        return error.value.code, error.value.message
+
+    assert loopback(scenario, serialize=serialize) == (409, "conflict")
+
+
+def test_disconnect_resets_the_peer_listener():
+    async def scenario():
+        client, server = LoopbackSession.pair()
+        listening = asyncio.create_task(server.start_listener())
+        await asyncio.sleep(0)
+
+        client.disconnect()
+        with pytest.raises(ConnectionResetError):
+            await asyncio.wait_for(listening, timeout=1)
+        # The end that disconnected stops quietly.
+        await asyncio.wait_for(client.start_listener(), timeout=1)
+
+        with pytest.raises(ConnectionResetError):
+            await server.send(None)
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("serialize", [False, True])
+def test_disconnect_terminates_the_peer_driver(providers, serialize):
+    async def scenario():
+        terminated = asyncio.Event()
+
+        async def on_termination(driver):
+            terminated.set()
+
+        client, server = LoopbackSessionDriver.pair("ns", serialize=serialize, on_termination=on_termination)
+        listening = asyncio.create_task(client.start_listener())
+        await asyncio.sleep(0)
+
+        gate: StatefulAckGate = providers[StatefulAckGate]
+        correlation_id = b"c" * 16
+        pending = gate.request_ack(correlation_id, session_id=client.session_id)
+        server._session.disconnect()
+        await asyncio.wait_for(terminated.wait(), timeout=1)
+        await listening
+
+        # Calls still awaiting the lost peer fail right away.
+        with pytest.raises(SessionClosedError):
+            await gate.wait_for_ack(correlation_id, 1, pending=pending)
+        gate.complete_ack(correlation_id)
+        return client._session, client.is_authenticated
+
+    assert asyncio.run(scenario()) == (None, False)
@@ -0,0 +1,107 @@
+from attp.shared.namespaces import dispatcher
+from attp.shared.namespaces.dispatcher import NamespaceDispatcher
+from attp.shared.utils.qsequence import FrozenQSequence
+
+
+class CountingSession:
+    """Session counting reads of its ID, a lookup that scans the registry reads every one of them."""
+    reads = 0
+
+    def __init__(self, session_id: str, role: str = "client") -> None:
+        self._session_id = session_id
+        self._role = role
+        self.draining = False
+
+    @property
+    def session_id(self) -> str:
+        CountingSession.reads += 1
+        return self._session_id
+
+
+def _registry(count: int, namespaces: int = 4) -> tuple[NamespaceDispatcher, list[CountingSession]]:
+    registry = NamespaceDispatcher()
+    sessions = [CountingSession(f"s{index}", "client" if index % 2 else "server") for index in range(count)]
+    for index, session in enumerate(sessions):
+        registry.add_session(f"ns-{index % namespaces}", session)
+    return registry, sessions
+
+
+def _ids(snapshot) -> list[str]:
+    return [session._session_id for session in snapshot]
+
+
+def test_lookups_by_session_id_do_not_scan_the_registry():
+    registry, sessions = _registry(10_000)
+    CountingSession.reads = 0
+
+    assert registry.dispatch("ns-3", "s9999") is sessions[9999]
+    assert registry.dispatch("ns-3", "s9999", "client") is sessions[9999]
+    assert registry.dispatch("ns-0", "s9999") is None
+    assert registry.dispatch("ns-3", "s9999", "server") is None
+    assert registry.dispatch("ns-3", "missing") is None
+    assert CountingSession.reads == 0
+
+
+def test_snapshots_hold_namespace_and_role_members_in_join_order():
+    registry, _ = _registry(8)
+
+    assert isinstance(registry.dispatch("ns-1"), FrozenQSequence)
+    assert _ids(registry.dispatch("ns-1")) == ["s1", "s5"]
+    assert _ids(registry.dispatch("ns-2", role="server")) == ["s2", "s6"]
+    assert _ids(registry.dispatch("ns-2", role="client")) == []
+
+
+def test_unknown_namespace_returns_the_shared_empty_snapshot():
+    registry, _ = _registry(8)
+    cached = dict(registry._snapshots)
+
+    assert registry.dispatch("unknown") is dispatcher._EMPTY
+    assert registry.dispatch("other", role="client") is dispatcher._EMPTY
+    assert registry.dispatch("ns-1", role="server") is dispatcher._EMPTY
+    assert registry._snapshots == cached
+
+
+def test_snapshots_are_rebuilt_only_when_membership_changes():
+    registry, sessions = _registry(8)
+    snapshot = registry.dispatch("ns-0")
+    by_role = registry.dispatch("ns-0", role="server")
+    other = registry.dispatch("ns-1")
+
+    CountingSession.reads = 0
+    assert registry.dispatch("ns-0") is snapshot
+    assert registry.dispatch("ns-0", role="server") is by_role
+    assert CountingSession.reads == 0
+
+    joined = CountingSession("joined", "server")
+    registry.add_session("ns-0", joined)
+    assert registry.dispatch("ns-0") is not snapshot
+    assert _ids(registry.dispatch("ns-0")) == ["s0", "s4", "joined"]
+    assert registry.dispatch("ns-0", role="server") is not by_role
+    assert registry.dispatch("ns-1") is other
+
+    snapshot = registry.dispatch("ns-0")
+    registry.remove_session("ns-0", sessions[0])
+    assert _ids(registry.dispatch("ns-0")) == ["s4", "joined"]
+    assert registry.dispatch("ns-1") is other
+
+
+def test_draining_sessions_leave_snapshots_but_stay_reachable_by_id():
+    registry, sessions = _registry(8)
+    registry.mark_draining(sessions[1])
+
+    assert _ids(registry.dispatch("ns-1")) == ["s5"]
+    assert registry.dispatch("ns-1", "s1") is sessions[1]
+
+    registry.remove_session("ns-1", sessions[1])
+    assert registry.dispatch("ns-1", "s1") is None
+    assert not registry._draining
+
+
+def test_readding_a_session_moves_it_to_the_new_namespace():
+    registry, sessions = _registry(8)
+    registry.add_session("ns-2", sessions[1])
+
+    assert _ids(registry.dispatch("ns-1")) == ["s5"]
+    assert _ids(registry.dispatch("ns-2")) == ["s2", "s6", "s1"]
+    assert registry.dispatch("ns-2", "s1") is sessions[1]
+    assert registry.dispatch("ns-1", "s1") is None
@@ -0,0 +1,40 @@
+import asyncio
+import gc
+
+import pytest
+from attp_core.rs_api import AttpCommand, PyAttpMessage
+
+from attp.shared.sessions.configs import SessionConfigs
+from attp.shared.sessions.writer import OutboundWriter
+
+
+class FailingSession:
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+
+    async def send_batch(self, frames) -> None:
+        self.batches.append(len(frames))
+        raise ConnectionResetError("peer is gone")
+
+
+def _emit(route_id: int) -> PyAttpMessage:
+    return PyAttpMessage(route_id=route_id, command_type=AttpCommand.EMIT, correlation_id=None, payload=b"\x90", version=b"\x01\x00")
+
+
+def test_failed_batches_leave_no_unretrieved_exceptions():
+    unretrieved: list[dict] = []
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unretrieved.append(context))
+        session = FailingSession()
+        writer = OutboundWriter(session, SessionConfigs(max_batch_frames=1))  # type: ignore[arg-type]
+
+        with pytest.raises(ConnectionResetError):
+            await writer.write_many([_emit(route_id) for route_id in range(2, 6)])
+
+        await writer.flush()
+        return session.batches
+
+    assert asyncio.run(scenario()) == [1, 1, 1, 1]
+    gc.collect()
+    assert not unretrieved
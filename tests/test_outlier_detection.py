@@ -0,0 +1,218 @@
+import asyncio
+
+import pytest
+
+from attp.loadbalancer import outliers
+from attp.loadbalancer.configs import OutlierDetectionConfigs
+from attp.loadbalancer.outliers import OutlierDetector
+from attp.shared.utils.qsequence import FrozenQSequence
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(outliers.time, "monotonic", clock)
+    return clock
+
+
+def _detector(**configs) -> OutlierDetector:
+    return OutlierDetector(OutlierDetectionConfigs(**{"consecutive_failures": 3, "base_ejection_time": 10.0, "max_ejection_time": 60.0, "max_ejection_percent": 50.0, **configs}))
+
+
+def _ids(candidates) -> list[str]:
+    return [candidate.session_id for candidate in candidates]
+
+
+def test_consecutive_failures_eject_the_session(clock, stub_session):
+    detector = _detector()
+    sessions = FrozenQSequence([stub_session("a"), stub_session("b")])
+    sick = sessions[0]
+
+    for _ in range(2):
+        detector.record(sick, False)
+    assert not detector.is_ejected(sick)
+
+    detector.record(sick, False)
+    assert detector.is_ejected(sick)
+    assert _ids(detector.filter(sessions)) == ["b"]
+
+
+def test_success_resets_the_failure_streak(clock, stub_session):
+    detector = _detector()
+    session = stub_session("a")
+    for outcome in (False, False, True, False, False):
+        detector.record(session, outcome)
+    assert not detector.is_ejected(session)
+
+
+def test_error_rate_ejects_once_enough_requests_were_seen(clock, stub_session):
+    detector = _detector(consecutive_failures=100, error_rate=0.5, min_requests=6, window_size=10)
+    session = stub_session("a")
+    for outcome in (False, True, False, True, False):
+        detector.record(session, outcome)
+    assert not detector.is_ejected(session)
+
+    detector.record(session, True)
+    detector.record(session, False)
+    assert detector.is_ejected(session)
+
+
+def test_ejected_session_is_readmitted_half_open_after_the_ejection_time(clock, stub_session):
+    detector = _detector()
+    sessions = FrozenQSequence([stub_session("a"), stub_session("b")])
+    sick = sessions[0]
+    for _ in range(3):
+        detector.record(sick, False)
+
+    clock.now += 9.9
+    assert _ids(detector.filter(sessions)) == ["b"]
+
+    clock.now += 0.2
+    assert _ids(detector.filter(sessions)) == ["a", "b"]
+    assert not detector.is_ejected(sick)
+
+    # Half-open: a single success restores the session for good.
+    detector.record(sick, True)
+    detector.record(sick, False)
+    assert not detector.is_ejected(sick)
+
+
+def test_failing_half_open_probe_ejects_again_for_longer(clock, stub_session):
+    detector = _detector()
+    sessions = FrozenQSequence([stub_session("a"), stub_session("b")])
+    sick = sessions[0]
+    for _ in range(3):
+        detector.record(sick, False)
+
+    clock.now += 10.1
+    detector.filter(sessions)
+    detector.record(sick, False)
+    assert detector.is_ejected(sick)
+
+    clock.now += 15.0
+    assert _ids(detector.filter(sessions)) == ["b"]
+    clock.now += 5.1
+    assert _ids(detector.filter(sessions)) == ["a", "b"]
+
+
+def test_ejection_time_is_capped(clock, stub_session):
+    detector = _detector(base_ejection_time=40.0, max_ejection_time=60.0)
+    sessions = FrozenQSequence([stub_session("a"), stub_session("b")])
+    sick = sessions[0]
+    for _ in range(3):
+        detector.record(sick, False)
+    clock.now += 40.1
+    detector.filter(sessions)
+    detector.record(sick, False)
+
+    clock.now += 60.1
+    assert _ids(detector.filter(sessions)) == ["a", "b"]
+
+
+def _eject(detector: OutlierDetector, session) -> None:
+    for _ in range(3):
+        detector.record(session, False)
+
+
+def test_over_the_allowed_share_only_the_first_ejected_stay_out(clock, stub_session):
+    detector = _detector(max_ejection_percent=25.0)
+    sessions = FrozenQSequence([stub_session(name) for name in "abcd"])
+    _eject(detector, sessions[1])
+    clock.now += 1.0
+    _eject(detector, sessions[0])
+
+    assert detector.is_ejected(sessions[0]) and detector.is_ejected(sessions[1])
+    assert _ids(detector.filter(sessions)) == ["a", "c", "d"]
+
+    # Once the first one is back, the other one can be kept out.
+    clock.now += 9.5
+    assert _ids(detector.filter(sessions)) == ["b", "c", "d"]
+
+
+def test_within_the_allowed_share_every_ejected_session_stays_out(clock, stub_session):
+    detector = _detector(max_ejection_percent=50.0)
+    sessions = FrozenQSequence([stub_session(name) for name in "abcd"])
+    _eject(detector, sessions[1])
+    _eject(detector, sessions[0])
+
+    assert _ids(detector.filter(sessions)) == ["c", "d"]
+
+
+def test_at_least_one_candidate_is_left(clock, stub_session):
+    detector = _detector(max_ejection_percent=100.0)
+    sessions = FrozenQSequence([stub_session(name) for name in "ab"])
+    _eject(detector, sessions[0])
+    _eject(detector, sessions[1])
+
+    assert _ids(detector.filter(sessions)) == ["b"]
+    assert _ids(_detector(max_ejection_percent=10.0).filter(sessions)) == ["a", "b"]
+
+
+def test_half_open_session_takes_a_single_probe(clock, stub_session):
+    detector = _detector()
+    sessions = FrozenQSequence([stub_session(name) for name in "ab"])
+    sick = sessions[0]
+    _eject(detector, sick)
+
+    clock.now += 10.1
+    assert _ids(detector.filter(sessions)) == ["a", "b"]
+    assert detector.admit(sick)
+    # Held out while the probe is in flight, a concurrent pick of it is turned down.
+    assert _ids(detector.filter(sessions)) == ["b"]
+    assert not detector.admit(sick)
+
+    detector.record(sick, True)
+    assert _ids(detector.filter(sessions)) == ["a", "b"]
+    assert detector.admit(sick) and detector.admit(sick)
+
+
+def test_probe_without_an_outcome_is_given_up(clock, stub_session):
+    detector = _detector()
+    sessions = FrozenQSequence([stub_session(name) for name in "ab"])
+    sick = sessions[0]
+    _eject(detector, sick)
+
+    clock.now += 10.1
+    detector.filter(sessions)
+    assert detector.admit(sick)
+
+    clock.now += 10.1
+    assert _ids(detector.filter(sessions)) == ["a", "b"]
+    assert detector.admit(sick)
+
+
+def test_balancer_sends_one_probe_to_a_half_open_session(clock, make_balancer, stub_session):
+    balancer = make_balancer("round-robin", outlier_detection=OutlierDetectionConfigs(consecutive_failures=3, base_ejection_time=10.0))
+    sessions = [stub_session(name) for name in "abc"]
+    for session in sessions:
+        balancer.namespaces.add_session("ns", session)
+
+    for _ in range(3):
+        balancer.report(sessions[0], False)
+    clock.now += 10.1
+
+    async def picks(count: int) -> list[str]:
+        return [(await balancer.acquire_session("ns")).session_id for _ in range(count)]
+
+    assert asyncio.run(picks(9)).count("a") == 1
+    balancer.report(sessions[0], True)
+    assert asyncio.run(picks(9)).count("a") == 3
+
+
+def test_filtered_views_are_cached_per_snapshot(clock, stub_session):
+    detector = _detector()
+    sessions = FrozenQSequence([stub_session("a"), stub_session("b")])
+    assert detector.filter(sessions) is sessions
+
+    for _ in range(3):
+        detector.record(sessions[0], False)
+    view = detector.filter(sessions)
+    assert detector.filter(sessions) is view
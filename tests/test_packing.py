@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID, uuid4
+
+import msgpack
+from pydantic import BaseModel
+
+from attp.types.frame import AttpFrameDTO
+from attp.types.packing import EXT_UUID, compile_decoder, compile_encoder, packb, unpackb
+
+
+class Labelled(BaseModel):
+    label: str
+
+
+def test_decoder_follows_model_rebuild():
+    decode = compile_decoder(Labelled)
+    assert decode(packb({"label": "one"})).label == "one"
+
+    Labelled.model_config["coerce_numbers_to_str"] = True
+    try:
+        Labelled.model_rebuild(force=True)
+        assert decode(packb({"label": 1})).label == "1"
+    finally:
+        del Labelled.model_config["coerce_numbers_to_str"]
+        Labelled.model_rebuild(force=True)
+
+
+def test_encoder_is_not_cached_before_forward_references_resolve():
+    class Node(BaseModel):
+        child: "Leaf | None" = None
+
+    assert not Node.__pydantic_complete__
+    compile_encoder(Node)
+
+    class Leaf(BaseModel):
+        name: str
+
+    Node.model_rebuild(_types_namespace={"Leaf": Leaf})
+    node = Node(child=Leaf(name="leaf"))
+    assert compile_encoder(Node)(node) is not None
+    assert packb(node) == packb(node.model_dump(mode="json"))
+
+
+class Attachment(AttpFrameDTO):
+    id: UUID
+    content: bytes
+    created_at: datetime
+    scheduled_at: datetime
+    extra: Any = None
+
+
+def _attachment() -> Attachment:
+    return Attachment(
+        id=uuid4(),
+        content=bytes(range(256)) * 4,
+        created_at=datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone(timedelta(hours=2))),
+        scheduled_at=datetime(2024, 5, 2, 8, 0),
+    )
+
+
+def test_native_dump_round_trips_through_mps():
+    attachment = _attachment()
+    restored = Attachment.mps(attachment.mpd(native=True))
+
+    assert restored == attachment
+    # Aware datetimes come back in UTC, the same instant.
+    assert restored.created_at.utcoffset() == timedelta(0)
+
+
+def test_native_dump_keeps_msgpack_types():
+    attachment = _attachment()
+    raw = msgpack.unpackb(attachment.mpd(native=True), raw=False, timestamp=0)
+
+    assert raw["content"] == attachment.content
+    assert raw["created_at"] == msgpack.Timestamp.from_datetime(attachment.created_at)
+    assert raw["id"] == msgpack.ExtType(EXT_UUID, attachment.id.bytes)
+    # Timestamps can't tell naive datetimes from UTC ones, they are sent as strings.
+    assert raw["scheduled_at"] == attachment.scheduled_at.isoformat()
+
+
+def test_unpackb_decodes_ext_types_without_parsing_strings():
+    moment = datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc)
+    identifier = uuid4()
+    decoded = unpackb(packb({"at": moment, "id": identifier, "blob": b"\x00\xff"}, native=True))
+
+    assert decoded == {"at": moment, "id": identifier, "blob": b"\x00\xff"}
+    assert type(decoded["id"]) is UUID
+
+
+def test_unknown_ext_types_are_kept():
+    unknown = msgpack.ExtType(42, b"opaque")
+    decoded = unpackb(msgpack.packb({"value": unknown, "short": msgpack.ExtType(EXT_UUID, b"x")}))
+
+    assert decoded == {"value": unknown, "short": msgpack.ExtType(EXT_UUID, b"x")}
+    attachment = Attachment.mps(_attachment().model_copy(update={"extra": unknown}).mpd(native=True))
+    assert attachment.extra == unknown
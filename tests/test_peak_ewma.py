@@ -0,0 +1,92 @@
+import asyncio
+import math
+from collections import Counter
+
+import pytest
+
+from attp.loadbalancer.caches.memory_cache import SimpleInMemoryCacher
+from attp.loadbalancer.strategies import peak_ewma
+from attp.loadbalancer.strategies.peak_ewma import PeakEwmaStrategy
+from attp.shared.utils.qsequence import QSequence
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(peak_ewma.time, "monotonic", clock)
+    return clock
+
+
+def _strategy(**parameters) -> PeakEwmaStrategy:
+    return PeakEwmaStrategy({"decay": 10.0, "default_rtt": 0.1, **parameters}, SimpleInMemoryCacher())
+
+
+def _picks(strategy: PeakEwmaStrategy, candidates: QSequence, picks: int = 50) -> Counter:
+    async def scenario():
+        return [await strategy.balance(candidates[0], candidates) for _ in range(picks)]
+
+    return Counter(candidate.session_id for candidate in asyncio.run(scenario()))
+
+
+def test_latency_spike_is_adopted_immediately(clock, stub_session):
+    strategy = _strategy()
+    session = stub_session("a")
+    strategy.observe(session, 0.01)
+
+    clock.now += 0.1
+    strategy.observe(session, 0.5)
+    assert strategy.cost(session) == pytest.approx(0.5)
+
+
+def test_average_decays_while_idle_and_folds_in_improvements(clock, stub_session):
+    strategy = _strategy()
+    session = stub_session("a")
+    strategy.observe(session, 0.5)
+
+    clock.now += 10.0
+    assert strategy.cost(session) == pytest.approx(0.5 * math.exp(-1))
+
+    strategy.observe(session, 0.02)
+    assert strategy.cost(session) == pytest.approx(0.5 * math.exp(-1) + 0.02 * (1 - math.exp(-1)))
+
+    clock.now += 1000.0
+    assert strategy.cost(session) == pytest.approx(0.0)
+
+
+def test_cost_grows_with_in_flight_requests(clock, stub_session):
+    strategy = _strategy()
+    session = stub_session("a")
+    strategy.observe(session, 0.05)
+    session.in_flight = 3
+    assert strategy.cost(session) == pytest.approx(0.2)
+
+
+def test_cheaper_of_the_sampled_candidates_is_picked(clock, stub_session):
+    strategy = _strategy(choices=0)
+    candidates = QSequence([stub_session(name) for name in "abc"])
+    for candidate, latency in zip(candidates, (0.3, 0.01, 0.2)):
+        strategy.observe(candidate, latency)
+
+    assert _picks(strategy, candidates) == {"b": 50}
+
+
+def test_unmeasured_session_is_picked(clock, stub_session):
+    strategy = _strategy(choices=0)
+    measured, fresh = stub_session("measured"), stub_session("fresh")
+    strategy.observe(measured, 0.05)
+    measured.in_flight = 3
+
+    # The fresh session costs `default_rtt`, cheaper than the loaded one it has to compete with.
+    assert _picks(strategy, QSequence([measured, fresh])) == {"fresh": 50}
+
+    # With a keepalive RTT it costs that instead of the default.
+    fresh.smoothed_rtt = 0.5
+    assert _picks(strategy, QSequence([measured, fresh])) == {"measured": 50}
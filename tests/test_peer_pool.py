@@ -0,0 +1,94 @@
+import asyncio
+
+from attp.client.configs import AttpClientConfigs
+from attp.client.pool import PeerPool
+
+
+def _config(**values) -> AttpClientConfigs:
+    return AttpClientConfigs(remote_uri="attp://127.0.0.1:6563", namespace="peer", **values)
+
+
+async def _until(condition, timeout: float = 1.0) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+def test_pool_opens_pool_size_sessions(fake_peer):
+    async def scenario():
+        peer = fake_peer()
+        pool = PeerPool(peer, _config(pool_size=3))  # type: ignore[arg-type]
+        running = asyncio.create_task(pool.run())
+
+        await _until(lambda: len(pool.members) == 3)
+        state = pool.stats.state, pool.stats.connected, pool.size
+
+        pool.stop()
+        for session in peer.sessions:
+            peer.drop(session)
+        await asyncio.wait_for(running, 1)
+        return state, pool.members, pool.stats.state
+
+    assert asyncio.run(scenario()) == (("connected", 3, 3), set(), "stopped")
+
+
+def test_pool_reports_degraded_while_a_session_is_down(fake_peer):
+    async def scenario():
+        peer = fake_peer(base_delay=0.2, max_delay=0.2)
+        pool = PeerPool(peer, _config(pool_size=2))  # type: ignore[arg-type]
+        running = asyncio.create_task(pool.run())
+
+        await _until(lambda: len(pool.members) == 2)
+        peer.drop(peer.sessions[0])
+        await _until(lambda: len(pool.members) == 1)
+        state = pool.stats.state
+
+        pool.stop()
+        peer.drop(peer.sessions[1])
+        await asyncio.wait_for(running, 1)
+        return state
+
+    assert asyncio.run(scenario()) == "degraded"
+
+
+def test_pool_grows_under_load_up_to_max_pool_size(fake_peer):
+    async def scenario():
+        peer = fake_peer()
+        pool = PeerPool(peer, _config(pool_size=1, max_pool_size=3, pool_grow_threshold=4, pool_check_interval=0.01))  # type: ignore[arg-type]
+        running = asyncio.create_task(pool.run())
+
+        await _until(lambda: len(pool.members) == 1)
+        await asyncio.sleep(0.05)
+        idle_size = pool.size
+
+        for session in peer.sessions:
+            session.in_flight = 10
+        await _until(lambda: len(pool.members) == 3)
+        for session in peer.sessions:
+            session.in_flight = 10
+        await asyncio.sleep(0.05)
+        grown_size = pool.size
+
+        pool.stop()
+        for session in peer.sessions:
+            peer.drop(session)
+        await asyncio.wait_for(running, 1)
+        return idle_size, grown_size
+
+    assert asyncio.run(scenario()) == (1, 3)
+
+
+def test_sessions_connected_after_stop_are_closed(fake_peer):
+    async def scenario():
+        peer = fake_peer()
+        pool = PeerPool(peer, _config())  # type: ignore[arg-type]
+        pool.stop()
+        connected = await pool._serve()
+        return connected, peer.closed, pool.members
+
+    connected, closed, members = asyncio.run(scenario())
+    assert connected
+    assert [session.session_id for session in closed] == ["session-0"]
+    assert members == set()
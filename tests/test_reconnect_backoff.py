@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from attp.client import pool as pool_module
+from attp.client.configs import AttpClientConfigs
+from attp.client.pool import PeerPool
+
+
+def _pool(peer) -> PeerPool:
+    return PeerPool(peer, AttpClientConfigs(remote_uri="attp://127.0.0.1:6563", namespace="peer"))
+
+
+@pytest.mark.parametrize("jitter", ["low", "high"])
+def test_backoff_doubles_up_to_the_max_delay_with_equal_jitter(fake_peer, monkeypatch, jitter):
+    monkeypatch.setattr(pool_module.random, "uniform", (lambda low, high: low) if jitter == "low" else (lambda low, high: high))
+    pool = _pool(fake_peer(base_delay=0.5, max_delay=3.0))
+
+    ceilings = [0.5, 0.5, 1.0, 2.0, 3.0, 3.0]
+    expected = [ceiling / 2 if jitter == "low" else ceiling for ceiling in ceilings]
+    assert [pool._backoff(attempt) for attempt in range(6)] == expected
+
+
+def test_failed_connects_are_retried_with_growing_delays(fake_peer):
+    async def scenario():
+        peer = fake_peer(outcomes=[ConnectionError("refused"), ConnectionError("refused"), None], base_delay=0.02, max_delay=1.0)
+        pool = _pool(peer)
+        running = asyncio.create_task(pool.run())
+
+        while not pool.members:
+            await asyncio.sleep(0.005)
+        stats = pool.stats.failed_attempts, pool.stats.reconnects, pool.stats.last_error
+
+        pool.stop()
+        peer.drop(peer.sessions[0])
+        await asyncio.wait_for(running, 1)
+        return stats, [later - earlier for earlier, later in zip(peer.attempts, peer.attempts[1:])]
+
+    stats, gaps = asyncio.run(scenario())
+    assert stats == (3, 3, "refused")
+    # Equal jitter keeps at least half of the 0.02, 0.04 and 0.08 ceilings.
+    assert gaps[0] >= 0.01 and gaps[1] >= 0.02 and gaps[2] >= 0.04
+
+
+def test_backoff_restarts_after_a_successful_connection(fake_peer, monkeypatch):
+    attempts: list[int] = []
+    real_backoff = PeerPool._backoff
+
+    def recording_backoff(self, attempt):
+        attempts.append(attempt)
+        return real_backoff(self, attempt)
+
+    monkeypatch.setattr(PeerPool, "_backoff", recording_backoff)
+
+    async def scenario():
+        peer = fake_peer(outcomes=[ConnectionError("refused"), ConnectionError("refused")], base_delay=0.005, max_delay=0.01)
+        pool = _pool(peer)
+        running = asyncio.create_task(pool.run())
+
+        while not pool.members:
+            await asyncio.sleep(0.005)
+        peer.drop(peer.sessions[0])
+        while len(peer.sessions) < 2:
+            await asyncio.sleep(0.005)
+
+        pool.stop()
+        peer.drop(peer.sessions[1])
+        await asyncio.wait_for(running, 1)
+
+    asyncio.run(scenario())
+    assert attempts == [1, 2, 0]
+
+
+def test_dropped_sessions_are_not_reconnected_without_reconnection(fake_peer):
+    async def scenario():
+        peer = fake_peer(reconnection=False)
+        pool = _pool(peer)
+        running = asyncio.create_task(pool.run())
+
+        while not pool.members:
+            await asyncio.sleep(0.005)
+        peer.drop(peer.sessions[0])
+        await asyncio.wait_for(running, 1)
+        return len(peer.attempts), pool.stats.reconnects
+
+    assert asyncio.run(scenario()) == (1, 0)
+
+
+def test_stop_interrupts_the_backoff_wait(fake_peer):
+    async def scenario():
+        peer = fake_peer(outcomes=[ConnectionError("refused")], base_delay=30.0, max_delay=30.0)
+        pool = _pool(peer)
+        running = asyncio.create_task(pool.run())
+
+        while not pool.stats.failed_attempts:
+            await asyncio.sleep(0.005)
+        pool.stop()
+        await asyncio.wait_for(running, 1)
+        return len(peer.attempts), pool.stats.state
+
+    assert asyncio.run(scenario()) == (1, "stopped")
@@ -0,0 +1,106 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from attp_core.rs_api import AttpCommand, PyAttpMessage
+
+from attp.shared.sessions.driver import SessionTerminatorMixin
+from attp.shared.utils.ack_gate import StatefulAckGate
+from attp.types.exceptions.attp_exception import AttpException
+from attp.types.frames.error import IAttpErr
+
+
+class IdleSession:
+    session_id = "session-1"
+
+
+class Driver(SessionTerminatorMixin):
+    async def start(self):
+        ...
+
+    async def _on_event(self, events):
+        ...
+
+
+def _frame(command: AttpCommand, correlation_id: bytes | None, payload: bytes | None = None, route_id: int = 2) -> PyAttpMessage:
+    return PyAttpMessage(route_id=route_id, command_type=command, correlation_id=correlation_id, payload=payload, version=b"\x01\x00")
+
+
+def _queued(driver: Driver) -> list[AttpCommand]:
+    commands = []
+    while not driver.incoming_listener.empty():
+        commands.append(driver.incoming_listener.get_nowait().command_type)
+    return commands
+
+
+def _driver() -> Driver:
+    driver = Driver(IdleSession())  # type: ignore[arg-type]
+    driver._loop = asyncio.get_running_loop()
+    return driver
+
+
+def test_awaited_responses_skip_the_listener_queue(providers):
+    async def scenario():
+        driver = _driver()
+        gate: StatefulAckGate = providers[StatefulAckGate]
+        correlation_id = uuid4().bytes
+        pending = gate.request_ack(correlation_id, session_id=driver.session_id)
+
+        driver._route_incoming(_frame(AttpCommand.ACK, correlation_id, b"\xc0"))
+        ack = await gate.wait_for_ack(correlation_id, 1.0, pending=pending)
+        return ack.command_type, _queued(driver)
+
+    assert asyncio.run(scenario()) == (AttpCommand.ACK, [])
+
+
+def test_stream_frames_skip_the_listener_queue(providers):
+    async def scenario():
+        driver = _driver()
+        gate: StatefulAckGate = providers[StatefulAckGate]
+        correlation_id = uuid4().bytes
+        pending = gate.request_stream(correlation_id, session_id=driver.session_id)
+
+        for command in (AttpCommand.STREAMBOS, AttpCommand.CHUNK, AttpCommand.CHUNK, AttpCommand.STREAMEOS):
+            driver._route_incoming(_frame(command, correlation_id, b"\x01"))
+        chunks = [frame async for frame in gate.stream_ack(correlation_id, 1.0, pending=pending)]
+        return len(chunks), _queued(driver)
+
+    assert asyncio.run(scenario()) == (2, [])
+
+
+def test_unawaited_responses_fall_back_to_the_listener_queue(providers):
+    async def scenario():
+        driver = _driver()
+        driver._route_incoming(_frame(AttpCommand.ACK, uuid4().bytes, b"\xc0"))
+        await asyncio.sleep(0)
+        return _queued(driver)
+
+    assert asyncio.run(scenario()) == [AttpCommand.ACK]
+
+
+def test_errors_fail_the_request_and_reach_error_handlers(providers):
+    async def scenario():
+        driver = _driver()
+        gate: StatefulAckGate = providers[StatefulAckGate]
+        correlation_id = uuid4().bytes
+        pending = gate.request_ack(correlation_id, session_id=driver.session_id)
+
+        error = IAttpErr(code=404, message="Not found").mpd()
+        driver._route_incoming(_frame(AttpCommand.ERR, correlation_id, error))
+        with pytest.raises(AttpException) as raised:
+            await gate.wait_for_ack(correlation_id, 1.0, pending=pending)
+        return raised.value.code, _queued(driver)
+
+    assert asyncio.run(scenario()) == (404, [AttpCommand.ERR])
+
+
+def test_requests_and_events_go_through_the_listener_queue(providers):
+    async def scenario():
+        driver = _driver()
+        driver._route_incoming(_frame(AttpCommand.CALL, uuid4().bytes, b"\xc0"))
+        driver._route_incoming(_frame(AttpCommand.EMIT, None, b"\xc0"))
+        driver._route_incoming(_frame(AttpCommand.PING, uuid4().bytes))
+        await asyncio.sleep(0)
+        return _queued(driver)
+
+    assert asyncio.run(scenario()) == [AttpCommand.CALL, AttpCommand.EMIT]
@@ -0,0 +1,84 @@
+import asyncio
+from collections import Counter
+from typing import Any
+
+from attp.loadbalancer.abc.cacher import StrategyCacher
+from attp.loadbalancer.caches.memory_cache import SimpleInMemoryCacher
+from attp.loadbalancer.strategies.round_robin import BasicRoundRobinStrategy
+from attp.shared.utils.qsequence import QSequence
+
+
+class AsyncOnlyCacher(StrategyCacher):
+    """External-style backend implementing only the async interface."""
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+        self.increments = 0
+
+    async def store(self, key, value):
+        self.values[key] = value
+        return value
+
+    async def get(self, key, *, expected_type=None):
+        return self.values.get(key)
+
+    async def increment(self, key, *, delta=1, initial=0):
+        await asyncio.sleep(0)
+        self.increments += 1
+        self.values[key] = self.values.get(key, initial) + delta
+        return self.values[key]
+
+
+class SyncOnlyCacher(SimpleInMemoryCacher):
+    async def increment(self, key, *, delta=1, initial=0):
+        raise AssertionError("The round-robin strategy awaited an in-process cacher.")
+
+
+def _pick_many(strategy: BasicRoundRobinStrategy, candidates: QSequence, picks: int) -> list:
+    async def scenario():
+        return await asyncio.gather(*(strategy.balance(candidates[0], candidates) for _ in range(picks)))
+
+    return asyncio.run(scenario())
+
+
+def test_in_memory_counter_is_used_synchronously(stub_session):
+    candidates = QSequence([stub_session(f"s{i}") for i in range(3)])
+    strategy = BasicRoundRobinStrategy(None, SyncOnlyCacher())
+
+    picked = _pick_many(strategy, candidates, 6)
+    assert [session.session_id for session in picked] == ["s0", "s1", "s2", "s0", "s1", "s2"]
+
+
+def test_concurrent_picks_are_spread_evenly(stub_session):
+    candidates = QSequence([stub_session(f"s{i}") for i in range(4)])
+    cacher = SimpleInMemoryCacher()
+    strategy = BasicRoundRobinStrategy(None, cacher)
+
+    picked = _pick_many(strategy, candidates, 400)
+    assert Counter(session.session_id for session in picked) == {f"s{i}": 100 for i in range(4)}
+    assert cacher.get_nowait("round_robin_index") == 400
+
+
+def test_async_only_cachers_are_awaited(stub_session):
+    candidates = QSequence([stub_session(f"s{i}") for i in range(2)])
+    cacher = AsyncOnlyCacher()
+    strategy = BasicRoundRobinStrategy(None, cacher)
+
+    picked = _pick_many(strategy, candidates, 4)
+    assert Counter(session.session_id for session in picked) == {"s0": 2, "s1": 2}
+    assert cacher.increments == 4
+
+
+def test_no_candidates_falls_back_to_default(stub_session):
+    default = stub_session("default")
+    strategy = BasicRoundRobinStrategy(None, SimpleInMemoryCacher())
+    assert asyncio.run(strategy.balance(default, QSequence())) is default
+
+
+def test_increment_nowait_starts_from_initial_and_resets_non_integers():
+    cacher = SimpleInMemoryCacher()
+    assert cacher.increment_nowait("counter", initial=10) == 11
+    assert cacher.increment_nowait("counter", delta=5) == 16
+
+    cacher.store_nowait("counter", "not a number")
+    assert cacher.increment_nowait("counter", initial=1) == 2
+    assert cacher.get_nowait("counter", expected_type=str) is None
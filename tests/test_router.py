@@ -0,0 +1,77 @@
+import pytest
+
+from attp.shared.namespaces.router import AttpRouter
+from attp.types.exceptions.protocol_error import ProtocolError
+from attp.types.frames.route_mapping import IRouteMapping
+
+
+def handler(data: dict) -> dict:
+    return data
+
+
+def other_handler(data: dict) -> dict:
+    return data
+
+
+def _remote(pattern: str, route_id: int, namespace: str = "peer", route_type: str = "message") -> IRouteMapping:
+    return IRouteMapping(pattern=pattern, route_id=route_id, route_type=route_type, namespace=namespace)  # type: ignore[arg-type]
+
+
+def test_local_routes_are_found_by_namespace_and_id():
+    router = AttpRouter()
+    router.add_route("message", "users.get", handler)
+    router.add_route("message", "users.get", other_handler, namespace="admin")
+    router.add_event("users.changed", handler)
+
+    assert router.relevant_route(2).callback is handler
+    assert router.relevant_route(3, "admin").callback is other_handler
+    assert router.relevant_route(4).route_type == "event"
+    assert router.relevant_route(3) is None
+    assert router.relevant_route(99) is None
+
+
+def test_lifecycle_routes_share_id_zero_and_the_last_one_wins():
+    router = AttpRouter()
+    router.add_route("connect", "connect", handler)
+    router.add_route("disconnect", "disconnect", other_handler)
+
+    assert router.relevant_route(0).callback is other_handler
+    assert router.increment_index == 2
+
+
+def test_remote_routes_are_dispatched_per_role_and_type():
+    router = AttpRouter()
+    router.include_remote_routes("peer", [_remote("users.get", 2), _remote("users.changed", 3, route_type="event")], "client")
+
+    assert router.dispatch("users.get", "message", namespace="peer", role="client").route_id == 2
+    assert router.dispatch("users.changed", "event", namespace="peer", role="client").route_id == 3
+    assert router.dispatch("users.get", "event", namespace="peer", role="client") is None
+    assert router.dispatch("users.get", "message", namespace="peer", role="server") is None
+    assert router.dispatch("users.get", "message", namespace="other", role="client") is None
+
+
+def test_remote_routes_of_other_namespaces_are_not_indexed():
+    router = AttpRouter()
+    router.include_remote_routes("peer", [_remote("users.get", 2, namespace="elsewhere")], "client")
+    assert router.dispatch("users.get", "message", namespace="peer", role="client") is None
+    assert router.dispatch("users.get", "message", namespace="elsewhere", role="client") is None
+
+
+def test_reconnecting_peers_must_send_the_same_routes():
+    router = AttpRouter()
+    routes = [_remote("users.get", 2), _remote("users.list", 3)]
+    router.include_remote_routes("peer", routes, "client")
+    router.include_remote_routes("peer", [_remote("users.get", 2), _remote("users.list", 3)], "client")
+
+    with pytest.raises(ProtocolError):
+        router.include_remote_routes("peer", [_remote("users.get", 3), _remote("users.list", 2)], "client")
+    assert router.dispatch("users.get", "message", namespace="peer", role="client").route_id == 2
+
+
+def test_get_routes_lists_local_routes_of_a_namespace():
+    router = AttpRouter()
+    router.add_route("message", "users.get", handler, codec="schema/json")
+    router.add_route("message", "admin.get", handler, namespace="admin")
+
+    routes = router.get_routes()
+    assert [(route.pattern, route.route_id, route.codec) for route in routes] == [("users.get", 2, "schema/json")]
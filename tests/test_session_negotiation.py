@@ -0,0 +1,196 @@
+import asyncio
+
+import pytest
+from attp_core.rs_api import AttpCommand, PyAttpMessage
+
+from attp.server.session_driver import ServerSessionDriver
+from attp.shared.compression import CompressionRegistry, ZlibCompressor
+from attp.shared.sessions.driver import DRAIN_CAP, SessionTerminatorMixin
+from attp.types.frames.accepted import IAcceptedDTO
+from attp.types.frames.auth import IAuthDTO
+from attp.types.frames.drain import IDrainDTO
+from attp.types.frames.ready import IReadyDTO
+
+
+class RecordingSession:
+    session_id = "session-1"
+
+    def __init__(self) -> None:
+        self.frames = []
+
+    async def send_batch(self, frames) -> None:
+        self.frames.extend(frames)
+
+    def stop_listener(self) -> None:
+        pass
+
+    def disconnect(self) -> None:
+        pass
+
+
+class Driver(SessionTerminatorMixin):
+    async def start(self):
+        ...
+
+    async def _on_event(self, events):
+        ...
+
+
+def _server_driver() -> Driver:
+    driver = Driver(RecordingSession())  # type: ignore[arg-type]
+    driver._role = "server"
+    return driver
+
+
+def _drain_notices(driver: Driver) -> list:
+    return [frame for frame in driver.writer.session.frames if frame.command_type == AttpCommand.EMIT and frame.route_id == 0]
+
+
+def test_drain_capability_is_advertised(providers):
+    driver = _server_driver()
+    assert DRAIN_CAP in driver.capabilities
+    assert DRAIN_CAP in driver.supported
+
+
+def test_drain_notice_skips_peers_echoing_caps(providers):
+    async def scenario():
+        driver = _server_driver()
+        driver._loop = asyncio.get_running_loop()
+        # Older clients copy the server's caps into their READY and don't send `accepts`.
+        driver._register_connection(IReadyDTO(caps=list(driver.capabilities), routes=[], data=None))
+        assert await driver.drain(0)
+        return _drain_notices(driver)
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_drain_notice_reaches_peers_supporting_it(providers):
+    async def scenario():
+        driver = _server_driver()
+        driver._loop = asyncio.get_running_loop()
+        driver._register_connection(IReadyDTO(caps=list(driver.capabilities), accepts=["schema/msgpack", DRAIN_CAP], routes=[], data=None))
+        assert await driver.drain(0)
+        return _drain_notices(driver)
+
+    assert len(asyncio.run(scenario())) == 1
+
+
+def test_client_learns_server_support_from_accepted(providers):
+    driver = Driver(RecordingSession())  # type: ignore[arg-type]
+    driver._role = "client"
+    driver._register_connection(IAcceptedDTO(caps=["schema/msgpack", DRAIN_CAP], routes=[], data=None, server_time="now"))
+    assert driver.peer_supported == frozenset()
+
+    driver._register_connection(IAcceptedDTO(caps=["schema/msgpack"], accepts=["schema/msgpack", DRAIN_CAP], routes=[], data=None, server_time="now"))
+    assert DRAIN_CAP in driver.peer_supported
+
+
+def _route_zero_event(driver: Driver) -> list:
+    async def scenario():
+        driver._loop = asyncio.get_running_loop()
+        driver._route_incoming(PyAttpMessage(route_id=0, command_type=AttpCommand.EMIT, correlation_id=None, payload=IDrainDTO(deadline=5).mpd(), version=b"\x01\x00"))
+        await asyncio.sleep(0)
+        queued = []
+        while not driver.incoming_listener.empty():
+            queued.append(driver.incoming_listener.get_nowait())
+        return queued
+
+    return asyncio.run(scenario())
+
+
+def test_drain_notice_of_a_peer_supporting_it_marks_the_session_draining(providers):
+    driver = _server_driver()
+    driver._register_connection(IReadyDTO(caps=list(driver.capabilities), accepts=["schema/msgpack", DRAIN_CAP], routes=[], data=None))
+
+    assert _route_zero_event(driver) == []
+    assert driver.draining
+
+
+def test_route_zero_events_of_other_peers_are_dispatched(providers):
+    driver = _server_driver()
+    driver._register_connection(IReadyDTO(caps=list(driver.capabilities), routes=[], data=None))
+
+    queued = _route_zero_event(driver)
+    assert [frame.command_type for frame in queued] == [AttpCommand.EMIT]
+    assert not driver.draining
+
+
+def _negotiated(driver: Driver) -> tuple[str, str | None]:
+    return driver.codec.name, driver.compression.compressor.name if driver.compression else None
+
+
+@pytest.fixture
+def compressing(providers):
+    providers[CompressionRegistry] = CompressionRegistry([ZlibCompressor()])
+    return providers
+
+
+def test_server_keeps_defaults_for_clients_echoing_caps(compressing):
+    driver = Driver(RecordingSession(), capabilities=["schema/json", "schema/msgpack", "streaming"])  # type: ignore[arg-type]
+    driver._register_connection(IReadyDTO(caps=list(driver.capabilities), routes=[], data=None))
+    assert _negotiated(driver) == ("schema/msgpack", None)
+
+
+def test_server_negotiates_with_clients_listing_their_own_caps(compressing):
+    driver = Driver(RecordingSession(), capabilities=["schema/json", "schema/msgpack", "streaming"])  # type: ignore[arg-type]
+    client_caps = ["schema/msgpack", "schema/json", "compress/zlib"]
+    driver._register_connection(IReadyDTO(caps=client_caps, accepts=client_caps, routes=[], data=None))
+    assert _negotiated(driver) == ("schema/json", "compress/zlib")
+
+
+def test_client_keeps_defaults_with_servers_without_accepts(compressing):
+    driver = Driver(RecordingSession(), capabilities=["schema/msgpack", "schema/json", "streaming"])  # type: ignore[arg-type]
+    driver._register_connection(IAcceptedDTO(caps=["schema/json", "compress/zlib"], routes=[], data=None, server_time="now"))
+    assert _negotiated(driver) == ("schema/msgpack", None)
+
+
+class AllowAll:
+    AUTH_TIMEOUT = 5
+
+    async def authenticate(self, namespace, data) -> bool:
+        return True
+
+
+class NoRoutes:
+    def get_routes(self, namespace=None):
+        return []
+
+    def include_remote_routes(self, namespace, routes, role):
+        pass
+
+
+class ListeningSession(RecordingSession):
+    def add_event_handler(self, handler) -> None:
+        pass
+
+    async def start_handler(self) -> None:
+        await asyncio.Event().wait()
+
+    async def start_listener(self) -> None:
+        await asyncio.Event().wait()
+
+
+def _frame(command: AttpCommand, route_id: int, dto) -> PyAttpMessage:
+    return PyAttpMessage(route_id=route_id, command_type=command, correlation_id=None, payload=dto.mpd(), version=b"\x01\x00")
+
+
+def test_server_start_waits_for_client_ready(compressing):
+    async def scenario():
+        driver = ServerSessionDriver(ListeningSession())  # type: ignore[arg-type]
+        driver.auth_strategy = AllowAll()  # type: ignore[assignment]
+        driver.router = NoRoutes()  # type: ignore[assignment]
+
+        started = asyncio.create_task(driver.start())
+        await asyncio.sleep(0)
+        await driver._on_event([_frame(AttpCommand.AUTH, 1, IAuthDTO(namespace="peer", data=None))])
+        await asyncio.sleep(0.01)
+        assert driver.is_authenticated and not started.done()
+
+        caps = ["schema/msgpack", "streaming", "compress/zlib"]
+        await driver._on_event([_frame(AttpCommand.READY, 0, IReadyDTO(caps=caps, accepts=caps, routes=[], data=None))])
+        namespace, _ = await asyncio.wait_for(started, 1)
+        for task in asyncio.all_tasks() - {asyncio.current_task()}:
+            task.cancel()
+        return namespace, _negotiated(driver)
+
+    assert asyncio.run(scenario()) == ("peer", ("schema/msgpack", "compress/zlib"))
@@ -0,0 +1,111 @@
+import asyncio
+import multiprocessing
+import time
+from collections import Counter
+
+from attp.loadbalancer.caches.shared_memory import SharedMemoryCacher
+from attp.loadbalancer.strategies.round_robin import BasicRoundRobinStrategy
+from attp.shared.utils.qsequence import FrozenQSequence
+
+
+WORKERS = 4
+ROUNDS = 500
+# Not a multiple of the session count, every worker counting on its own would favour the first session.
+PICKS = 101
+
+
+class Session:
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+
+
+def _hammer(path: str) -> None:
+    cacher = SharedMemoryCacher(path, slots=16)
+
+    async def scenario() -> None:
+        for _ in range(ROUNDS):
+            await cacher.increment("async")
+            await cacher.increment("shared", delta=2)
+
+    asyncio.run(scenario())
+    for _ in range(ROUNDS):
+        cacher.increment_nowait("sync")
+        cacher.increment_nowait("shared", delta=3)
+    cacher.close()
+
+
+def _pick(path: str, picks) -> None:
+    cacher = SharedMemoryCacher(path, slots=16)
+    strategy = BasicRoundRobinStrategy(None, cacher)
+    # Every worker holds its own sessions to the same peers.
+    candidates = FrozenQSequence([Session(f"s{index}") for index in range(4)])
+
+    async def scenario() -> Counter:
+        return Counter([(await strategy.balance(candidates[0], candidates)).session_id for _ in range(PICKS)])
+
+    picks.put(asyncio.run(scenario()))
+    cacher.close()
+
+
+def _hold_lock(path: str, locked, seconds: float) -> None:
+    cacher = SharedMemoryCacher(path, slots=16)
+    with cacher._locked():
+        locked.set()
+        time.sleep(seconds)
+    cacher.close()
+
+
+def test_counters_add_up_across_processes(tmp_path):
+    path = str(tmp_path / "cacher")
+    SharedMemoryCacher(path, slots=16).close()
+
+    processes = [multiprocessing.Process(target=_hammer, args=(path,)) for _ in range(WORKERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    cacher = SharedMemoryCacher(path)
+    assert cacher.get_nowait("async") == WORKERS * ROUNDS
+    assert cacher.get_nowait("sync") == WORKERS * ROUNDS
+    assert cacher.get_nowait("shared") == WORKERS * ROUNDS * 5
+    cacher.close()
+
+
+def test_round_robin_picks_are_spread_evenly_across_processes(tmp_path):
+    path = str(tmp_path / "cacher")
+    SharedMemoryCacher(path, slots=16).close()
+
+    picks = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_pick, args=(path, picks)) for _ in range(WORKERS)]
+    for process in processes:
+        process.start()
+    total = sum((picks.get(timeout=60) for _ in processes), Counter())
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    assert total == {f"s{index}": WORKERS * PICKS // 4 for index in range(4)}
+
+
+def test_contended_lock_does_not_block_the_loop(tmp_path):
+    path = str(tmp_path / "cacher")
+    cacher = SharedMemoryCacher(path, slots=16)
+    locked = multiprocessing.Event()
+    holder = multiprocessing.Process(target=_hold_lock, args=(path, locked, 0.3))
+    holder.start()
+    assert locked.wait(10)
+
+    async def scenario() -> int:
+        ticks = 0
+        increment = asyncio.create_task(cacher.increment("counter"))
+        while not increment.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+        assert increment.result() == 1
+        return ticks
+
+    assert asyncio.run(scenario()) > 5
+    holder.join(timeout=10)
+    cacher.close()
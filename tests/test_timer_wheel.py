@@ -0,0 +1,101 @@
+import asyncio
+import math
+
+import pytest
+
+from attp.shared.utils.timer_wheel import DeadlineWheel
+
+
+class Entry:
+    def __init__(self, name: str, expired: list[str]) -> None:
+        self.name = name
+        self.deadline = math.inf
+        self.wheel_slot: int | None = None
+        self._expired = expired
+
+    def expire(self) -> None:
+        self._expired.append(self.name)
+
+
+def test_entries_expire_in_deadline_order():
+    async def scenario():
+        wheel = DeadlineWheel(0.01)
+        expired: list[str] = []
+        now = wheel.time()
+        for name, delay in (("late", 0.08), ("early", 0.02), ("middle", 0.05)):
+            wheel.schedule(Entry(name, expired), now + delay)
+
+        assert len(wheel) == 3
+        await asyncio.sleep(0.15)
+        return expired, len(wheel)
+
+    assert asyncio.run(scenario()) == (["early", "middle", "late"], 0)
+
+
+def test_entries_do_not_expire_early():
+    async def scenario():
+        wheel = DeadlineWheel(0.05)
+        expired: list[str] = []
+        entry = Entry("entry", expired)
+        wheel.schedule(entry, wheel.time() + 0.12)
+
+        await asyncio.sleep(0.08)
+        before = list(expired)
+        await asyncio.sleep(0.15)
+        return before, expired
+
+    assert asyncio.run(scenario()) == ([], ["entry"])
+
+
+def test_cancelled_entries_never_expire_and_disarm_the_wheel():
+    async def scenario():
+        wheel = DeadlineWheel(0.01)
+        expired: list[str] = []
+        entry = Entry("entry", expired)
+        wheel.schedule(entry, wheel.time() + 0.03)
+        wheel.cancel(entry)
+
+        armed = wheel._handle is not None
+        await asyncio.sleep(0.06)
+        return armed, expired, entry.wheel_slot, len(wheel)
+
+    assert asyncio.run(scenario()) == (False, [], None, 0)
+
+
+def test_pushed_deadlines_are_rebucketed_lazily():
+    async def scenario():
+        wheel = DeadlineWheel(0.01)
+        expired: list[str] = []
+        entry = Entry("entry", expired)
+        now = wheel.time()
+        wheel.schedule(entry, now + 0.02)
+        first_slot = entry.wheel_slot
+        wheel.schedule(entry, now + 0.1)
+        assert entry.wheel_slot == first_slot
+
+        await asyncio.sleep(0.05)
+        still_pending = not expired and entry.wheel_slot is not None
+        await asyncio.sleep(0.1)
+        return still_pending, expired
+
+    assert asyncio.run(scenario()) == (True, ["entry"])
+
+
+def test_earlier_deadlines_move_the_entry_forward():
+    async def scenario():
+        wheel = DeadlineWheel(0.01)
+        expired: list[str] = []
+        entry = Entry("entry", expired)
+        now = wheel.time()
+        wheel.schedule(entry, now + 1.0)
+        wheel.schedule(entry, now + 0.02)
+
+        await asyncio.sleep(0.06)
+        return expired, len(wheel)
+
+    assert asyncio.run(scenario()) == (["entry"], 0)
+
+
+def test_tick_must_be_positive():
+    with pytest.raises(ValueError):
+        DeadlineWheel(0)
@@ -0,0 +1,180 @@
+import asyncio
+
+import msgpack
+import pytest
+from attp_core.rs_api import AttpCommand, PyAttpMessage
+
+from attp.shared.codecs import CodecRegistry
+from attp.shared.transmitter import AttpTransmitter
+from attp.shared.utils.ack_gate import StatefulAckGate
+from attp.types.exceptions.attp_exception import AttpException, SessionClosedError
+from attp.types.frames.error import IAttpErr
+
+
+class Route:
+    route_id = 7
+    codec = None
+
+
+class StaticRouter:
+    def dispatch(self, route, route_type, namespace, role):
+        return Route()
+
+
+def _transport(gate: StatefulAckGate, stub_session, fail: set[str]):
+    """Sessions that drop every call when their ID is in `fail` and echo the payload otherwise."""
+    codecs = CodecRegistry()
+
+    class EchoSession(stub_session):
+        def __init__(self, session_id: str) -> None:
+            super().__init__(session_id)
+            self.calls: list[bytes] = []
+
+        def resolve_codec(self, name=None):
+            return codecs.default
+
+        def build_call_frame(self, route_id, data, correlation_id, *, codec=None):
+            return PyAttpMessage(route_id=route_id, command_type=AttpCommand.CALL, correlation_id=correlation_id, payload=msgpack.packb(data), version=b"\x01\x00")
+
+        def build_event_frame(self, route_id, data, *, codec=None):
+            return PyAttpMessage(route_id=route_id, command_type=AttpCommand.EMIT, correlation_id=None, payload=msgpack.packb(data), version=b"\x01\x00")
+
+        async def send_call(self, route_id, data, correlation_id, codec=None):
+            await self.send_batch([self.build_call_frame(route_id, data, correlation_id)])
+
+        async def send_batch(self, frames):
+            loop = asyncio.get_running_loop()
+            for frame in frames:
+                if frame.command_type != AttpCommand.CALL:
+                    continue
+                self.calls.append(frame.correlation_id)
+                if self.session_id in fail:
+                    loop.call_soon(gate.fail_session, self.session_id, SessionClosedError(self.session_id))
+                else:
+                    loop.call_soon(gate.resolve, PyAttpMessage(
+                        route_id=frame.route_id, command_type=AttpCommand.ACK, correlation_id=frame.correlation_id,
+                        payload=frame.payload, version=b"\x01\x00",
+                    ))
+
+    return EchoSession
+
+
+def _streaming(gate: StatefulAckGate, stub_session, error: int | None):
+    """Sessions answering every call with a stream of two chunks, or with an ERR of code `error`."""
+    class StreamSession(stub_session):
+        def resolve_codec(self, name=None):
+            return CodecRegistry().default
+
+        async def send_call(self, route_id, data, correlation_id, codec=None):
+            def frame(command, payload=None):
+                return PyAttpMessage(route_id=route_id, command_type=command, correlation_id=correlation_id, payload=payload, version=b"\x01\x00")
+
+            if error is not None:
+                frames = [frame(AttpCommand.ERR, IAttpErr(code=error, message="Failed").mpd())]
+            else:
+                frames = [frame(AttpCommand.STREAMBOS), frame(AttpCommand.CHUNK, msgpack.packb(1)), frame(AttpCommand.CHUNK, msgpack.packb(2)), frame(AttpCommand.STREAMEOS)]
+
+            loop = asyncio.get_running_loop()
+            # The first frame arrives after a while, the rest right after it.
+            loop.call_later(0.02, lambda: [gate.resolve(item) for item in frames])
+
+    return StreamSession
+
+
+def test_send_retries_on_another_session(providers, make_balancer, stub_session):
+    async def scenario():
+        gate = StatefulAckGate()
+        # A keyed call keeps hashing to the same session, the retry has to steer away from it explicitly.
+        balancer = make_balancer("consistent-hash")
+        outcomes: list[tuple[str, bool]] = []
+        balancer.report = lambda session, success: outcomes.append((session.session_id, success))
+
+        fail: set[str] = set()
+        session_cls = _transport(gate, stub_session, fail)
+        sessions = [session_cls(name) for name in ("a", "b", "c")]
+        for session in sessions:
+            balancer.namespaces.add_session("ns", session)
+
+        picked = await balancer.acquire_session("ns", balance_key="key")
+        fail.add(picked.session_id)
+
+        transmitter = AttpTransmitter(balancer, StaticRouter(), gate, CodecRegistry())  # type: ignore[arg-type]
+        result = await transmitter.send("echo", {"x": 1}, timeout=1, namespace="ns", retries=1, balance_key="key")
+        return result, picked, sessions, outcomes, gate
+
+    result, picked, sessions, outcomes, gate = asyncio.run(scenario())
+    assert result == {"x": 1}
+    assert all(len(session.calls) <= 1 for session in sessions)
+    assert outcomes[0] == (picked.session_id, False)
+    assert outcomes[1][0] != picked.session_id and outcomes[1][1]
+    assert not gate.pendings
+
+
+def test_send_raises_session_error_once_candidates_are_exhausted(providers, make_balancer, stub_session):
+    async def scenario():
+        gate = StatefulAckGate()
+        balancer = make_balancer()
+        session_cls = _transport(gate, stub_session, fail={"a", "b"})
+        for name in ("a", "b"):
+            balancer.namespaces.add_session("ns", session_cls(name))
+
+        transmitter = AttpTransmitter(balancer, StaticRouter(), gate, CodecRegistry())  # type: ignore[arg-type]
+        with pytest.raises(SessionClosedError):
+            await transmitter.send("echo", {"x": 1}, timeout=1, namespace="ns", retries=5)
+        return gate
+
+    assert not asyncio.run(scenario()).pendings
+
+
+def test_batched_calls_report_every_item(providers, make_balancer, stub_session):
+    async def scenario():
+        gate = StatefulAckGate()
+        balancer = make_balancer()
+        outcomes: list[tuple[str, bool]] = []
+        latencies: list[str] = []
+        balancer.report = lambda session, success: outcomes.append((session.session_id, success))
+        balancer.observe = lambda session, latency: latencies.append(session.session_id)
+
+        session_cls = _transport(gate, stub_session, fail={"b"})
+        for name in ("a", "b"):
+            balancer.namespaces.add_session("ns", session_cls(name))
+
+        transmitter = AttpTransmitter(balancer, StaticRouter(), gate, CodecRegistry())  # type: ignore[arg-type]
+        results = await transmitter.send_many([("echo", {"i": i}) for i in range(4)], timeout=1, namespace="ns")
+        await transmitter.emit_many([("echo", {"i": i}) for i in range(2)], namespace="ns")
+        return results, outcomes, latencies
+
+    results, outcomes, latencies = asyncio.run(scenario())
+    assert sum(isinstance(result, SessionClosedError) for result in results) == 2
+    assert sorted(outcomes[:4]) == [("a", True), ("a", True), ("b", False), ("b", False)]
+    assert latencies == ["a", "a"]
+    assert sorted(outcomes[4:]) == [("a", True), ("b", True)]
+
+
+@pytest.mark.parametrize(("error", "success"), [(None, True), (500, False), (404, True)])
+def test_streams_report_first_frame_latency_and_outcome(providers, make_balancer, stub_session, error, success):
+    async def scenario():
+        gate = StatefulAckGate()
+        balancer = make_balancer()
+        outcomes: list[tuple[str, bool]] = []
+        latencies: list[float] = []
+        balancer.report = lambda session, success: outcomes.append((session.session_id, success))
+        balancer.observe = lambda session, latency: latencies.append(latency)
+        balancer.namespaces.add_session("ns", _streaming(gate, stub_session, error)("a"))
+
+        transmitter = AttpTransmitter(balancer, StaticRouter(), gate, CodecRegistry())  # type: ignore[arg-type]
+        stream = await transmitter.request_stream("numbers", timeout=1, namespace="ns")
+        chunks = []
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+        except AttpException as e:
+            chunks.append(e.code)
+        return chunks, outcomes, latencies, gate
+
+    chunks, outcomes, latencies, gate = asyncio.run(scenario())
+    assert chunks == ([1, 2] if error is None else [error])
+    assert outcomes == [("a", success)]
+    if error is None:
+        assert len(latencies) == 1 and latencies[0] >= 0.015
+    assert not gate.pendings